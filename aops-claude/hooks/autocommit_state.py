@@ -25,6 +25,8 @@ import subprocess
 from pathlib import Path
 from typing import Any
 
+from lib.git_probe import probe
+
 
 def is_aca_data_repo(repo_path: Path) -> bool:
     """Check if repo_path is the ACA_DATA repository (~/brain).
@@ -175,36 +177,14 @@ def can_sync(repo_path: Path) -> tuple[bool, str]:
         Tuple of (can_sync: bool, reason: str)
         If can_sync is False, reason explains why.
     """
-    try:
-        # Check not detached HEAD
-        result = subprocess.run(
-            ["git", "symbolic-ref", "-q", "HEAD"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            timeout=2,
-            check=False,
-        )
-        if result.returncode != 0:
-            return False, "detached HEAD"
-
-        # Check has tracking branch
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "@{u}"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            timeout=2,
-            check=False,
-        )
-        if result.returncode != 0:
-            return False, "no tracking branch"
-
-        return True, ""
-    except subprocess.TimeoutExpired:
-        return False, "timeout checking repo state"
-    except Exception as e:
-        return False, f"error: {e}"
+    state = probe(repo_path)
+    if not state.ok:
+        return False, f"error: {state.error}"
+    if state.branch is None:
+        return False, "detached HEAD"
+    if state.upstream is None:
+        return False, "no tracking branch"
+    return True, ""
 
 
 def fetch_and_check_divergence(repo_path: Path) -> tuple[bool, int, str]:
@@ -230,18 +210,15 @@ def fetch_and_check_divergence(repo_path: Path) -> tuple[bool, int, str]:
         if result.returncode != 0:
             return False, 0, f"fetch failed: {result.stderr.strip()}"
 
-        # Get current branch
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            timeout=2,
-            check=True,
-        )
-        branch = result.stdout.strip()
+        # Fetch updated FETCH_HEAD and the remote refs, so this re-probes
+        state = probe(repo_path)
+        if not state.ok:
+            return False, 0, f"error: {state.error}"
+        branch = state.branch or "HEAD"
+        if state.upstream == f"origin/{branch}":
+            return state.behind > 0, state.behind, ""
 
-        # Check how many commits behind
+        # Upstream is not origin/<branch>: count against origin/<branch> explicitly
         result = subprocess.run(
             ["git", "rev-list", "--count", f"HEAD..origin/{branch}"],
             cwd=repo_path,
@@ -275,15 +252,10 @@ def pull_rebase_if_behind(repo_path: Path) -> tuple[bool, str]:
     """
     try:
         # Get current branch for explicit pull
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            timeout=2,
-            check=True,
-        )
-        branch = result.stdout.strip()
+        state = probe(repo_path)
+        if not state.ok:
+            return False, f"error: {state.error}"
+        branch = state.branch or "HEAD"
 
         # Pull with rebase
         result = subprocess.run(
@@ -421,22 +393,30 @@ def has_repo_changes(repo_path: Path, subdir: str | None = None) -> bool:
     Raises:
         RuntimeError: If git status check fails (P#8: fail-fast)
     """
-    cmd = ["git", "status", "--porcelain"]
     if subdir:
-        cmd.append(subdir)
-    result = subprocess.run(
-        cmd,
-        cwd=repo_path,
-        capture_output=True,
-        text=True,
-        timeout=5,
-        check=False,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"git status failed in {repo_path}: {result.stderr.strip()} (P#8: fail-fast)"
+        # Let git match the subdir as a pathspec: it handles quoted paths and
+        # untracked parent directories that a prefix match on the lines misses
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "--", subdir],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=False,
         )
-    return bool(result.stdout.strip())
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"git status failed in {repo_path}: {result.stderr.strip()} (P#8: fail-fast)"
+            )
+        return bool(result.stdout.strip())
+
+    # Always re-probe: this runs because something may just have been written,
+    # which the probe cache's fingerprint cannot see. Later calls for the same
+    # commit (branch, upstream) reuse this result.
+    state = probe(repo_path, use_cache=False)
+    if not state.ok:
+        raise RuntimeError(f"git status failed in {repo_path}: {state.error} (P#8: fail-fast)")
+    return state.has_changes
 
 
 def get_current_branch(repo_path: Path) -> str | None:
@@ -448,20 +428,10 @@ def get_current_branch(repo_path: Path) -> str | None:
     Raises:
         RuntimeError: If git command fails (P#8: fail-fast)
     """
-    result = subprocess.run(
-        ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-        cwd=repo_path,
-        capture_output=True,
-        text=True,
-        timeout=2,
-        check=False,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"git rev-parse failed in {repo_path}: {result.stderr.strip()} (P#8: fail-fast)"
-        )
-    branch = result.stdout.strip()
-    return None if branch == "HEAD" else branch  # HEAD means detached
+    state = probe(repo_path)
+    if not state.ok:
+        raise RuntimeError(f"git status failed in {repo_path}: {state.error} (P#8: fail-fast)")
+    return state.branch
 
 
 def is_protected_branch(branch: str | None) -> bool:
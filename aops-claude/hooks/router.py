@@ -32,10 +32,15 @@ if str(AOPS_CORE_DIR) not in sys.path:
     sys.path.insert(0, str(AOPS_CORE_DIR))
 
 try:
+    from lib import hook_timing
     from lib.gate_model import GateResult, GateVerdict
     from lib.gates.registry import GateRegistry
+    from lib.git_probe import invalidate as invalidate_git_probe
     from lib.hook_utils import is_subagent_session
-    from lib.session_paths import get_pid_session_map_path, get_session_short_hash
+    from lib.session_paths import (
+        get_pid_session_map_path,
+        get_session_short_hash,
+    )
     from lib.session_state import SessionState
 
     from hooks.gate_config import COMPLIANCE_SUBAGENT_TYPES, extract_subagent_type
@@ -186,6 +191,22 @@ def persist_session_data(data: dict[str, Any]) -> None:
 
 # --- Router Logic ---
 
+# Tool categories that cannot modify the working tree (see _run_special_handlers)
+GIT_NEUTRAL_CATEGORIES = frozenset({"read_only", "always_available"})
+
+# GenericGate method run for each hook event
+GATE_METHODS = {
+    "PreToolUse": "check",
+    "PostToolUse": "on_tool_use",
+    "UserPromptSubmit": "on_user_prompt",
+    "SessionStart": "on_session_start",
+    "Stop": "on_stop",
+    "SessionEnd": "on_stop",
+    "AfterAgent": "on_after_agent",
+    "SubagentStart": "on_subagent_start",
+    "SubagentStop": "on_subagent_stop",
+}
+
 
 class HookRouter:
     def __init__(self):
@@ -377,12 +398,14 @@ class HookRouter:
         Dispatches directly to GateRegistry and GenericGate methods,
         eliminating the wrapper layers in gates.py and gate_registry.py.
         """
+        hook_timing.start()
+
         # Task-notification prompts are internal plumbing — not real user input.
         # Return empty output so agents aren't tricked into treating them as fresh prompts.
         if ctx.hook_event == "UserPromptSubmit" and self._is_task_notification(ctx):
             output = CanonicalHookOutput(verdict=None)
             try:
-                log_hook_event(ctx, output=output)
+                log_hook_event(ctx, output=output, timings=hook_timing.collect())
             except Exception as e:
                 print(f"WARNING: Failed to log task-notification hook event: {e}", file=sys.stderr)
             return output
@@ -391,7 +414,8 @@ class HookRouter:
 
         # Load Session State ONCE
         try:
-            state = SessionState.load(ctx.session_id)
+            with hook_timing.span("state.load"):
+                state = SessionState.load(ctx.session_id)
         except Exception as e:
             print(f"WARNING: Failed to load session state: {e}", file=sys.stderr)
             state = SessionState.create(ctx.session_id)
@@ -447,13 +471,14 @@ class HookRouter:
 
         # Save Session State ONCE
         try:
-            state.save()
+            with hook_timing.span("state.save"):
+                state.save()
         except Exception as e:
             print(f"CRITICAL: Failed to save session state: {e}", file=sys.stderr)
 
         # Log hook event with output AFTER all gates complete
         try:
-            log_hook_event(ctx, output=merged_result)
+            log_hook_event(ctx, output=merged_result, timings=hook_timing.collect())
         except Exception as e:
             print(f"WARNING: Failed to log hook event: {e}", file=sys.stderr)
 
@@ -465,20 +490,23 @@ class HookRouter:
         """Run special handlers (logging, notifications) that aren't gates."""
         # Unified logger
         try:
-            log_event_to_session(ctx.session_id, ctx.hook_event, ctx.raw_input, state)
+            with hook_timing.span("handler.unified_logger"):
+                log_event_to_session(ctx.session_id, ctx.hook_event, ctx.raw_input, state)
         except Exception as e:
             print(f"WARNING: unified_logger error: {e}", file=sys.stderr)
 
         # ntfy push notifications
         if ctx.hook_event in ("SessionStart", "Stop", "PostToolUse"):
-            self._run_ntfy_notifier(ctx, state)
+            with hook_timing.span("handler.ntfy"):
+                self._run_ntfy_notifier(ctx, state)
 
         # Session env setup on start
         if ctx.hook_event == "SessionStart":
             try:
                 from hooks.session_env_setup import run_session_env_setup
 
-                init_result = run_session_env_setup(ctx, state)
+                with hook_timing.span("handler.session_env_setup"):
+                    init_result = run_session_env_setup(ctx, state)
                 if init_result:
                     hook_output = self._gate_result_to_canonical(init_result)
                     self._merge_result(merged_result, hook_output)
@@ -487,18 +515,27 @@ class HookRouter:
             except Exception as e:
                 print(f"WARNING: session_env_setup error: {e}", file=sys.stderr)
 
+        # Cached git probes cannot see working tree edits: drop them whenever
+        # files may have changed (a new user turn or a non-read-only tool)
+        if ctx.hook_event == "UserPromptSubmit" or (
+            ctx.hook_event == "PostToolUse" and ctx.tool_category not in GIT_NEUTRAL_CATEGORIES
+        ):
+            invalidate_git_probe()
+
         # Auto-commit ACA_DATA after state-modifying operations
         if ctx.hook_event == "PostToolUse":
-            self._run_aca_data_autocommit(ctx)
+            with hook_timing.span("handler.aca_data_autocommit"):
+                self._run_aca_data_autocommit(ctx)
 
         # Generate transcript on stop
         if ctx.hook_event == "Stop":
             transcript_path = ctx.raw_input.get("transcript_path")
             if transcript_path:
-                self._run_generate_transcript(transcript_path)
+                with hook_timing.span("handler.generate_transcript"):
+                    self._run_generate_transcript(transcript_path)
 
     def _run_ntfy_notifier(self, ctx: HookContext, state: SessionState) -> None:
-        """Run ntfy push notification handler."""
+        """Queue ntfy push notifications (sent by the side-effect worker)."""
         try:
             from lib.paths import get_ntfy_config
 
@@ -506,19 +543,16 @@ class HookRouter:
             if not config:
                 return
 
-            from hooks.ntfy_notifier import (
-                notify_session_start,
-                notify_session_stop,
-                notify_subagent_stop,
-                notify_task_bound,
-                notify_task_completed,
-            )
+            from hooks.side_effects import submit
+
+            def notify(event: str, *args: Any) -> None:
+                submit("ntfy", {"config": config, "event": event, "args": list(args)})
 
             if ctx.hook_event == "SessionStart":
-                notify_session_start(config, ctx.session_id)
+                notify("session_start", ctx.session_id)
             elif ctx.hook_event == "Stop":
                 current_task = state.main_agent.current_task
-                notify_session_stop(config, ctx.session_id, current_task)
+                notify("session_stop", ctx.session_id, current_task)
             elif ctx.hook_event == "PostToolUse":
                 TASK_BINDING_TOOLS = {
                     "mcp__pkb__update_task",
@@ -540,9 +574,9 @@ class HookRouter:
                         if status == "in_progress":
                             state.main_agent.current_task = task_id
                             state.main_agent.task_binding_ts = datetime.now().isoformat()
-                            notify_task_bound(config, ctx.session_id, task_id)
+                            notify("task_bound", ctx.session_id, task_id)
                         elif status == "done":
-                            notify_task_completed(config, ctx.session_id, task_id)
+                            notify("task_completed", ctx.session_id, task_id)
 
                 if ctx.tool_name in ("Agent", "Task", "delegate_to_agent"):
                     agent_type = "unknown"
@@ -558,43 +592,28 @@ class HookRouter:
                     if tool_result := ctx.tool_output:
                         if isinstance(tool_result, dict) and "verdict" in tool_result:
                             verdict = tool_result["verdict"]
-                    notify_subagent_stop(config, ctx.session_id, agent_type, verdict)
+                    notify("subagent_stop", ctx.session_id, agent_type, verdict)
         except Exception as e:
             print(f"WARNING: ntfy_notifier error: {e}", file=sys.stderr)
 
     def _run_generate_transcript(self, transcript_path: str) -> None:
-        """Run transcript generation on stop."""
+        """Queue transcript generation on stop (runs in the side-effect worker)."""
         try:
-            import subprocess
-            from pathlib import Path
-
-            root_dir = Path(__file__).parent.parent
-            script_path = root_dir / "scripts" / "transcript.py"
-
-            if script_path.exists():
-                subprocess.run(
-                    [sys.executable, str(script_path), transcript_path],
-                    check=False,
-                    capture_output=True,
-                    text=True,
-                )
+            from hooks.side_effects import submit
+
+            submit("generate_transcript", {"transcript_path": transcript_path})
         except Exception as e:
             print(f"WARNING: generate_transcript error: {e}", file=sys.stderr)
 
     def _run_aca_data_autocommit(self, ctx: HookContext) -> None:
         """Auto-commit ACA_DATA changes after state-modifying tool calls.
 
-        Checks if the tool call modified the data repo, and if so,
-        commits and pushes with a descriptive message. Never blocks
-        the agent on failure.
+        Checks if the tool call modified the data repo, and if so, queues a
+        commit-and-push job with a descriptive message. The git work runs in
+        the side-effect worker; never blocks the agent on failure.
         """
         try:
-            from hooks.autocommit_state import (
-                commit_and_push_repo,
-                generate_commit_message,
-                get_modified_repos,
-                has_repo_changes,
-            )
+            from hooks.autocommit_state import generate_commit_message, get_modified_repos
 
             tool_name = ctx.tool_name or ""
             tool_input = ctx.tool_input if isinstance(ctx.tool_input, dict) else {}
@@ -607,19 +626,19 @@ class HookRouter:
             if not aca_data:
                 return
 
-            from pathlib import Path
-
             repo_path = Path(aca_data)
             if not repo_path.exists() or not (repo_path / ".git").exists():
                 return
 
-            if not has_repo_changes(repo_path):
-                return
+            from hooks.side_effects import submit
 
-            msg = generate_commit_message(tool_name, tool_input)
-            success, result_msg = commit_and_push_repo(repo_path, commit_message=msg)
-            if not success:
-                print(f"WARNING: ACA_DATA autocommit: {result_msg}", file=sys.stderr)
+            submit(
+                "aca_data_autocommit",
+                {
+                    "repo_path": str(repo_path),
+                    "commit_message": generate_commit_message(tool_name, tool_input),
+                },
+            )
 
         except Exception as e:
             # Never block the agent on autocommit failure
@@ -661,9 +680,13 @@ class HookRouter:
                 # If compliance agent, only evaluate triggers for PreToolUse and Stop
                 # (other events only run triggers anyway)
                 if is_compliance_agent and ctx.hook_event in ("PreToolUse", "PostToolUse", "Stop"):
-                    result = gate.evaluate_triggers(ctx, state)
+                    method = "evaluate_triggers"
                 else:
-                    result = self._call_gate_method(gate, ctx, state)
+                    method = GATE_METHODS.get(ctx.hook_event)
+                if method is None:
+                    continue
+                with hook_timing.span(f"gate.{gate.name}.{method}"):
+                    result = getattr(gate, method)(ctx, state)
 
                 if result:
                     if result.system_message:
@@ -696,27 +719,6 @@ class HookRouter:
             )
         return None
 
-    def _call_gate_method(self, gate, ctx: HookContext, state: SessionState) -> GateResult | None:
-        """Call the appropriate gate method based on hook event."""
-        event = ctx.hook_event
-        if event == "PreToolUse":
-            return gate.check(ctx, state)
-        elif event == "PostToolUse":
-            return gate.on_tool_use(ctx, state)
-        elif event == "UserPromptSubmit":
-            return gate.on_user_prompt(ctx, state)
-        elif event == "SessionStart":
-            return gate.on_session_start(ctx, state)
-        elif event in ("Stop", "SessionEnd"):
-            return gate.on_stop(ctx, state)
-        elif event == "AfterAgent":
-            return gate.on_after_agent(ctx, state)
-        elif event == "SubagentStart":
-            return gate.on_subagent_start(ctx, state)
-        elif event == "SubagentStop":
-            return gate.on_subagent_stop(ctx, state)
-        return None
-
     def _gate_result_to_canonical(self, result: GateResult) -> CanonicalHookOutput:
         """Convert GateResult to CanonicalHookOutput."""
         return CanonicalHookOutput(
@@ -841,7 +843,8 @@ class HookRouter:
 # --- Main Entry Point ---
 
 
-def main():
+def parse_args(argv: list[str] | None = None) -> Any:
+    """Parse router command-line arguments (shared with the router daemon)."""
     import argparse
 
     parser = argparse.ArgumentParser(description="Universal Hook Router")
@@ -853,20 +856,22 @@ def main():
     )
 
     # Parse known args to avoid issues if extra flags are passed
-    args, unknown = parser.parse_known_args()
+    args, unknown = parser.parse_known_args(argv)
+    return args
 
-    router = HookRouter()
 
-    # Read Input First (needed for detection)
-    raw_input = {}
+def parse_raw_input(input_data: str) -> dict[str, Any]:
+    """Parse the hook payload read from stdin."""
     try:
-        if not sys.stdin.isatty():
-            input_data = sys.stdin.read()
-            if input_data.strip():
-                raw_input = json.loads(input_data)
+        if input_data.strip():
+            return json.loads(input_data)
     except Exception as e:
         print(f"WARNING: Failed to read stdin: {e}", file=sys.stderr)
+    return {}
+
 
+def run_router(router: HookRouter, args: Any, raw_input: dict[str, Any]) -> str:
+    """Run the full hook pipeline and return the client-formatted JSON output."""
     # Debug log all input (enable with DEBUG_HOOKS=1)
     _debug_log_input(raw_input, args)
 
@@ -884,10 +889,25 @@ def main():
     # Output (JSON conversion happens only here)
     if client_type == "gemini":
         output = router.output_for_gemini(result, ctx.hook_event)
-        print(output.model_dump_json(exclude_none=True))
     else:
         output = router.output_for_claude(result, ctx.hook_event)
-        print(output.model_dump_json(exclude_none=True))
+    return output.model_dump_json(exclude_none=True)
+
+
+def main():
+    args = parse_args()
+
+    router = HookRouter()
+
+    # Read Input First (needed for detection)
+    raw_input = {}
+    try:
+        if not sys.stdin.isatty():
+            raw_input = parse_raw_input(sys.stdin.read())
+    except Exception as e:
+        print(f"WARNING: Failed to read stdin: {e}", file=sys.stderr)
+
+    print(run_router(router, args, raw_input))
 
 
 if __name__ == "__main__":
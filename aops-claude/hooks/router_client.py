@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Thin client for the persistent Hook Router daemon.
+
+Registered as the hook command in hooks.json. Uses only the standard
+library so it starts in milliseconds under any python3: it forwards argv,
+the stdin payload, the environment the router reads, cwd and parent PID to
+hooks/router_server.py over its Unix socket and relays the response. The
+socket lives in a private per-user directory, and the client only talks to
+a socket (and a peer, where SO_PEERCRED is available) owned by its own uid.
+
+If the daemon is not running, the client starts one in the background for
+subsequent events and handles the current event itself: in-process when
+the router's dependencies are importable, otherwise through the original
+`uv run ... python hooks/router.py` command. If the daemon doesn't answer
+within the event's response timeout (just under the hook timeout in
+hooks.json), the client answers with a no-op: the daemon's child is still
+running the event and commits its effects, so re-running it here would
+save state and queue side effects twice.
+
+Set AOPS_HOOK_DAEMON=0 to bypass the daemon entirely.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import os
+import shutil
+import socket
+import stat
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# --- Path Setup ---
+HOOK_DIR = Path(__file__).parent  # aops-core/hooks
+AOPS_CORE_DIR = HOOK_DIR.parent  # aops-core
+
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from lib.agent_env import load_env_entries  # stdlib-only module
+from lib.session_paths import get_router_socket_path  # stdlib-only module
+
+CONNECT_TIMEOUT = 0.5
+
+# Seconds to wait for the daemon per event, just below the hooks.json
+# timeouts (5 s unless listed) so the no-op answer still arrives in time
+RESPONSE_TIMEOUTS = {
+    "SessionStart": 14.0,  # 15 s
+    "UserPromptSubmit": 19.0,  # 20 s
+    "PostToolUse": 54.0,  # 55 s (Claude; Gemini AfterTool is 5 s)
+    "SessionEnd": 9.0,  # 10 s
+}
+DEFAULT_RESPONSE_TIMEOUT = 4.0
+
+# Hook output that leaves the agent's action alone (valid for both clients)
+NO_OP_OUTPUT = "{}"
+
+# Environment forwarded to the daemon: what the router reads (lib/paths.py,
+# lib/session_paths.py, hooks/gate_config.py, lib/template_registry.py) and
+# what its subprocesses (git, gh, the side-effect worker) need. API keys and
+# other secrets stay in the client.
+ROUTER_ENV_PREFIXES = ("AOPS_",)
+ROUTER_ENV_KEYS = frozenset(
+    {
+        # Process basics for subprocesses
+        "HOME",
+        "PATH",
+        "PYTHONPATH",
+        "USER",
+        "LOGNAME",
+        "SHELL",
+        "LANG",
+        "LC_ALL",
+        "LC_CTYPE",
+        "TZ",
+        "TMPDIR",
+        "XDG_CONFIG_HOME",
+        "XDG_CACHE_HOME",
+        "XDG_DATA_HOME",
+        "XDG_RUNTIME_DIR",
+        # git commit/push in $ACA_DATA
+        "SSH_AUTH_SOCK",
+        "GIT_SSH_COMMAND",
+        "GIT_AUTHOR_NAME",
+        "GIT_AUTHOR_EMAIL",
+        "GIT_COMMITTER_NAME",
+        "GIT_COMMITTER_EMAIL",
+        # Framework paths and session identity
+        "ACA_DATA",
+        "POLECAT_HOME",
+        "POLECAT_SESSION_TYPE",
+        "CLAUDE_SESSION_ID",
+        "CLAUDE_PROJECT_DIR",
+        "CLAUDE_ENV_FILE",
+        "CLAUDE_AGENT_TYPE",
+        "CLAUDE_SUBAGENT_TYPE",
+        "CLAUDE_PARENT_SESSION_ID",
+        "GEMINI_SESSION_ID",
+        "GEMINI_PROJECT_DIR",
+        "DEBUG_HOOKS",
+        # Gate modes and template overrides
+        "HANDOVER_GATE_MODE",
+        "QA_GATE_MODE",
+        "CUSTODIET_GATE_MODE",
+        "CUSTODIET_TOOL_CALL_THRESHOLD",
+        "CUSTODIET_DISABLED",
+        "HYDRATION_GATE_MODE",
+        "COMMIT_GATE_MODE",
+        "HYDRATION_BLOCK_TEMPLATE",
+        "HYDRATION_WARN_TEMPLATE",
+        "CUSTODIET_CONTEXT_TEMPLATE",
+        "CUSTODIET_POLICY_CONTEXT_TEMPLATE",
+        "CUSTODIET_INSTRUCTION_TEMPLATE",
+        "STOP_GATE_HANDOVER_TEMPLATE",
+        # ntfy notifications
+        "NTFY_TOPIC",
+        "NTFY_SERVER",
+        "NTFY_PRIORITY",
+        "NTFY_TAGS",
+    }
+)
+
+
+def _daemon_enabled() -> bool:
+    return os.environ.get("AOPS_HOOK_DAEMON", "1") != "0"
+
+
+def _has_router_deps() -> bool:
+    return importlib.util.find_spec("pydantic") is not None
+
+
+def _event_name(argv: list[str], stdin_text: str) -> str | None:
+    """Hook event named in argv (Gemini) or the payload (Claude)."""
+    for arg in argv:
+        if arg in RESPONSE_TIMEOUTS:
+            return arg
+    try:
+        return json.loads(stdin_text).get("hook_event_name")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _router_env(event: str | None) -> dict[str, str]:
+    """The part of the environment the daemon needs for this event."""
+    keys = set(ROUTER_ENV_KEYS)
+    if event == "SessionStart":
+        # session_env_setup persists agent-env-map.conf mappings, which read
+        # their SOURCE variables from the hook's environment
+        keys.update(e.value for e in load_env_entries() if not e.is_literal)
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if key in keys or key.startswith(ROUTER_ENV_PREFIXES)
+    }
+
+
+def _owned_by_me(socket_path: Path) -> bool:
+    """True if socket_path is a socket owned by this user (not a symlink)."""
+    try:
+        st = os.lstat(socket_path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def _peer_is_me(conn: socket.socket) -> bool:
+    """True if the process listening on conn runs as this user (where checkable)."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True  # Not Linux; the socket owner check has to do
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid == os.getuid()
+
+
+def _request_daemon(socket_path: Path, argv: list[str], stdin_text: str) -> dict | None:
+    """Send one event to the daemon. Returns None if it is unreachable.
+
+    Raises TimeoutError if the daemon doesn't answer within the event's
+    response timeout.
+    """
+    if not _owned_by_me(socket_path):
+        return None
+    event = _event_name(argv, stdin_text)
+    request = {
+        "argv": argv,
+        "stdin": stdin_text,
+        "env": _router_env(event),
+        "cwd": os.getcwd(),
+        "ppid": os.getppid(),
+    }
+    deadline = time.monotonic() + RESPONSE_TIMEOUTS.get(event, DEFAULT_RESPONSE_TIMEOUT)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        try:
+            conn.settimeout(CONNECT_TIMEOUT)
+            conn.connect(str(socket_path))
+            if not _peer_is_me(conn):
+                return None
+        except OSError:
+            return None
+        try:
+            conn.settimeout(max(deadline - time.monotonic(), 0.01))
+            conn.sendall(json.dumps(request).encode("utf-8"))
+            conn.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                # The timeout bounds the whole response, not each recv()
+                conn.settimeout(max(deadline - time.monotonic(), 0.01))
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            return json.loads(b"".join(chunks).decode("utf-8"))
+        except TimeoutError:
+            raise
+        except (OSError, ValueError):
+            return None
+
+
+def _start_daemon() -> None:
+    """Launch the daemon detached from this hook process."""
+    server = HOOK_DIR / "router_server.py"
+    if _has_router_deps():
+        cmd = [sys.executable, str(server)]
+    elif uv := shutil.which("uv"):
+        cmd = [uv, "run", "--directory", str(AOPS_CORE_DIR), "python", str(server)]
+    else:
+        return
+    try:
+        subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError as e:
+        print(f"WARNING: Failed to start router daemon: {e}", file=sys.stderr)
+
+
+def _run_fallback(argv: list[str], stdin_text: str) -> int:
+    """Handle the event without the daemon."""
+    if _has_router_deps():
+        from hooks import router
+
+        sys.argv = [str(HOOK_DIR / "router.py"), *argv]
+        sys.stdin = io.StringIO(stdin_text)
+        router.main()
+        return 0
+
+    uv = shutil.which("uv") or "uv"
+    cmd = [uv, "run", "--directory", str(AOPS_CORE_DIR), "python", "hooks/router.py", *argv]
+    return subprocess.run(cmd, input=stdin_text, text=True, check=False).returncode
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    stdin_text = "" if sys.stdin.isatty() else sys.stdin.read()
+
+    if _daemon_enabled():
+        try:
+            socket_path = get_router_socket_path()
+        except RuntimeError as e:
+            print(f"WARNING: router daemon unavailable: {e}", file=sys.stderr)
+            return _run_fallback(argv, stdin_text)
+        try:
+            response = _request_daemon(socket_path, argv, stdin_text)
+        except TimeoutError:
+            # The daemon is still handling the event; don't run it a second time
+            print("WARNING: router daemon timed out, returning no-op", file=sys.stderr)
+            print(NO_OP_OUTPUT)
+            return 0
+        if response is not None:
+            sys.stderr.write(response.get("stderr", ""))
+            sys.stdout.write(response.get("stdout", ""))
+            return int(response.get("exit_code", 0))
+        _start_daemon()
+
+    return _run_fallback(argv, stdin_text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Background side-effect executor for hooks.
+
+Hooks run with tight timeouts (5s for PreToolUse/Stop), so network and git
+work must not sit on the critical path. The router submits side effects
+here; they are written to the durable job spool (lib/job_spool.py) and a
+detached worker process drains it with retry and exponential backoff.
+
+Job kinds:
+- ntfy: push notification via hooks/ntfy_notifier.py
+- aca_data_autocommit: commit and push $ACA_DATA (hooks/autocommit_state.py)
+- generate_transcript: render the session transcript (.jsonl transcripts
+  incrementally via lib/incremental_transcript.py, then queued for session
+  insights; others via scripts/transcript.py when present)
+
+Each job carries a snapshot of the environment variables its kind reads
+(JOB_ENV_KEYS) so the worker behaves as the hook would have; nothing else
+from the hook's environment (tokens, API keys) is written to the spool.
+Set AOPS_SIDE_EFFECTS=sync to run side effects inline (tests, replay,
+debugging).
+
+Usage:
+    python hooks/side_effects.py status       # queue depth per kind and status
+    python hooks/side_effects.py failures     # recent failures with last error
+    python hooks/side_effects.py retry [ID]   # re-queue failed jobs
+    python hooks/side_effects.py run          # drain the spool (spawned automatically)
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+# --- Path Setup ---
+HOOK_DIR = Path(__file__).parent  # aops-core/hooks
+AOPS_CORE_DIR = HOOK_DIR.parent  # aops-core
+
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from lib.job_spool import JobSpool
+from lib.paths import get_job_spool_path
+
+# Environment captured with each job, per kind: only what its handler reads
+# (everything else is left to the worker). Payloads are stored in the spool.
+_PROCESS_ENV = frozenset({"HOME", "PATH", "PYTHONPATH", "USER", "LANG", "POLECAT_HOME"})
+_PROXY_ENV = frozenset(
+    {"HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY", "http_proxy", "https_proxy", "no_proxy"}
+)
+JOB_ENV_KEYS: dict[str, frozenset[str]] = {
+    # The ntfy config travels in the payload; only the HTTP client's env is needed
+    "ntfy": _PROCESS_ENV | _PROXY_ENV,
+    "aca_data_autocommit": _PROCESS_ENV
+    | _PROXY_ENV
+    | {
+        "ACA_DATA",
+        "AOPS_GIT_PROBE_CACHE",
+        "AOPS_GIT_PROBE_TTL",
+        "SSH_AUTH_SOCK",
+        "GIT_SSH_COMMAND",
+        "GIT_AUTHOR_NAME",
+        "GIT_AUTHOR_EMAIL",
+        "GIT_COMMITTER_NAME",
+        "GIT_COMMITTER_EMAIL",
+    },
+    "generate_transcript": _PROCESS_ENV
+    | {
+        "CLAUDE_PROJECT_DIR",
+        "GEMINI_PROJECT_DIR",
+        "AOPS_SESSIONS",
+        "AOPS_TRANSCRIPT_RENDER",
+        "AOPS_AGENT_INDEX",
+        "AOPS_HOOK_MANIFEST",
+        "AOPS_HOOK_LOG_PATH",
+        "AOPS_INSIGHTS_QUEUE",
+        "AOPS_INSIGHTS_WORKER",
+        "AOPS_SESSION_CATALOG",
+        "AOPS_SUMMARIES_MANIFEST",
+    },
+}
+
+# Longest a worker sleeps in one go while waiting for a backed-off retry
+MAX_WORKER_SLEEP = 60.0
+
+_spool: JobSpool | None = None
+
+
+# --- Job Handlers ---
+
+
+def _run_ntfy(payload: dict[str, Any]) -> None:
+    from hooks import ntfy_notifier
+
+    notify = getattr(ntfy_notifier, f"notify_{payload['event']}")
+    if not notify(payload["config"], *payload["args"]):
+        raise RuntimeError(f"ntfy {payload['event']} notification not delivered")
+
+
+def _run_aca_data_autocommit(payload: dict[str, Any]) -> None:
+    from hooks.autocommit_state import commit_and_push_repo, has_repo_changes
+
+    repo_path = Path(payload["repo_path"])
+    # Earlier jobs may already have committed these changes
+    if not has_repo_changes(repo_path):
+        return
+
+    success, result_msg = commit_and_push_repo(
+        repo_path, commit_message=payload["commit_message"]
+    )
+    if not success:
+        if result_msg.startswith("Skipping auto-commit"):
+            return  # Branch protection is not transient; retrying won't help
+        raise RuntimeError(result_msg)
+
+
+def _enqueue_for_insights(outputs: dict[str, Path]) -> None:
+    """Queue a freshly rendered session for insights; the transcript job still succeeds if not."""
+    from lib.insights_queue import PREFERRED_VARIANT, InsightsQueue
+
+    transcript = outputs.get(PREFERRED_VARIANT)
+    if transcript is None:
+        return
+    try:
+        queue = InsightsQueue()
+        try:
+            queue.enqueue_transcript(transcript)
+        finally:
+            queue.close()
+    except (sqlite3.Error, OSError) as e:
+        print(f"WARNING: could not enqueue {transcript} for insights: {e}", file=sys.stderr)
+
+
+def _run_generate_transcript(payload: dict[str, Any]) -> None:
+    if payload["transcript_path"].endswith(".jsonl"):
+        from lib.incremental_transcript import render_transcript
+
+        outputs = render_transcript(payload["transcript_path"])
+        _enqueue_for_insights(outputs)
+        return
+
+    script_path = AOPS_CORE_DIR / "scripts" / "transcript.py"
+    if not script_path.exists():
+        return
+
+    result = subprocess.run(
+        [sys.executable, str(script_path), payload["transcript_path"]],
+        check=False,
+        capture_output=True,
+        text=True,
+        timeout=600,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"transcript.py exited {result.returncode}: {result.stderr[-500:]}")
+
+
+HANDLERS: dict[str, Callable[[dict[str, Any]], None]] = {
+    "ntfy": _run_ntfy,
+    "aca_data_autocommit": _run_aca_data_autocommit,
+    "generate_transcript": _run_generate_transcript,
+}
+
+
+# --- Submission (hook side) ---
+
+
+def _capture_env(kind: str) -> dict[str, str]:
+    keys = JOB_ENV_KEYS.get(kind, _PROCESS_ENV)
+    return {key: value for key, value in os.environ.items() if key in keys}
+
+
+@contextmanager
+def _job_env(env: dict[str, str] | None) -> Iterator[None]:
+    """Temporarily apply a job's captured environment."""
+    if not env:
+        yield
+        return
+    saved = dict(os.environ)
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def run_job(kind: str, payload: dict[str, Any]) -> None:
+    """Execute a job in this process. Raises on failure."""
+    handler = HANDLERS.get(kind)
+    if handler is None:
+        raise ValueError(f"Unknown side-effect kind: {kind}")
+    with _job_env(payload.get("env")):
+        handler(payload)
+
+
+def _get_spool() -> JobSpool:
+    """Spool connection, reused across events in a long-lived router."""
+    global _spool
+    path = get_job_spool_path()
+    if _spool is None or _spool.path != path:
+        _spool = JobSpool(path)
+    return _spool
+
+
+def _worker_lock_path(spool_path: Path) -> Path:
+    return spool_path.with_suffix(".worker.lock")
+
+
+def ensure_worker() -> None:
+    """Start a background worker unless one already holds the worker lock."""
+    lock_path = _worker_lock_path(get_job_spool_path())
+    with lock_path.open("a") as lock_file:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return  # Worker running; it re-checks the queue before exiting
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "run"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
+
+
+def submit(kind: str, payload: dict[str, Any]) -> None:
+    """Queue a side effect for the background worker.
+
+    Runs the job inline when AOPS_SIDE_EFFECTS=sync or the spool is
+    unavailable. Never raises: side-effect failures must not block hooks.
+    """
+    payload = {**payload, "env": _capture_env(kind)}
+
+    if os.environ.get("AOPS_SIDE_EFFECTS") != "sync":
+        try:
+            _get_spool().enqueue(kind, payload)
+            ensure_worker()
+            return
+        except (sqlite3.Error, OSError) as e:
+            print(f"WARNING: job spool unavailable, running {kind} inline: {e}", file=sys.stderr)
+
+    try:
+        run_job(kind, payload)
+    except Exception as e:
+        print(f"WARNING: {kind} side effect failed: {e}", file=sys.stderr)
+
+
+# --- Worker ---
+
+
+def _drain(spool: JobSpool) -> None:
+    """Run due jobs until none are left (pending retries may remain)."""
+    while job := spool.claim():
+        try:
+            run_job(job.kind, job.payload)
+        except Exception as e:
+            spool.fail(job, f"{type(e).__name__}: {e}")
+        else:
+            spool.complete(job.id)
+
+
+def run_worker() -> int:
+    """Drain the spool, sleeping through backoff windows, then exit."""
+    spool_path = get_job_spool_path()
+    spool = JobSpool(spool_path)
+    lock_file = _worker_lock_path(spool_path).open("a")
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return 0  # Another worker is draining
+
+    # We hold the only worker lock, so anything 'running' was orphaned by a crash
+    spool.requeue_running()
+    spool.prune_done()
+
+    while True:
+        _drain(spool)
+        wait = spool.next_due_in()
+        if wait is not None:
+            time.sleep(min(max(wait, 0.05), MAX_WORKER_SLEEP))
+            continue
+
+        # Release, then re-check: a job submitted after our last claim either
+        # shows up here or its submitter sees the lock free and starts a worker.
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        if spool.next_due_in() is None:
+            return 0
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return 0  # A new worker took over
+
+
+# --- CLI ---
+
+
+def _format_age(ts: float) -> str:
+    age = time.time() - ts
+    if age < 120:
+        return f"{age:.0f}s"
+    if age < 7200:
+        return f"{age / 60:.0f}m"
+    return f"{age / 3600:.1f}h"
+
+
+def _cmd_status(spool: JobSpool) -> int:
+    stats = spool.stats()
+    print(f"Spool: {spool.path}")
+    if not stats:
+        print("No jobs.")
+        return 0
+    statuses = ("pending", "running", "done", "failed")
+    print(f"{'kind':<22}" + "".join(f"{s:>9}" for s in statuses))
+    for kind, counts in sorted(stats.items()):
+        print(f"{kind:<22}" + "".join(f"{counts.get(s, 0):>9}" for s in statuses))
+    due = spool.next_due_in()
+    if due is not None:
+        print(f"\nNext pending job due in {due:.0f}s")
+    return 0
+
+
+def _cmd_failures(spool: JobSpool, limit: int) -> int:
+    failures = spool.failures(limit)
+    if not failures:
+        print("No failures.")
+        return 0
+    for f in failures:
+        error = (f["last_error"] or "").replace("\n", " ")[:160]
+        print(
+            f"#{f['id']} {f['kind']} [{f['status']} {f['attempts']}/{f['max_attempts']}]"
+            f" {_format_age(f['updated_at'])} ago: {error}"
+        )
+    return 0
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Background side-effect spool for hooks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("run", help="Drain the spool (normally spawned by hooks)")
+    sub.add_parser("status", help="Show queue depth per kind and status")
+    failures_parser = sub.add_parser("failures", help="Show recent failures")
+    failures_parser.add_argument("--limit", type=int, default=20)
+    retry_parser = sub.add_parser("retry", help="Re-queue failed jobs")
+    retry_parser.add_argument("job_id", type=int, nargs="?", help="Only this job")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        return run_worker()
+
+    spool = JobSpool()
+    if args.command == "status":
+        return _cmd_status(spool)
+    if args.command == "failures":
+        return _cmd_failures(spool, args.limit)
+    if args.command == "retry":
+        count = spool.retry_failed(args.job_id)
+        print(f"Re-queued {count} job(s).")
+        if count:
+            ensure_worker()
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
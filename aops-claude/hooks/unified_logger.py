@@ -17,6 +17,7 @@ from typing import Any
 
 import psutil
 from lib.gate_model import GateResult
+from lib.hook_log_manifest import record_hook_log
 from lib.session_paths import get_hook_log_path
 from lib.session_state import SessionState
 
@@ -39,9 +40,16 @@ def log_hook_event(
     ctx: HookContext,
     output: CanonicalHookOutput | None = None,
     exit_code: int = 0,
+    timings: dict[str, Any] | None = None,
 ) -> None:
     """
     Log a hook event to the per-session hooks log file.
+
+    Args:
+        ctx: Hook context for the event
+        output: Merged hook output, if any
+        exit_code: Hook exit code
+        timings: Span timings from lib.hook_timing.collect()
     """
     session_id = ctx.session_id
     # Fail-safe: empty session_id = skip (don't crash hook)
@@ -79,9 +87,14 @@ def log_hook_event(
             "mem_vms_mb": mem_info.vms / (1024 * 1024),
             "process_uptime": time.time() - process.create_time(),
         }
+        if timings is not None:
+            log_dict["timings"] = timings
 
         # Append to JSONL file
         with log_path.open("a") as f:
+            # First line of a new log: record it in the transcript -> hook log manifest
+            if f.tell() == 0 and ctx.transcript_path:
+                record_hook_log(ctx.transcript_path, log_path, date, session_id)
             json.dump(
                 log_dict,
                 f,
@@ -0,0 +1,259 @@
+"""Persistent index of subagent transcripts (agent-*.jsonl) by session.
+
+Claude Code's legacy layout writes every session's agent-<id>.jsonl into
+the shared project directory, and the only link back to the parent
+session is the sessionId on each file's first line. Finding a session's
+agents used to mean opening every agent file in the project on every
+parse, which in long-lived projects is thousands of files.
+
+The index records, per directory, each agent file's sessionId, mtime and
+size, plus the directory's own mtime. A lookup:
+
+- uses the stored index as is when the directory mtime is unchanged
+  (no agent file was added, removed or renamed) and every file's
+  sessionId is known;
+- otherwise lists the directory and only reads the first line of files
+  that are new, or whose sessionId is still unknown (empty when indexed).
+  Agent files are append-only, so a known sessionId survives growth.
+
+Indexes are small JSON files under ~/.polecat/agent-index/
+($AOPS_AGENT_INDEX), one per directory, written atomically, and cached
+in memory for the router daemon. A missing or unreadable index only costs
+a rebuild. Per-session subagents/ directories only hold that session's
+agents, so their indexes stay in memory rather than adding a file per
+session.
+
+fold_agent_files() also caches a value per agent file (e.g. its token
+usage) in the index, folded over the lines appended since the last call,
+so totals over all of a session's agents don't decode every agent file.
+
+Usage:
+    from lib.agent_file_index import session_agent_files
+
+    for agent_id, path in session_agent_files(project_dir, session_id):
+        ...
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from lib.paths import get_agent_index_dir
+
+logger = logging.getLogger(__name__)
+
+# Bump when the index file format changes
+INDEX_VERSION = 1
+
+AGENT_FILE_PREFIX = "agent-"
+AGENT_FILE_SUFFIX = ".jsonl"
+
+# directory -> index data, for processes that look up many sessions
+_memory: dict[str, dict[str, Any]] = {}
+
+
+def _index_path(directory: Path) -> Path:
+    digest = hashlib.sha1(str(directory).encode("utf-8")).hexdigest()[:16]
+    return get_agent_index_dir() / f"{digest}.json"
+
+
+def _read_session_id(path: Path) -> str | None:
+    """sessionId on the first line of an agent file, None if not (yet) readable."""
+    try:
+        with open(path, "rb") as f:
+            first_line = f.readline().strip()
+    except OSError:
+        return None
+    if not first_line:
+        return None
+    try:
+        data = json.loads(first_line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    session_id = data.get("sessionId") if isinstance(data, dict) else None
+    return session_id if isinstance(session_id, str) else None
+
+
+def _load_index(directory: Path, persist: bool) -> dict[str, Any] | None:
+    cached = _memory.get(str(directory))
+    if cached is not None or not persist:
+        return cached
+    path = _index_path(directory)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != INDEX_VERSION
+        or data.get("directory") != str(directory)
+        or not isinstance(data.get("files"), dict)
+    ):
+        return None
+    _memory[str(directory)] = data
+    return data
+
+
+def _write_index(directory: Path, data: dict[str, Any]) -> None:
+    """Atomically write the index. Failures only cost a rescan next time."""
+    path = _index_path(directory)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".agents-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                json.dump(data, tmp, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write agent file index {path}: {e}")
+
+
+def _rescan(directory: Path, dir_mtime_ns: int, old_files: dict[str, Any]) -> dict[str, Any]:
+    """Index the agent files in directory, reusing what old_files already knows."""
+    files: dict[str, list[Any]] = {}
+    try:
+        scan = os.scandir(directory)
+    except OSError:
+        scan = None
+    if scan is not None:
+        with scan:
+            for item in scan:
+                name = item.name
+                if not (name.startswith(AGENT_FILE_PREFIX) and name.endswith(AGENT_FILE_SUFFIX)):
+                    continue
+                try:
+                    st = item.stat()
+                except OSError:
+                    continue
+                old = old_files.get(name)
+                session_id = None
+                if isinstance(old, list) and len(old) == 3:
+                    old_session, old_mtime, old_size = old
+                    unchanged = old_mtime == st.st_mtime_ns and old_size == st.st_size
+                    # Agent files are append-only: growth keeps the first line
+                    if old_session is not None and (unchanged or st.st_size >= old_size):
+                        session_id = old_session
+                if session_id is None:
+                    session_id = _read_session_id(Path(item.path))
+                files[name] = [session_id, st.st_mtime_ns, st.st_size]
+    return {
+        "version": INDEX_VERSION,
+        "directory": str(directory),
+        "mtime_ns": dir_mtime_ns,
+        "files": files,
+    }
+
+
+def load_agent_index(directory: str | Path, persist: bool = True) -> dict[str, list[Any]]:
+    """agent file name -> [sessionId or None, mtime_ns, size] for directory.
+
+    Brought up to date (see module docstring) and persisted if it changed.
+    With persist=False the index is only kept in memory, for directories
+    that are cheap to rescan and would otherwise leave one index file each
+    behind (e.g. a session's own subagents/ directory).
+    A directory that does not exist has no agent files.
+    """
+    directory = Path(directory)
+    try:
+        dir_mtime_ns = directory.stat().st_mtime_ns
+    except OSError:
+        return {}
+
+    data = _load_index(directory, persist)
+    if data is not None and data.get("mtime_ns") == dir_mtime_ns:
+        files = data["files"]
+        if all(record[0] is not None for record in files.values()):
+            return files
+
+    new_data = _rescan(directory, dir_mtime_ns, data["files"] if data is not None else {})
+    if data is not None and data.get("folds"):
+        new_data["folds"] = _live_folds(data["folds"])
+    _memory[str(directory)] = new_data
+    if not persist:
+        return new_data["files"]
+    if (
+        data is None
+        or new_data["files"] != data["files"]
+        or new_data["mtime_ns"] != data["mtime_ns"]
+        or new_data.get("folds") != data.get("folds")
+    ):
+        _write_index(directory, new_data)
+    return new_data["files"]
+
+
+def _live_folds(folds: dict[str, Any]) -> dict[str, Any]:
+    """folds without the values of agent files that no longer exist."""
+    return {
+        key: {path: record for path, record in values.items() if os.path.exists(path)}
+        for key, values in folds.items()
+    }
+
+
+def fold_agent_files(
+    directory: str | Path,
+    key: str,
+    agent_files: list[Path],
+    fold: Callable[[Path, int, Any], tuple[int, Any]],
+) -> list[Any]:
+    """A value per agent file, folded over its lines and cached in directory's index.
+
+    fold(path, offset, value) continues value (None the first time) with
+    the complete lines from byte offset on and returns the offset after
+    them with the new, JSON-serialisable value. Agent files are
+    append-only, so a call only reads what was written since the last one;
+    a file that shrank is folded again from the start. key names the fold
+    (bump it when the value's format changes).
+
+    The values live in directory's persisted index, so the agent files of
+    a session's subagents/ directory are cached under their project
+    directory. Values of deleted files are dropped when the project
+    directory is rescanned.
+    """
+    directory = Path(directory)
+    load_agent_index(directory)
+    data = _memory.get(str(directory))
+    cache = data.setdefault("folds", {}).setdefault(key, {}) if data is not None else {}
+
+    values = []
+    changed = False
+    for path in agent_files:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        cached = cache.get(str(path))
+        stale = cached is None or cached[0] > size
+        offset, value = (0, None) if stale else cached
+        if stale or offset < size:
+            new_offset, value = fold(path, offset, value)
+            if stale or new_offset != offset:
+                cache[str(path)] = [new_offset, value]
+                changed = True
+        values.append(value)
+
+    if changed and data is not None:
+        _write_index(directory, data)
+    return values
+
+
+def session_agent_files(
+    directory: str | Path, session_id: str, persist: bool = True
+) -> list[tuple[str, Path]]:
+    """(agent_id, path) of the agent-*.jsonl files in directory that belong to session_id."""
+    directory = Path(directory)
+    return [
+        (name[len(AGENT_FILE_PREFIX) : -len(AGENT_FILE_SUFFIX)], directory / name)
+        for name, record in load_agent_index(directory, persist).items()
+        if record[0] == session_id
+    ]
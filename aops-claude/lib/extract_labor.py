@@ -102,11 +102,6 @@ class LaborExtractor:
         """
         session_path = Path(session_path)
 
-        # Parse the session
-        session_summary, entries, agent_entries = self.processor.parse_session_file(
-            str(session_path)
-        )
-
         # Extract metadata
         if not session_id:
             session_id = session_path.stem[:8]
@@ -116,34 +111,28 @@ class LaborExtractor:
                 session_path.parent.name.split("-")[-1] if session_path.parent.name else "unknown"
             )
 
-        # Get timestamp from first entry
-        timestamp = None
-        for entry in entries:
-            if entry.timestamp:
-                timestamp = entry.timestamp.isoformat()
-                break
-
-        # Create labor data container
+        # Create labor data container (timestamp is taken from the first entry)
         labor_data = SessionLaborData(
             session_id=session_id,
             project=project,
-            timestamp=timestamp,
+            timestamp=None,
         )
 
         # Extract work units from entries
         self.line_counter = 0
         subagent_ids = set()
 
-        # Process entries chronologically
-        for entry in entries:
+        # Stream entries chronologically (hook log merged in), one pass
+        for entry in self.processor.iter_entries(session_path, include_hooks=True):
+            if labor_data.timestamp is None and entry.timestamp:
+                labor_data.timestamp = entry.timestamp.isoformat()
             self._process_entry(entry, labor_data, subagent_ids)
 
         # Process agent/subagent entries
-        if agent_entries:
-            for agent_id, agent_entry_list in agent_entries.items():
-                subagent_ids.add(agent_id)
-                for entry in agent_entry_list:
-                    self._process_entry(entry, labor_data, subagent_ids, agent_id=agent_id)
+        for agent_id, agent_entry_stream in self.processor.iter_agent_streams(session_path):
+            subagent_ids.add(agent_id)
+            for entry in agent_entry_stream:
+                self._process_entry(entry, labor_data, subagent_ids, agent_id=agent_id)
 
         # Set metadata
         labor_data.subagent_ids = sorted(list(subagent_ids))
@@ -7,6 +7,14 @@ prompt hydrator to receive only relevant file locations based on prompt content.
 Design principle: Hydrator (haiku) receives relevant paths, not all paths.
 This saves tokens and provides focused context.
 
+FILE_INDEX and the project workflows in .agent/workflows/ are compiled into
+KeywordMatchers (Aho-Corasick automata), so matching is one pass over the
+prompt regardless of index size. FILE_INDEX's matcher is built once per
+process; the router daemon builds it at warm-up, so the children it forks
+per event inherit it. The project workflow matcher only covers the few
+workflows in .agent/workflows/; it is cached in-process until a workflow
+file changes, which under the daemon means it is rebuilt per event.
+
 Usage:
     from lib.file_index import get_relevant_file_paths
 
@@ -17,7 +25,9 @@ Usage:
 from __future__ import annotations
 
 import logging
+import os
 import re
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -39,18 +49,52 @@ class FileEntry:
         return get_plugin_root() / self.path
 
 
-def _get_project_workflow_entries() -> list[FileEntry]:
-    """Discover project-specific workflows in .agent/workflows/."""
-    entries = []
+def _project_workflow_dirs() -> list[Path]:
+    """Existing .agent/workflows/ directories (CWD first, then plugin_root parent)."""
     cwd = Path.cwd()
     plugin_root = get_plugin_root()
 
-    # Check both CWD and plugin_root parent for .agent/workflows/
     search_dirs = []
     if (cwd / ".agent" / "workflows").exists():
         search_dirs.append(cwd / ".agent" / "workflows")
     if (plugin_root.parent / ".agent" / "workflows").exists():
         search_dirs.append(plugin_root.parent / ".agent" / "workflows")
+    return search_dirs
+
+
+def _project_workflow_fingerprint(search_dirs: list[Path]) -> tuple:
+    """State of the workflow directories: each *.md file's name, mtime and size.
+
+    Stats follow symlinks, so retargeting a symlinked workflow counts as a change.
+    """
+    state: list[tuple] = []
+    for workflows_dir in search_dirs:
+        files: list[tuple] = []
+        try:
+            with os.scandir(workflows_dir) as it:
+                for item in it:
+                    if not item.name.endswith(".md"):
+                        continue
+                    try:
+                        st = item.stat()
+                    except OSError:
+                        files.append((item.name, None, None))
+                        continue
+                    files.append((item.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+        state.append((str(workflows_dir), tuple(sorted(files))))
+    return (str(get_plugin_root()), tuple(state))
+
+
+def _get_project_workflow_entries(search_dirs: list[Path] | None = None) -> list[FileEntry]:
+    """Discover project-specific workflows in .agent/workflows/."""
+    entries = []
+    plugin_root = get_plugin_root()
+
+    # Check both CWD and plugin_root parent for .agent/workflows/
+    if search_dirs is None:
+        search_dirs = _project_workflow_dirs()
 
     # Resolve allowed roots for symlink boundary checking
     allowed_roots = [d.resolve() for d in search_dirs]
@@ -522,6 +566,137 @@ FILE_INDEX: tuple[FileEntry, ...] = (
 )
 
 
+class KeywordMatcher:
+    """Aho-Corasick automaton over the keywords of a set of file entries.
+
+    Built once per entry set. scores() makes a single pass over the text, so
+    matching cost depends on the prompt length (plus the number of hits), not
+    on how many entries or keywords the index holds.
+
+    Scoring is the same as a substring test per keyword: each distinct
+    keyword found anywhere in the text adds len(keyword) to every entry that
+    lists it (once per listing).
+    """
+
+    def __init__(self, entries: tuple[FileEntry, ...]) -> None:
+        self.entries = entries
+        keyword_ids: dict[str, int] = {}
+        # keyword id -> {entry index: summed weight}
+        postings: list[dict[int, int]] = []
+        for index, entry in enumerate(entries):
+            for keyword in entry.keywords:
+                keyword_lower = keyword.lower()
+                if not keyword_lower:
+                    continue
+                kid = keyword_ids.setdefault(keyword_lower, len(keyword_ids))
+                if kid == len(postings):
+                    postings.append({})
+                postings[kid][index] = postings[kid].get(index, 0) + len(keyword)
+        self._postings = [tuple(p.items()) for p in postings]
+
+        # Trie
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[tuple[int, ...]] = [()]
+        for keyword_lower, kid in keyword_ids.items():
+            node = 0
+            for ch in keyword_lower:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._out.append(())
+                node = nxt
+            self._out[node] += (kid,)
+
+        # Failure links (breadth-first), merging outputs along them
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                if self._out[self._fail[child]]:
+                    self._out[child] += self._out[self._fail[child]]
+
+    def scores(self, text: str) -> dict[int, int]:
+        """Entry index -> score for normalized (lowercased) text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+
+        scores: dict[int, int] = {}
+        for kid in found:
+            for index, weight in self._postings[kid]:
+                scores[index] = scores.get(index, 0) + weight
+        return scores
+
+
+class ChainedKeywordMatcher:
+    """KeywordMatchers scored as one entry list (entries in matcher order).
+
+    An entry's score only depends on its own keywords, so this scores
+    exactly like a single KeywordMatcher over all the entries.
+    """
+
+    def __init__(self, *matchers: KeywordMatcher) -> None:
+        self._matchers = matchers
+        self.entries = tuple(entry for matcher in matchers for entry in matcher.entries)
+
+    def scores(self, text: str) -> dict[int, int]:
+        """Entry index -> score for normalized (lowercased) text."""
+        scores: dict[int, int] = {}
+        offset = 0
+        for matcher in self._matchers:
+            for index, score in matcher.scores(text).items():
+                scores[offset + index] = score
+            offset += len(matcher.entries)
+        return scores
+
+
+_framework_matcher: KeywordMatcher | None = None
+
+# (workflow directory fingerprint, matcher over the project workflows)
+_project_matcher_cache: tuple[tuple, KeywordMatcher] | None = None
+
+
+def get_framework_keyword_matcher() -> KeywordMatcher:
+    """Matcher for FILE_INDEX, built once per process (see module docstring)."""
+    global _framework_matcher
+    if _framework_matcher is None:
+        _framework_matcher = KeywordMatcher(FILE_INDEX)
+    return _framework_matcher
+
+
+def get_keyword_matcher() -> KeywordMatcher | ChainedKeywordMatcher:
+    """Matcher for FILE_INDEX plus discovered project workflows.
+
+    The project part is rebuilt only when a workflow file is added, removed
+    or modified.
+    """
+    global _project_matcher_cache
+    framework = get_framework_keyword_matcher()
+    search_dirs = _project_workflow_dirs()
+    if not search_dirs:
+        return framework
+    fingerprint = _project_workflow_fingerprint(search_dirs)
+    if _project_matcher_cache is None or _project_matcher_cache[0] != fingerprint:
+        entries = tuple(_get_project_workflow_entries(search_dirs))
+        _project_matcher_cache = (fingerprint, KeywordMatcher(entries))
+    return ChainedKeywordMatcher(framework, _project_matcher_cache[1])
+
+
 def _normalize_text(text: str) -> str:
     """Normalize text for keyword matching (lowercase, collapse whitespace)."""
     return re.sub(r"\s+", " ", text.lower().strip())
@@ -547,29 +722,18 @@ def get_relevant_file_paths(prompt: str, max_files: int = 10) -> list[dict[str,
 
     prompt_lower = _normalize_text(prompt)
 
-    # Score each file entry by number of keyword matches
-    scored_entries: list[tuple[int, FileEntry]] = []
-
-    # Combined framework and project entries
-    all_entries = list(FILE_INDEX) + _get_project_workflow_entries()
-
-    for entry in all_entries:
-        score = 0
-        for keyword in entry.keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in prompt_lower:
-                # Longer keyword matches are more specific, score higher
-                score += len(keyword)
-
-        if score > 0:
-            scored_entries.append((score, entry))
+    # Score framework and project entries in one pass over the prompt.
+    # Longer keyword matches are more specific, so they score higher.
+    matcher = get_keyword_matcher()
+    scores = matcher.scores(prompt_lower)
 
-    # Sort by score descending
-    scored_entries.sort(key=lambda x: x[0], reverse=True)
+    # Sort by score descending (index order breaks ties)
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
 
     # Take top entries up to max_files
     results: list[dict[str, str]] = []
-    for _score, entry in scored_entries[:max_files]:
+    for index, _score in ranked[:max_files]:
+        entry = matcher.entries[index]
         try:
             abs_path = str(entry.absolute_path())
         except RuntimeError:
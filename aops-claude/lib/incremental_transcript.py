@@ -0,0 +1,396 @@
+"""Incremental markdown rendering of Claude Code transcripts.
+
+Every Stop used to re-render the whole session: full parse, turn grouping
+and format_session_as_markdown over the entire history, although only the
+last turn was new. render_transcript renders the full and abridged
+markdown transcripts incrementally, keeping a cursor per transcript under
+~/.polecat/transcript-render/ ($AOPS_TRANSCRIPT_RENDER).
+
+The cursor records:
+- offset: transcript bytes consumed (always at a line end)
+- window_start: where the last, still-open turn begins; it is re-read and
+  re-rendered each call because later lines can still add to it
+- hook_window_start: the matching position in the session's hook log
+- turn_number, session_start: numbering and timing origin of the turns
+  before window_start
+- stats: Context Summary totals of the entries before window_start, plus
+  every complete line of the session's agent files (agent_offsets)
+- title, first_timestamp, first_request, cwd: header fields
+- outputs: per variant, the markdown file and the byte lengths of its
+  header and of the body rendered for closed turns
+
+A call reads from window_start, renders the turns closed since the last
+call and the open turn, then writes header + stored body + new closed
+turns + open turn. The stored body is copied, not re-rendered, so the work
+is proportional to the new turns. The result matches
+format_session_as_markdown over the whole session.
+
+The cursor is discarded (full re-render) when the transcript was replaced
+or truncated, or when an output file no longer has the recorded size.
+
+Usage:
+    from lib.incremental_transcript import render_transcript
+
+    outputs = render_transcript(transcript_path)  # {"full": Path, "abridged": Path}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from lib.paths import get_transcript_render_dir, get_transcripts_dir
+from lib.session_paths import get_session_short_hash
+from lib.transcript_parser import (
+    ContextSummaryStats,
+    ConversationTurn,
+    Entry,
+    SessionProcessor,
+    SessionSummary,
+    _decode_jsonl_line,
+    hook_record_to_entry,
+)
+
+logger = logging.getLogger(__name__)
+
+_CURSOR_VERSION = 1  # Bump when the cursor format or the rendering changes
+_CURSOR_HEAD_BYTES = 4096
+
+# Variant -> include_tool_results
+VARIANTS = {"full": True, "abridged": False}
+
+_MIN_TIMESTAMP = datetime.min.replace(tzinfo=UTC)
+
+_COPY_CHUNK = 1024 * 1024
+
+
+def _cursor_path(transcript_path: Path) -> Path:
+    digest = hashlib.sha1(str(transcript_path).encode("utf-8")).hexdigest()[:16]
+    return get_transcript_render_dir() / f"{transcript_path.stem[:8]}-{digest}.json"
+
+
+def _file_head(f: BinaryIO, offset: int) -> str:
+    """Hash of the file's first bytes (up to _CURSOR_HEAD_BYTES, within offset)."""
+    f.seek(0)
+    return hashlib.sha256(f.read(min(offset, _CURSOR_HEAD_BYTES))).hexdigest()[:16]
+
+
+def _read_complete_lines(path: Path, offset: int) -> tuple[list[tuple[int, dict[str, Any]]], int]:
+    """(position, record) of the complete lines from offset, and the offset after them.
+
+    A trailing line without a newline may still be being written and is
+    left for the next call.
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return [], offset
+    complete_len = data.rfind(b"\n") + 1
+    records = []
+    position = offset
+    for line in data[:complete_len].splitlines(keepends=True):
+        record = _decode_jsonl_line(line)
+        if record is not None:
+            records.append((position, record))
+        position += len(line)
+    return records, position
+
+
+def _new_cursor(transcript_path: Path, inode: int) -> dict[str, Any]:
+    return {
+        "version": _CURSOR_VERSION,
+        "transcript": str(transcript_path),
+        "inode": inode,
+        "offset": 0,
+        "window_start": 0,
+        "hook_file": None,
+        "hook_window_start": 0,
+        "turn_number": 0,
+        "session_start": None,
+        "title": "Claude Code Session",
+        "first_timestamp": None,
+        "first_request": None,
+        "cwd": None,
+        "stats": ContextSummaryStats().to_dict(),
+        "agent_offsets": {},
+        "outputs": {},
+    }
+
+
+def _outputs_intact(cursor: dict[str, Any]) -> bool:
+    for output in cursor["outputs"].values():
+        try:
+            size = Path(output["path"]).stat().st_size
+        except OSError:
+            return False
+        if size != output["size"]:
+            return False
+    return True
+
+
+def _load_cursor(cursor_path: Path, transcript_path: Path, f: BinaryIO) -> dict[str, Any]:
+    """Load the cursor for transcript_path, or a fresh one if it no longer applies."""
+    stat = os.fstat(f.fileno())
+    try:
+        cursor = json.loads(cursor_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return _new_cursor(transcript_path, stat.st_ino)
+
+    valid = (
+        isinstance(cursor, dict)
+        and cursor.get("version") == _CURSOR_VERSION
+        and cursor.get("transcript") == str(transcript_path)
+        and cursor.get("inode") == stat.st_ino
+        and 0 <= cursor.get("window_start", -1) <= cursor.get("offset", -1) <= stat.st_size
+    )
+    if valid and cursor["offset"] > 0:
+        # Same leading bytes (not a rewritten file) and the byte before the
+        # offset still ends a line
+        valid = cursor.get("head") == _file_head(f, cursor["offset"])
+        f.seek(cursor["offset"] - 1)
+        valid = valid and f.read(1) == b"\n"
+    if not valid or not _outputs_intact(cursor):
+        return _new_cursor(transcript_path, stat.st_ino)
+    return cursor
+
+
+def _save_cursor(cursor_path: Path, cursor: dict[str, Any]) -> None:
+    """Atomically write the cursor. Failures only cost a full re-render next time."""
+    try:
+        cursor_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cursor_path.parent, prefix=".render-", suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp:
+            json.dump(cursor, tmp, separators=(",", ":"))
+        os.replace(tmp_path, cursor_path)
+    except OSError as e:
+        logger.debug(f"Could not write transcript render cursor {cursor_path}: {e}")
+
+
+def _parse_iso(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def transcript_output_path(
+    session_id: str, variant: str, first_timestamp: datetime | None, project: str | None
+) -> Path:
+    """YYYYMMDD-HH-project-sessionid-variant.md in the transcripts directory.
+
+    project is a directory or project name; it is slugified and left out
+    when empty.
+    """
+    first_timestamp = first_timestamp or datetime.now().astimezone()
+    parts = [first_timestamp.strftime("%Y%m%d"), first_timestamp.strftime("%H")]
+    if project:
+        slug = re.sub(r"[^a-z0-9-]", "", project.lower().replace("_", "-"))
+        if slug.strip("-"):
+            parts.append(re.sub(r"-+", "-", slug).strip("-"))
+    parts.extend([get_session_short_hash(session_id), variant])
+    return get_transcripts_dir() / ("-".join(parts) + ".md")
+
+
+def _output_path(cursor: dict[str, Any], session_id: str, variant: str) -> Path:
+    project = Path(cursor["cwd"]).name if cursor["cwd"] else None
+    return transcript_output_path(
+        session_id, variant, _parse_iso(cursor["first_timestamp"]), project
+    )
+
+
+def _write_output(
+    path: Path, old: dict[str, Any] | None, header: bytes, closed: bytes, open_turn: bytes
+) -> dict[str, Any]:
+    """Atomically write header + old's stored body + closed + open_turn to path.
+
+    Returns the output record for the cursor: the stored body grows by
+    closed, while open_turn is re-rendered next time.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body_len = old["body_len"] if old is not None else 0
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".transcript-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(header)
+            if old is not None:
+                with open(old["path"], "rb") as src:
+                    src.seek(old["header_len"])
+                    remaining = body_len
+                    while remaining > 0:
+                        chunk = src.read(min(_COPY_CHUNK, remaining))
+                        if not chunk:
+                            raise OSError(f"{old['path']} is shorter than its cursor")
+                        tmp.write(chunk)
+                        remaining -= len(chunk)
+            tmp.write(closed)
+            tmp.write(open_turn)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return {
+        "path": str(path),
+        "header_len": len(header),
+        "body_len": body_len + len(closed),
+        "size": len(header) + body_len + len(closed) + len(open_turn),
+    }
+
+
+def _fold_agent_usage(
+    processor: SessionProcessor, transcript_path: Path, cursor: dict[str, Any]
+) -> tuple[ContextSummaryStats, int]:
+    """Cursor stats plus the agent-file lines written since the last call, and the agent count."""
+    stats = ContextSummaryStats.from_dict(cursor["stats"])
+    agent_files = processor._find_agent_files(transcript_path)
+    offsets = cursor["agent_offsets"]
+    for agent_id, agent_file in agent_files:
+        key = str(agent_file)
+        records, offsets[key] = _read_complete_lines(agent_file, offsets.get(key, 0))
+        for _, record in records:
+            stats.add_agent_entry(Entry.from_dict(record), agent_id)
+    return stats, len(agent_files)
+
+
+def _render(transcript_path: Path, cursor_path: Path) -> dict[str, Path]:
+    processor = SessionProcessor()
+    session_id = transcript_path.stem
+    hook_file = processor._find_hook_file(transcript_path)
+
+    with open(transcript_path, "rb") as f:
+        cursor = _load_cursor(cursor_path, transcript_path, f)
+        if cursor["offset"] > 0 and cursor["hook_file"] != (str(hook_file) if hook_file else None):
+            # A newly found hook log has entries for turns already rendered
+            cursor = _new_cursor(transcript_path, os.fstat(f.fileno()).st_ino)
+    cursor["hook_file"] = str(hook_file) if hook_file else None
+    records, offset = _read_complete_lines(transcript_path, cursor["window_start"])
+    with open(transcript_path, "rb") as f:
+        head = _file_head(f, offset)
+
+    # Main transcript entries in the window, remembering where each line starts
+    positions: dict[int, int] = {}
+    window: list[Entry] = []
+    for position, record in records:
+        if cursor["cwd"] is None and isinstance(record.get("cwd"), str):
+            cursor["cwd"] = record["cwd"]
+        entry = Entry.from_dict(record)
+        if entry.type == "summary":
+            cursor["title"] = entry.content.get("summary", "Claude Code Session")
+        positions[id(entry)] = position
+        window.append(entry)
+
+    # Hook log records from the hook window on, merged by timestamp as in
+    # SessionProcessor.parse_session_file
+    hook_records: list[tuple[int, Entry]] = []
+    hook_end = 0
+    if hook_file is not None:
+        hook_lines, hook_end = _read_complete_lines(hook_file, cursor["hook_window_start"])
+        hook_records = [(pos, hook_record_to_entry(record)) for pos, record in hook_lines]
+        window.extend(entry for _, entry in hook_records)
+        window.sort(key=lambda e: e.timestamp if e.timestamp else _MIN_TIMESTAMP)
+
+    # Turn boundaries, exactly as group_entries_into_turns finds them
+    main_entries = [e for e in window if not e.is_sidechain]
+    turn_starts = [
+        e for i, e in enumerate(main_entries) if processor.turn_start_content(main_entries, i)
+    ]
+    open_start = turn_starts[-1] if turn_starts else None
+    # By identity: Entry equality would match an earlier entry with equal fields
+    split = (
+        next(i for i, e in enumerate(window) if e is open_start) if open_start is not None else 0
+    )
+
+    if cursor["first_timestamp"] is None:
+        first = next((e.timestamp for e in window if e.timestamp), None)
+        cursor["first_timestamp"] = first.isoformat() if first else None
+    if cursor["first_request"] is None:
+        cursor["first_request"] = processor._extract_first_user_request(window)
+    if cursor["session_start"] is None and turn_starts and turn_starts[0].timestamp:
+        cursor["session_start"] = turn_starts[0].timestamp.isoformat()
+
+    # Until the first turn is closed it is in the window and grouping finds it
+    session_start = _parse_iso(cursor["session_start"]) if cursor["turn_number"] else None
+    turns = processor.group_entries_into_turns(
+        window, processor._load_agent_files(transcript_path), session_start=session_start
+    )
+    conversation = [i for i, turn in enumerate(turns) if isinstance(turn, ConversationTurn)]
+    open_index = conversation[-1] if open_start is not None and conversation else 0
+
+    # Header stats: totals before the window, new agent lines, then the window
+    closed_stats, agent_count = _fold_agent_usage(processor, transcript_path, cursor)
+    for entry in window[:split]:
+        closed_stats.add_entry(entry)
+    stats = ContextSummaryStats.from_dict(closed_stats.to_dict())
+    for entry in window[split:]:
+        stats.add_entry(entry)
+
+    session = SessionSummary(uuid=session_id, summary=cursor["title"])
+    first_timestamp = _parse_iso(cursor["first_timestamp"])
+    context_summary = stats.format(agent_count)
+
+    outputs: dict[str, Path] = {}
+    new_outputs: dict[str, Any] = {}
+    closed_turn_number = cursor["turn_number"]
+    for variant, include_tool_results in VARIANTS.items():
+        full_mode = variant == "full"
+        closed_md, closed_turn_number = processor.format_turns_as_markdown(
+            turns[:open_index], full_mode, include_tool_results, cursor["turn_number"]
+        )
+        open_md, _ = processor.format_turns_as_markdown(
+            turns[open_index:], full_mode, include_tool_results, closed_turn_number
+        )
+        header = processor.format_markdown_header(
+            session, variant, first_timestamp, cursor["first_request"], context_summary
+        )
+
+        old = cursor["outputs"].get(variant)
+        path = Path(old["path"]) if old else _output_path(cursor, session_id, variant)
+        new_outputs[variant] = _write_output(
+            path, old, header.encode("utf-8"), closed_md.encode("utf-8"), open_md.encode("utf-8")
+        )
+        outputs[variant] = path
+
+    # Advance the cursor past the closed turns
+    cursor["stats"] = closed_stats.to_dict()
+    if open_start is not None:
+        cursor["window_start"] = positions[id(open_start)]
+        cursor["turn_number"] = closed_turn_number
+        if hook_file is not None:
+            # Hooks logged before the open turn now belong to closed turns
+            cursor["hook_window_start"] = next(
+                (
+                    pos
+                    for pos, entry in hook_records
+                    if open_start.timestamp is None
+                    or entry.timestamp is None
+                    or entry.timestamp >= open_start.timestamp
+                ),
+                hook_end,
+            )
+    cursor["offset"] = offset
+    cursor["head"] = head
+    cursor["outputs"] = new_outputs
+    _save_cursor(cursor_path, cursor)
+    return outputs
+
+
+def render_transcript(
+    transcript_path: str | Path, cursor_path: Path | None = None
+) -> dict[str, Path]:
+    """Render (or bring up to date) the full and abridged markdown of a Claude JSONL transcript.
+
+    Args:
+        transcript_path: Claude Code session JSONL
+        cursor_path: Override the cursor file (default: one per transcript
+            under get_transcript_render_dir())
+
+    Returns:
+        variant -> markdown path
+    """
+    transcript_path = Path(transcript_path).resolve()
+    return _render(transcript_path, cursor_path or _cursor_path(transcript_path))
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Durable local job spool for background side effects.
+
+Hooks must answer within their timeout, so slow side effects (ntfy HTTP
+posts, ACA_DATA git commit/push, transcript generation) are enqueued here
+and executed by a background worker (hooks/side_effects.py).
+
+Storage is a single SQLite database in WAL mode, so an enqueue is one
+small insert and survives crashes and restarts. Payloads carry each job's
+environment, so the database is created readable by its owner only.
+
+Job lifecycle:
+    pending -> running -> done
+                       -> pending (retry after exponential backoff)
+                       -> failed  (max_attempts exhausted)
+
+Usage:
+    from lib.job_spool import JobSpool
+
+    spool = JobSpool()
+    spool.enqueue("ntfy", {"event": "session_stop", "args": [...]})
+
+    job = spool.claim()
+    if job:
+        try:
+            run(job)
+            spool.complete(job.id)
+        except Exception as e:
+            spool.fail(job, str(e))
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from lib.paths import get_job_spool_path
+
+DEFAULT_MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 600.0
+DONE_RETENTION_SECONDS = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, next_attempt_at);
+"""
+
+
+@dataclass
+class Job:
+    """A claimed job."""
+
+    id: int
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+    created_at: float
+    last_error: str | None = None
+
+
+def backoff_delay(attempts: int) -> float:
+    """Seconds to wait before retrying a job that has failed `attempts` times."""
+    return min(BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), BACKOFF_MAX_SECONDS)
+
+
+class JobSpool:
+    """SQLite-backed job queue with retry and exponential backoff."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or get_job_spool_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # SQLite gives the -wal/-shm files the database file's mode
+        os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+        os.chmod(self.path, 0o600)
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue(
+        self, kind: str, payload: dict[str, Any], max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> int:
+        """Add a job; it becomes due immediately. Returns the job id."""
+        now = time.time()
+        cur = self._conn.execute(
+            "INSERT INTO jobs (kind, payload, max_attempts, created_at, next_attempt_at,"
+            " updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, json.dumps(payload), max_attempts, now, now, now),
+        )
+        return int(cur.lastrowid or 0)
+
+    def claim(self) -> Job | None:
+        """Mark the oldest due pending job as running and return it."""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' AND next_attempt_at <= ?"
+                " ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ?"
+                " WHERE id = ?",
+                (now, row["id"]),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            payload=json.loads(row["payload"]),
+            attempts=row["attempts"] + 1,
+            max_attempts=row["max_attempts"],
+            created_at=row["created_at"],
+            last_error=row["last_error"],
+        )
+
+    def complete(self, job_id: int) -> None:
+        self._conn.execute(
+            "UPDATE jobs SET status = 'done', updated_at = ?, last_error = NULL WHERE id = ?",
+            (time.time(), job_id),
+        )
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Record a failed attempt. Returns True if the job will be retried."""
+        now = time.time()
+        if job.attempts >= job.max_attempts:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', updated_at = ?, last_error = ? WHERE id = ?",
+                (now, error, job.id),
+            )
+            return False
+        self._conn.execute(
+            "UPDATE jobs SET status = 'pending', next_attempt_at = ?, updated_at = ?,"
+            " last_error = ? WHERE id = ?",
+            (now + backoff_delay(job.attempts), now, error, job.id),
+        )
+        return True
+
+    def requeue_running(self) -> int:
+        """Return jobs left 'running' by a dead worker to the queue."""
+        cur = self._conn.execute(
+            "UPDATE jobs SET status = 'pending', updated_at = ? WHERE status = 'running'",
+            (time.time(),),
+        )
+        return cur.rowcount
+
+    def retry_failed(self, job_id: int | None = None) -> int:
+        """Reset failed jobs (or one job) to pending with a fresh attempt budget."""
+        now = time.time()
+        sql = (
+            "UPDATE jobs SET status = 'pending', attempts = 0, next_attempt_at = ?,"
+            " updated_at = ? WHERE status = 'failed'"
+        )
+        params: tuple[Any, ...] = (now, now)
+        if job_id is not None:
+            sql += " AND id = ?"
+            params += (job_id,)
+        return self._conn.execute(sql, params).rowcount
+
+    def prune_done(self, older_than: float = DONE_RETENTION_SECONDS) -> int:
+        cur = self._conn.execute(
+            "DELETE FROM jobs WHERE status = 'done' AND updated_at < ?",
+            (time.time() - older_than,),
+        )
+        return cur.rowcount
+
+    def next_due_in(self) -> float | None:
+        """Seconds until the next pending job is due (0 if overdue), None if none pending."""
+        row = self._conn.execute(
+            "SELECT MIN(next_attempt_at) FROM jobs WHERE status = 'pending'"
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0.0)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Job counts as {kind: {status: count}}."""
+        result: dict[str, dict[str, int]] = {}
+        for row in self._conn.execute(
+            "SELECT kind, status, COUNT(*) AS n FROM jobs GROUP BY kind, status"
+        ):
+            result.setdefault(row["kind"], {})[row["status"]] = row["n"]
+        return result
+
+    def failures(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Most recent failed jobs plus pending jobs that have already failed once."""
+        rows = self._conn.execute(
+            "SELECT id, kind, status, attempts, max_attempts, updated_at, last_error FROM jobs"
+            " WHERE last_error IS NOT NULL AND status IN ('failed', 'pending')"
+            " ORDER BY updated_at DESC LIMIT ?",
+            (limit,),
+        )
+        return [dict(row) for row in rows]
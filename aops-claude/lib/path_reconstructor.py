@@ -10,14 +10,20 @@ No JSONL or markdown parsing — reads only pre-computed summary JSONs.
 from __future__ import annotations
 
 import json
+import logging
 import os
 import re
+import sqlite3
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
 
 from lib.paths import get_summaries_dir
+from lib.summaries_manifest import get_summaries_manifest
+
+logger = logging.getLogger(__name__)
 
 
 class EventType(Enum):
@@ -349,6 +355,30 @@ def _detect_abandoned_work(threads: list[SessionThread]) -> list[TimelineEvent]:
     return abandoned
 
 
+def _window_summaries(
+    summaries_dir: Path, cutoff: datetime, seen_sessions: set[str]
+) -> Iterator[Path]:
+    """Summary JSONs that may fall in the window, newest name first.
+
+    Uses the summaries manifest so only files named inside the window are
+    listed, and files the manifest knows to have an empty or already seen
+    session_id are skipped without being opened. The caller still applies
+    the exact filename cutoff and reads session_id from the file.
+    """
+    try:
+        # An hour of slack for DST transitions; the caller filters exactly
+        min_key = (cutoff - timedelta(hours=1)).strftime("%Y%m%d%H")
+        rows = get_summaries_manifest().window(summaries_dir, min_key)
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"Summaries manifest unavailable, globbing {summaries_dir}: {e}")
+        yield from sorted(summaries_dir.glob("*.json"), reverse=True)
+        return
+    for name, session_id in rows:
+        if session_id is not None and (not session_id or session_id in seen_sessions):
+            continue
+        yield summaries_dir / name
+
+
 def reconstruct_path(hours: int = 24) -> ReconstructedPath:
     """Reconstruct the path taken across recent sessions.
 
@@ -375,7 +405,7 @@ def reconstruct_path(hours: int = 24) -> ReconstructedPath:
     seen_sessions: set[str] = set()
     filtered_count = 0
 
-    for json_path in sorted(summaries_dir.glob("*.json"), reverse=True):
+    for json_path in _window_summaries(summaries_dir, cutoff, seen_sessions):
         # Quick date filter from filename (YYYYMMDD-HH-...)
         try:
             name = json_path.stem
@@ -20,16 +20,28 @@ Used by:
 
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
+import os
 import re
-from collections import Counter
-from dataclasses import dataclass, field
+import tempfile
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from lib.paths import get_error_analysis_cache_dir
 from lib.session_paths import get_claude_project_folder
 
+logger = logging.getLogger(__name__)
+
+# Bump when extraction or classification changes, to invalidate cached reports
+_REPORT_CACHE_VERSION = 1
+
 # Exploration patterns: common convention files agents probe for
 _EXPLORATION_PATTERNS = {
     "README.md",
@@ -126,6 +138,15 @@ class ErrorAnalysisReport:
     severity_score: float
     errors: list[TranscriptError]
 
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> ErrorAnalysisReport:
+        """Rebuild a report from dataclasses.asdict() output (the on-disk cache)."""
+        errors = [
+            TranscriptError(**{**e, "hydration_state": HydrationState(**e["hydration_state"])})
+            for e in record["errors"]
+        ]
+        return cls(**{**record, "errors": errors})
+
     def to_dict(self) -> dict[str, Any]:
         """Serialize report to dict for JSON output."""
         return {
@@ -286,109 +307,157 @@ def _summarize_tool_input(tool_name: str, tool_input: dict[str, Any]) -> str:
     return ""
 
 
-def _load_entries(session_path: Path) -> list[dict[str, Any]]:
-    """Load raw entries from a JSONL session file."""
-    entries: list[dict[str, Any]] = []
+def _error_path(error: TranscriptError) -> str:
+    """The file path or pattern an error is about ("" if none)."""
+    return error.tool_input.get("file_path", "") or error.tool_input.get("pattern", "")
+
+
+def _iter_entries(session_path: Path) -> Iterator[dict[str, Any]]:
+    """Stream raw entries from a JSONL session file."""
     with open(session_path) as f:
         for line in f:
             line = line.strip()
             if line:
-                entries.append(json.loads(line))
-    return entries
+                yield json.loads(line)
 
 
-def _build_tool_use_map(entries: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
-    """Build mapping from tool_use_id to tool info (name, input, timestamp)."""
-    tool_map: dict[str, dict[str, Any]] = {}
-    for entry in entries:
-        if entry.get("type") != "assistant":
-            continue
-        message = entry.get("message", {})
-        content = message.get("content", [])
-        if not isinstance(content, list):
-            continue
-        for block in content:
-            if isinstance(block, dict) and block.get("type") == "tool_use":
-                tool_id = block.get("id", "")
-                if tool_id:
-                    tool_map[tool_id] = {
-                        "name": block.get("name", "unknown"),
-                        "input": block.get("input", {}),
-                        "timestamp": entry.get("timestamp"),
-                    }
-    return tool_map
-
-
-def _build_hydration_state(entries: list[dict[str, Any]], error_index: int) -> HydrationState:
-    """Build the hydration state at the point of an error.
-
-    Looks backward from error_index to find:
+def _content_blocks(entry: dict[str, Any]) -> list[Any]:
+    content = entry.get("message", {}).get("content", [])
+    return content if isinstance(content, list) else []
+
+
+class _RecentBlocks:
+    """The last `limit` blocks before a point, as a backward walk collects them.
+
+    Walking backward through entries, blocks are taken in their order
+    within each entry until `limit` are collected, then reversed. Only the
+    last `limit` entries that had blocks can contribute, so that is all
+    this keeps.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._entries: deque[list[Any]] = deque(maxlen=limit)
+
+    def add(self, blocks: list[Any]) -> None:
+        if blocks:
+            self._entries.append(blocks)
+
+    def snapshot(self) -> list[Any]:
+        picked: list[Any] = []
+        for blocks in reversed(self._entries):
+            picked.extend(blocks[: self.limit - len(picked)])
+            if len(picked) >= self.limit:
+                break
+        picked.reverse()
+        return picked
+
+
+class _HydrationWindow:
+    """Rolling hydration state, advanced one entry at a time.
+
+    Equivalent to walking backward from each error to the start of the
+    transcript, but O(1) per entry:
     - Most recent Skill invocation (active skill)
     - Recent user prompts (last 3)
-    - Recent tool calls (last 5 before the error)
+    - Recent tool calls (last 5, excluding Skill)
     """
-    active_skill: str | None = None
-    prompts: list[str] = []
-    tool_calls: list[dict[str, Any]] = []
 
-    for i in range(error_index - 1, -1, -1):
-        entry = entries[i]
-        etype = entry.get("type")
+    def __init__(self) -> None:
+        self.active_skill: str | None = None
+        self._prompts = _RecentBlocks(3)
+        self._tool_calls = _RecentBlocks(5)
 
-        # Collect user prompts
+    def add(self, entry: dict[str, Any]) -> None:
+        etype = entry.get("type")
         if etype == "user":
-            message = entry.get("message", {})
-            content = message.get("content", [])
-            if isinstance(content, list):
-                for block in content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        text = block.get("text", "").strip()
-                        if text and len(prompts) < 3:
-                            prompts.append(text)
-
-        # Find most recent Skill invocation
-        if etype == "assistant" and active_skill is None:
-            message = entry.get("message", {})
-            content = message.get("content", [])
-            if isinstance(content, list):
-                for block in content:
-                    if (
-                        isinstance(block, dict)
-                        and block.get("type") == "tool_use"
-                        and block.get("name") == "Skill"
-                    ):
-                        active_skill = block.get("input", {}).get("skill")
-
-        # Collect recent tool calls (non-error ones)
-        if etype == "assistant":
-            message = entry.get("message", {})
-            content = message.get("content", [])
-            if isinstance(content, list):
-                for block in content:
-                    if (
-                        isinstance(block, dict)
-                        and block.get("type") == "tool_use"
-                        and block.get("name") != "Skill"
-                        and len(tool_calls) < 5
-                    ):
-                        tool_calls.append(
-                            {
-                                "tool_name": block.get("name", "unknown"),
-                                "input_summary": _summarize_tool_input(
-                                    block.get("name", ""), block.get("input", {})
-                                ),
-                            }
+            prompts = []
+            for block in _content_blocks(entry):
+                if isinstance(block, dict) and block.get("type") == "text":
+                    text = block.get("text", "").strip()
+                    if text:
+                        prompts.append(text)
+            self._prompts.add(prompts)
+        elif etype == "assistant":
+            entry_skill: str | None = None
+            tool_calls = []
+            for block in _content_blocks(entry):
+                if not isinstance(block, dict) or block.get("type") != "tool_use":
+                    continue
+                name = block.get("name")
+                if name == "Skill":
+                    # The last Skill block of an entry wins, as in a backward walk
+                    entry_skill = block.get("input", {}).get("skill")
+                else:
+                    tool_calls.append(
+                        (
+                            block.get("name", "unknown"),
+                            _summarize_tool_input(block.get("name", ""), block.get("input", {})),
                         )
+                    )
+            if entry_skill is not None:
+                self.active_skill = entry_skill
+            self._tool_calls.add(tool_calls)
+
+    def snapshot(self) -> HydrationState:
+        return HydrationState(
+            active_skill=self.active_skill,
+            recent_prompts=self._prompts.snapshot(),
+            recent_tool_calls=[
+                {"tool_name": name, "input_summary": summary}
+                for name, summary in self._tool_calls.snapshot()
+            ],
+        )
 
-    # Reverse to get chronological order
-    prompts.reverse()
-    tool_calls.reverse()
 
-    return HydrationState(
-        active_skill=active_skill,
-        recent_prompts=prompts,
-        recent_tool_calls=tool_calls,
-    )
+def _extract_errors(entries: Iterable[dict[str, Any]]) -> list[TranscriptError]:
+    """Single forward pass: tool_use map, hydration window and errors together."""
+    tool_map: dict[str, dict[str, Any]] = {}
+    window = _HydrationWindow()
+    errors: list[TranscriptError] = []
+
+    for entry in entries:
+        etype = entry.get("type")
+        if etype == "assistant":
+            for block in _content_blocks(entry):
+                if isinstance(block, dict) and block.get("type") == "tool_use":
+                    tool_id = block.get("id", "")
+                    if tool_id:
+                        tool_map[tool_id] = {
+                            "name": block.get("name", "unknown"),
+                            "input": block.get("input", {}),
+                            "timestamp": entry.get("timestamp"),
+                        }
+        elif etype == "user":
+            # Hydration state before this entry, shared by all its errors
+            hydration_state: HydrationState | None = None
+            for item in _content_blocks(entry):
+                if not isinstance(item, dict) or item.get("type") != "tool_result":
+                    continue
+                # Check both snake_case and camelCase error flags
+                if not (item.get("is_error") or item.get("isError")):
+                    continue
+
+                tool_id = item.get("tool_use_id") or item.get("toolUseId") or ""
+                tool_info = tool_map.get(tool_id, {})
+                tool_name = tool_info.get("name", "unknown")
+                tool_input = tool_info.get("input", {})
+                if hydration_state is None:
+                    hydration_state = window.snapshot()
+
+                errors.append(
+                    TranscriptError(
+                        timestamp=tool_info.get("timestamp") or entry.get("timestamp"),
+                        tool_name=tool_name,
+                        tool_input=tool_input,
+                        tool_input_summary=_summarize_tool_input(tool_name, tool_input),
+                        error_content=str(item.get("content", "")),
+                        hydration_state=hydration_state,
+                    )
+                )
+        window.add(entry)
+
+    return errors
 
 
 def extract_transcript_errors(session_path: Path) -> list[TranscriptError]:
@@ -398,55 +467,16 @@ def extract_transcript_errors(session_path: Path) -> list[TranscriptError]:
     - The tool name and input that caused it
     - The hydration state at time of error (active skill, recent prompts, recent tools)
 
+    The transcript is streamed once; the hydration state is a rolling
+    window rather than a backward walk per error.
+
     Args:
         session_path: Path to session .jsonl file
 
     Returns:
         List of TranscriptError objects, in chronological order.
     """
-    entries = _load_entries(session_path)
-    if not entries:
-        return []
-
-    tool_map = _build_tool_use_map(entries)
-    errors: list[TranscriptError] = []
-
-    for idx, entry in enumerate(entries):
-        if entry.get("type") != "user":
-            continue
-
-        message = entry.get("message", {})
-        content = message.get("content", [])
-        if not isinstance(content, list):
-            continue
-
-        for item in content:
-            if not isinstance(item, dict) or item.get("type") != "tool_result":
-                continue
-            # Check both snake_case and camelCase error flags
-            if not (item.get("is_error") or item.get("isError")):
-                continue
-
-            tool_id = item.get("tool_use_id") or item.get("toolUseId") or ""
-            tool_info = tool_map.get(tool_id, {})
-            tool_name = tool_info.get("name", "unknown")
-            tool_input = tool_info.get("input", {})
-            error_content = str(item.get("content", ""))
-
-            hydration_state = _build_hydration_state(entries, idx)
-
-            errors.append(
-                TranscriptError(
-                    timestamp=tool_info.get("timestamp") or entry.get("timestamp"),
-                    tool_name=tool_name,
-                    tool_input=tool_input,
-                    tool_input_summary=_summarize_tool_input(tool_name, tool_input),
-                    error_content=error_content,
-                    hydration_state=hydration_state,
-                )
-            )
-
-    return errors
+    return _extract_errors(_iter_entries(session_path))
 
 
 def classify_errors(
@@ -479,7 +509,7 @@ def classify_errors(
     # First pass: count repeated paths
     for i, error in enumerate(errors):
         if error.tool_name in ("Read", "Write", "Edit", "Glob"):
-            path = error.tool_input.get("file_path", "") or error.tool_input.get("pattern", "")
+            path = _error_path(error)
             if path:
                 path_counts[path] += 1
                 if path not in path_first_seen:
@@ -511,7 +541,7 @@ def _classify_single_error(
 
     # 3. Stuck pattern: same path attempted multiple times, and this isn't the first
     if error.tool_name in ("Read", "Write", "Edit", "Glob"):
-        path = error.tool_input.get("file_path", "") or error.tool_input.get("pattern", "")
+        path = _error_path(error)
         if path and path_counts.get(path, 0) >= 2 and path_first_seen.get(path) != index:
             return "stuck_pattern"
 
@@ -558,7 +588,7 @@ def _compute_severity_score(errors: list[TranscriptError]) -> float:
     # Count all repeats per path (across all categories) for stuck escalation
     path_error_counts: Counter[str] = Counter()
     for e in errors:
-        path = e.tool_input.get("file_path", "") or e.tool_input.get("pattern", "")
+        path = _error_path(e)
         if path:
             path_error_counts[path] += 1
 
@@ -566,7 +596,7 @@ def _compute_severity_score(errors: list[TranscriptError]) -> float:
     for e in errors:
         repeat = 1
         if e.category == "stuck_pattern":
-            path = e.tool_input.get("file_path", "") or e.tool_input.get("pattern", "")
+            path = _error_path(e)
             if path:
                 repeat = path_error_counts.get(path, 1)
         _, weight = severity_for(e.category, repeat)
@@ -583,9 +613,7 @@ def analyze_transcript(session_path: Path) -> ErrorAnalysisReport:
     Returns:
         ErrorAnalysisReport with all errors classified and summary statistics.
     """
-    entries = _load_entries(session_path)
-    errors = extract_transcript_errors(session_path)
-    classified = classify_errors(errors, entries)
+    classified = classify_errors(extract_transcript_errors(session_path))
 
     category_counts: dict[str, int] = {}
     hydration_related = 0
@@ -647,16 +675,110 @@ def _find_recent_sessions(
     return [f for _, f in sessions]
 
 
+def _report_cache_path(session_path: Path) -> Path:
+    digest = hashlib.sha1(str(session_path).encode("utf-8")).hexdigest()[:16]
+    return get_error_analysis_cache_dir() / f"{session_path.stem[:8]}-{digest}.json"
+
+
+def _load_cached_report(session_path: Path, st: os.stat_result) -> ErrorAnalysisReport | None:
+    """The cached report for session_path, if it was made from this size and mtime."""
+    try:
+        with open(_report_cache_path(session_path), encoding="utf-8") as f:
+            data = json.load(f)
+        if (
+            data.get("version") != _REPORT_CACHE_VERSION
+            or data.get("path") != str(session_path)
+            or data.get("size") != st.st_size
+            or data.get("mtime_ns") != st.st_mtime_ns
+        ):
+            return None
+        return ErrorAnalysisReport.from_record(data["report"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_cached_report(
+    session_path: Path, st: os.stat_result, report: ErrorAnalysisReport
+) -> None:
+    """Atomically write a report to the cache. Failures only cost a re-analysis."""
+    path = _report_cache_path(session_path)
+    data = {
+        "version": _REPORT_CACHE_VERSION,
+        "path": str(session_path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "report": asdict(report),
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".report-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            json.dump(data, tmp, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not cache error analysis for {session_path}: {e}")
+
+
+def _analyze_or_skip(session_path: Path) -> ErrorAnalysisReport | None:
+    """analyze_transcript, or None for a corrupt/unreadable/malformed file."""
+    try:
+        return analyze_transcript(session_path)
+    except (json.JSONDecodeError, OSError, KeyError, ValueError):
+        return None
+
+
+def _analyze_sessions(
+    sessions: list[Path], workers: int | None, use_cache: bool
+) -> list[ErrorAnalysisReport | None]:
+    """Reports for sessions (None if skipped), analyzing only uncached ones, in parallel."""
+    reports: list[ErrorAnalysisReport | None] = [None] * len(sessions)
+    stale: list[tuple[int, os.stat_result]] = []
+    for i, session_file in enumerate(sessions):
+        try:
+            st = session_file.stat()
+        except OSError:
+            continue
+        cached = _load_cached_report(session_file, st) if use_cache else None
+        if cached is not None:
+            reports[i] = cached
+        else:
+            stale.append((i, st))
+
+    paths = [sessions[i] for i, _ in stale]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        fresh = [_analyze_or_skip(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            fresh = list(pool.map(_analyze_or_skip, paths, chunksize=4))
+
+    for (i, st), report in zip(stale, fresh, strict=True):
+        reports[i] = report
+        if report is not None and use_cache:
+            _save_cached_report(sessions[i], st, report)
+    return reports
+
+
 def scan_recent_sessions(
     sessions_dir: Path | None = None,
     hours: float = 48.0,
+    workers: int | None = None,
+    use_cache: bool = True,
 ) -> MultiSessionReport:
     """Scan recent sessions and produce a severity-weighted investigation report.
 
+    Per-session reports are cached under ~/.polecat/error-analysis/
+    ($AOPS_ERROR_ANALYSIS_CACHE), keyed by path, size and mtime, so a scan
+    only analyzes new or modified transcripts and a wider window (days or
+    weeks) mostly costs cache reads. Uncached sessions are analyzed across
+    a process pool.
+
     Args:
         sessions_dir: Directory containing session JSONL files.
             Defaults to ~/.claude/projects/-home-nic-src-academicOps/
         hours: How far back to look (default 48 hours).
+        workers: Process pool size for uncached sessions (default: CPU count; 1 = serial)
+        use_cache: Read and write the per-session report cache
 
     Returns:
         MultiSessionReport with investigation queue sorted by severity * frequency.
@@ -684,65 +806,54 @@ def scan_recent_sessions(
     recent = _find_recent_sessions(sessions_dir, hours)
 
     reports: list[ErrorAnalysisReport] = []
-    all_errors: list[tuple[str, TranscriptError]] = []  # (session_id, error)
+    # Repeats per (path, category) across all sessions, for stuck escalation
+    path_counts: Counter[tuple[str, str]] = Counter()
+    pattern_map: dict[str, dict[str, Any]] = {}
 
-    for session_file in recent:
-        session_id = session_file.stem[:12]
-        try:
-            report = analyze_transcript(session_file)
-            reports.append(report)
-            for e in report.errors:
-                all_errors.append((session_id, e))
-        except (json.JSONDecodeError, OSError, KeyError, ValueError):
+    analyzed = _analyze_sessions(recent, workers, use_cache)
+    for session_file, report in zip(recent, analyzed, strict=True):
+        if report is None:
             continue  # Skip corrupt/unreadable/malformed files
+        session_id = session_file.stem[:12]
+        reports.append(report)
 
-    # Aggregate into patterns
-    pattern_map: dict[str, dict[str, Any]] = {}
-    for session_id, error in all_errors:
-        key = _grouping_key(error)
-        if key not in pattern_map:
-            # Count repeats for this specific error's path
-            path = error.tool_input.get("file_path", "") or error.tool_input.get("pattern", "")
-            path_count = (
-                sum(
-                    1
-                    for _, e in all_errors
-                    if (e.tool_input.get("file_path", "") or e.tool_input.get("pattern", ""))
-                    == path
-                    and e.category == error.category
-                )
-                if path
-                else 1
-            )
-            sev_label, sev_weight = severity_for(error.category, path_count)
-            pattern_map[key] = {
-                "category": error.category,
-                "severity_label": sev_label,
-                "severity_weight": sev_weight,
-                "count": 0,
-                "session_ids": [],
-                "sample_error_content": error.error_content,
-                "sample_prompts": error.hydration_state.recent_prompts[:2],
-            }
-        p = pattern_map[key]
-        p["count"] += 1
-        if session_id not in p["session_ids"]:
-            p["session_ids"].append(session_id)
+        # Aggregate into patterns; the first error of a pattern is its sample
+        for error in report.errors:
+            path = _error_path(error)
+            if path:
+                path_counts[(path, error.category)] += 1
+            key = _grouping_key(error)
+            p = pattern_map.get(key)
+            if p is None:
+                p = pattern_map[key] = {
+                    "category": error.category,
+                    "path": path,
+                    "count": 0,
+                    "session_ids": {},
+                    "sample_error_content": error.error_content,
+                    "sample_prompts": error.hydration_state.recent_prompts[:2],
+                }
+            p["count"] += 1
+            p["session_ids"][session_id] = None
 
     # Build IssuePattern list
-    patterns = [
-        IssuePattern(
-            grouping_key=key,
-            category=data["category"],
-            severity_label=data["severity_label"],
-            severity_weight=data["severity_weight"],
-            count=data["count"],
-            session_ids=data["session_ids"],
-            sample_error_content=data["sample_error_content"],
-            sample_prompts=data["sample_prompts"],
+    patterns = []
+    for key, data in pattern_map.items():
+        # Severity escalates with the sample error's path repeats in its category
+        path_count = path_counts[(data["path"], data["category"])] if data["path"] else 1
+        sev_label, sev_weight = severity_for(data["category"], path_count)
+        patterns.append(
+            IssuePattern(
+                grouping_key=key,
+                category=data["category"],
+                severity_label=sev_label,
+                severity_weight=sev_weight,
+                count=data["count"],
+                session_ids=list(data["session_ids"]),
+                sample_error_content=data["sample_error_content"],
+                sample_prompts=data["sample_prompts"],
+            )
         )
-        for key, data in pattern_map.items()
-    ]
 
     # Sort by weighted score descending
     patterns.sort(key=lambda p: p.weighted_score, reverse=True)
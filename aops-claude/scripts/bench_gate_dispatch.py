@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-event gate condition matching cost.
+
+Compares the pre-compiled, event-indexed dispatch tables in
+lib/gates/engine.py against the previous engine behaviour, reproduced
+below as `legacy_evaluate`: every trigger and policy of every gate is
+checked for every event, regexes are passed to re.search as raw strings
+and tool_input is stringified once per condition.
+
+Custom checks are replaced by a constant so only matching/dispatch cost is
+measured (custom conditions do their own I/O and are benchmarked separately).
+
+Usage:
+    python scripts/bench_gate_dispatch.py [--iterations N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+# Gate modes are mandatory at import time; any value works for benchmarking.
+for _var in (
+    "HANDOVER_GATE_MODE",
+    "QA_GATE_MODE",
+    "CUSTODIET_GATE_MODE",
+    "HYDRATION_GATE_MODE",
+    "COMMIT_GATE_MODE",
+):
+    os.environ.setdefault(_var, "warn")
+
+from hooks.gate_config import get_tool_category
+from hooks.schemas import HookContext
+from lib.gate_types import GateCondition, GateState
+from lib.gates.registry import GateRegistry
+from lib.session_state import SessionState
+
+SAMPLE_EVENTS = [
+    {"hook_event": "PreToolUse", "tool_name": "Bash", "tool_input": {"command": "git status"}},
+    {
+        "hook_event": "PreToolUse",
+        "tool_name": "Agent",
+        "tool_input": {"subagent_type": "custodiet", "prompt": "check " * 200},
+        "subagent_type": "custodiet",
+    },
+    {
+        "hook_event": "PostToolUse",
+        "tool_name": "mcp__pkb__update_task",
+        "tool_input": {"id": "aops-1234", "status": "in_progress", "body": "x" * 2000},
+    },
+    {"hook_event": "PostToolUse", "tool_name": "Read", "tool_input": {"file_path": "/tmp/a.py"}},
+    {"hook_event": "UserPromptSubmit"},
+    {"hook_event": "Stop"},
+    {"hook_event": "SubagentStop", "subagent_type": "prompt-hydrator"},
+]
+
+
+def legacy_evaluate(
+    condition: GateCondition, ctx: HookContext, state: GateState, session_state: SessionState
+) -> bool:
+    """Condition matching as implemented before dispatch tables were compiled."""
+    if condition.current_status and state.status != condition.current_status:
+        return False
+    if condition.hook_event:
+        if any(c in condition.hook_event for c in "^$|[]()"):
+            if not re.search(condition.hook_event, ctx.hook_event):
+                return False
+        elif condition.hook_event != ctx.hook_event:
+            return False
+    if condition.tool_name_pattern:
+        if not ctx.tool_name or not re.search(condition.tool_name_pattern, ctx.tool_name):
+            return False
+    if condition.excluded_tool_categories:
+        if (
+            ctx.tool_name
+            and get_tool_category(
+                ctx.tool_name, ctx.tool_input if isinstance(ctx.tool_input, dict) else None
+            )
+            in condition.excluded_tool_categories
+        ):
+            return False
+    if condition.tool_input_pattern:
+        if not re.search(condition.tool_input_pattern, str(ctx.tool_input)):
+            return False
+    if condition.subagent_type_pattern:
+        if not ctx.subagent_type or not re.search(
+            condition.subagent_type_pattern, ctx.subagent_type
+        ):
+            return False
+    if condition.min_ops_since_open is not None:
+        if state.ops_since_open < condition.min_ops_since_open:
+            return False
+    if condition.custom_check:
+        return _custom_check_stub()
+    return True
+
+
+def _custom_check_stub(*args: object) -> bool:
+    return False
+
+
+def run_legacy(ctxs: list[HookContext], session_state: SessionState) -> None:
+    for ctx in ctxs:
+        for gate in GateRegistry.get_all_gates():
+            state = gate._get_state(session_state)
+            for trigger in gate.config.triggers:
+                if legacy_evaluate(trigger.condition, ctx, state, session_state):
+                    break
+            for policy in gate.config.policies:
+                if legacy_evaluate(policy.condition, ctx, state, session_state):
+                    break
+
+
+def run_compiled(ctxs: list[HookContext], session_state: SessionState) -> None:
+    for ctx in ctxs:
+        for gate in GateRegistry.get_all_gates():
+            state = gate._get_state(session_state)
+            table = gate.event_table(ctx.hook_event)
+            for _, compiled in table.triggers:
+                if gate._evaluate_condition(compiled, ctx, state, session_state):
+                    break
+            for _, compiled in table.policies:
+                if gate._evaluate_condition(compiled, ctx, state, session_state):
+                    break
+
+
+def _time_per_event(fn, event: dict, iterations: int, session_state: SessionState) -> float:
+    # Fresh contexts: per-event caches (tool_input_text, tool_category) must not leak
+    ctxs = [HookContext(session_id="bench", **event) for _ in range(iterations)]
+    start = time.perf_counter()
+    fn(ctxs, session_state)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    import lib.gates.custom_conditions as custom_conditions
+
+    custom_conditions.check_custom_condition = _custom_check_stub
+    GateRegistry.initialize()
+    session_state = SessionState.model_construct(
+        session_id="bench", date="2026-01-01", started_at="2026-01-01", gates={}
+    )
+    gate_count = len(GateRegistry.get_all_gates())
+    total_conditions = sum(
+        len(g.config.triggers) + len(g.config.policies) for g in GateRegistry.get_all_gates()
+    )
+    print(f"{gate_count} gates, {total_conditions} conditions, {args.iterations} iterations\n")
+    print(f"{'event':<34}{'legacy µs':>11}{'compiled µs':>13}{'speedup':>9}")
+
+    totals = [0.0, 0.0]
+    for event in SAMPLE_EVENTS:
+        label = event["hook_event"] + (f" {event['tool_name']}" if "tool_name" in event else "")
+        legacy = _time_per_event(run_legacy, event, args.iterations, session_state)
+        compiled = _time_per_event(run_compiled, event, args.iterations, session_state)
+        totals[0] += legacy
+        totals[1] += compiled
+        print(f"{label[:33]:<34}{legacy:>11.2f}{compiled:>13.2f}{legacy / compiled:>8.1f}x")
+
+    n = len(SAMPLE_EVENTS)
+    print(
+        f"{'mean':<34}{totals[0] / n:>11.2f}{totals[1] / n:>13.2f}{totals[0] / totals[1]:>8.1f}x"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Benchmark: hydration latency with a cold vs warm context bundle.
+
+Runs build_hydration_instruction for a set of prompts in three modes:
+
+- cold:      no bundle on disk or in memory (first prompt, or a source changed)
+- warm-disk: bundle on disk only (a one-shot hook process)
+- warm:      bundle in memory (the router daemon)
+
+and also times the prompt-independent sections alone: the loaders called
+directly (the previous behaviour) vs load_context_bundle().
+
+Session state, the hydration gate file and the bundle cache go to a
+temporary directory. Run from (or pass --cwd) a project with .agent/ rules
+or workflows to include project sources.
+
+Usage:
+    python scripts/bench_hydration.py [--iterations N] [--cwd DIR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from lib.hook_timing import percentile
+from lib.hydration import context_bundle
+from lib.hydration.builder import build_hydration_instruction
+
+PROMPTS = [
+    "fix the failing test in the session reader",
+    "/do write a release note for the hooks changes",
+    "review the commit workflow and tell me what to change",
+    "yes",
+    "add a debug flag to the router daemon and document it",
+]
+
+
+def _isolate(work_dir: Path) -> None:
+    os.environ["AOPS_SESSION_STATE_DIR"] = str(work_dir / "state")
+    os.environ["AOPS_HYDRATION_CACHE"] = str(work_dir / "cache")
+    os.environ["AOPS_GATE_FILE_HYDRATION"] = str(work_dir / "hydration.md")
+    os.environ["TMPDIR"] = str(work_dir / "tmp")
+    os.environ.pop("AOPS_SESSION_STATE_PATH", None)
+    for sub in ("state", "cache", "tmp"):
+        (work_dir / sub).mkdir(parents=True, exist_ok=True)
+
+
+def _legacy_sections() -> None:
+    for loader in context_bundle.SECTIONS.values():
+        loader()
+
+
+def _drop_disk_bundle() -> None:
+    context_bundle.bundle_path().unlink(missing_ok=True)
+
+
+def _time(fn: Callable[[], object], prepare: Callable[[], None], iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        prepare()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+
+def _row(label: str, samples: list[float]) -> str:
+    return (
+        f"{label:<34}{percentile(samples, 50):>9.2f}{percentile(samples, 95):>9.2f}"
+        f"{samples[-1]:>9.2f}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold vs warm hydration latency")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--cwd", type=Path, help="Project directory to hydrate in")
+    args = parser.parse_args()
+
+    if args.cwd:
+        os.chdir(args.cwd.expanduser().resolve())
+
+    work_dir = Path(tempfile.mkdtemp(prefix="aops-bench-hydration-"))
+    _isolate(work_dir)
+
+    def cold() -> None:
+        context_bundle.clear_memo()
+        _drop_disk_bundle()
+
+    def disk_only() -> None:
+        context_bundle.clear_memo()
+
+    def nothing() -> None:
+        pass
+
+    prompt_index = 0
+
+    def hydrate() -> None:
+        nonlocal prompt_index
+        prompt = PROMPTS[prompt_index % len(PROMPTS)]
+        prompt_index += 1
+        build_hydration_instruction("bench-hydration-session", prompt)
+
+    try:
+        # Prime imports, template loading and the warm caches
+        hydrate()
+
+        print(f"cwd: {Path.cwd()}  iterations: {args.iterations}\n")
+        print(f"{'ms':<34}{'p50':>9}{'p95':>9}{'max':>9}")
+        print(_row("sections: loaders (previous)", _time(_legacy_sections, nothing, args.iterations)))
+        print(_row("sections: bundle cold", _time(context_bundle.load_context_bundle, cold, args.iterations)))
+        print(_row("sections: bundle warm-disk", _time(context_bundle.load_context_bundle, disk_only, args.iterations)))
+        print(_row("sections: bundle warm", _time(context_bundle.load_context_bundle, nothing, args.iterations)))
+        print()
+        print(_row("hydration: cold", _time(hydrate, cold, args.iterations)))
+        print(_row("hydration: warm-disk", _time(hydrate, disk_only, args.iterations)))
+        print(_row("hydration: warm", _time(hydrate, nothing, args.iterations)))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Benchmark: transcript parse time and peak RSS, slotted vs previous Entry.
+
+Parses one transcript (default: a synthetic Claude Code session of 200k
+lines with realistic per-line metadata and token usage) in three modes,
+each in a fresh subprocess so peak RSS is measured in isolation:
+
+- legacy:  the previous parser loop (text lines, json.loads) building the
+           previous @dataclass Entry, reproduced below as `LegacyEntry`
+- json:    SessionProcessor.parse_session_file with the stdlib json backend
+- current: SessionProcessor.parse_session_file (orjson when installed)
+
+Each mode is measured twice in the same process: right after parsing, and
+after reading every entry's timestamp, message and token usage the way a
+render does. The current Entry decodes those fields on first access, so
+only the second measurement compares like with like (legacy decodes
+everything up front).
+
+Reported RSS is the peak growth over the process baseline, i.e. what
+holding the parsed session costs.
+
+Usage:
+    python scripts/bench_transcript_parse.py [--lines N] [--transcript PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+MODES = ("legacy", "json", "current")
+
+
+@dataclass
+class LegacyEntry:
+    """The previous transcript_parser.Entry (eager dataclass)."""
+
+    type: str
+    uuid: str = ""
+    parent_uuid: str = ""
+    message: dict = field(default_factory=dict)
+    content: dict = field(default_factory=dict)
+    is_sidechain: bool = False
+    is_meta: bool = False
+    tool_use_result: dict = field(default_factory=dict)
+    hook_context: dict = field(default_factory=dict)
+    subagent_id: str | None = None
+    summary_text: str | None = None
+    timestamp: datetime | None = None
+    additional_context: str | None = None
+    hook_event_name: str | None = None
+    hook_exit_code: int | None = None
+    skills_matched: list[str] | None = None
+    files_loaded: list[str] | None = None
+    tool_name: str | None = None
+    tool_input: dict | None = None
+    agent_id: str | None = None
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    cache_creation_input_tokens: int | None = None
+    cache_read_input_tokens: int | None = None
+    model: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LegacyEntry:
+        message = data.get("message", {})
+        usage = message.get("usage", {})
+        entry = cls(
+            type=data.get("type", "unknown"),
+            uuid=data.get("uuid", ""),
+            parent_uuid=data.get("parentUuid", ""),
+            message=data.get("message", {}),
+            content=data.get("content", {}),
+            is_sidechain=data.get("isSidechain", False),
+            is_meta=data.get("isMeta", False),
+            tool_use_result=data.get("toolUseResult", {}),
+            hook_context=data.get("hook_context", {}),
+            subagent_id=data.get("subagentId"),
+            summary_text=data.get("summary"),
+            input_tokens=usage.get("input_tokens"),
+            output_tokens=usage.get("output_tokens"),
+            cache_creation_input_tokens=usage.get("cache_creation_input_tokens"),
+            cache_read_input_tokens=usage.get("cache_read_input_tokens"),
+            model=message.get("model"),
+        )
+        if "timestamp" in data:
+            try:
+                timestamp_str = data["timestamp"]
+                if timestamp_str.endswith("Z"):
+                    timestamp_str = timestamp_str[:-1] + "+00:00"
+                entry.timestamp = datetime.fromisoformat(timestamp_str).astimezone()
+            except (ValueError, TypeError):
+                pass
+        return entry
+
+
+def legacy_parse(path: Path) -> list[LegacyEntry]:
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(LegacyEntry.from_dict(json.loads(line)))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def write_transcript(path: Path, n_lines: int, seed: int = 1) -> None:
+    """Synthetic Claude Code transcript with per-line metadata like the real thing."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    session_id = "6f1c2d3e-0000-4000-8000-000000000001"
+    parent = None
+    with path.open("w") as f:
+        for i in range(n_lines):
+            uuid = f"00000000-0000-4000-8000-{i:012d}"
+            kind = rng.random()
+            base = {
+                "parentUuid": parent,
+                "isSidechain": False,
+                "userType": "external",
+                "cwd": "/home/user/src/academicOps",
+                "sessionId": session_id,
+                "version": "2.1.3",
+                "gitBranch": "main",
+                "uuid": uuid,
+                "timestamp": (start + timedelta(seconds=i)).isoformat().replace("+00:00", "Z"),
+            }
+            if kind < 0.45:
+                base["type"] = "assistant"
+                base["requestId"] = f"req_{i:016d}"
+                base["message"] = {
+                    "id": f"msg_{i:016d}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": "claude-sonnet-4-5",
+                    "content": [
+                        {"type": "text", "text": "Looking at this. " + "t" * rng.randint(20, 600)},
+                        {
+                            "type": "tool_use",
+                            "id": f"toolu_{i:012d}",
+                            "name": "Bash",
+                            "input": {"command": f"grep -rn foo lib/{i}.py"},
+                        },
+                    ],
+                    "stop_reason": "tool_use",
+                    "usage": {
+                        "input_tokens": rng.randint(1, 50),
+                        "cache_creation_input_tokens": rng.randint(0, 4000),
+                        "cache_read_input_tokens": rng.randint(0, 90000),
+                        "output_tokens": rng.randint(10, 900),
+                        "service_tier": "standard",
+                    },
+                }
+            elif kind < 0.9:
+                # Claude Code repeats the tool output in toolUseResult
+                output = "r" * rng.randint(20, 1200)
+                base["type"] = "user"
+                base["message"] = {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": f"toolu_{i - 1:012d}",
+                            "content": output,
+                            "is_error": False,
+                        }
+                    ],
+                }
+                base["toolUseResult"] = {
+                    "stdout": output,
+                    "stderr": "",
+                    "interrupted": False,
+                    "isImage": False,
+                }
+            else:
+                base["type"] = "user"
+                base["message"] = {"role": "user", "content": "please " + "p" * rng.randint(5, 300)}
+            parent = uuid
+            f.write(json.dumps(base) + "\n")
+
+
+def read_all(entries: list[Any]) -> None:
+    """Touch the fields a render reads on every entry."""
+    for entry in entries:
+        _ = entry.timestamp, entry.message, entry.input_tokens, entry.model
+
+
+def run_mode(mode: str, path: Path) -> dict[str, float]:
+    """Parse once in this process, then read every entry; report time and RSS growth."""
+    from lib import transcript_parser
+    from lib.transcript_parser import SessionProcessor
+
+    if mode == "json":
+        transcript_parser.orjson = None
+
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "legacy":
+        entries: list[Any] = legacy_parse(path)
+    else:
+        _, entries, _ = SessionProcessor().parse_session_file(
+            path, load_agents=False, load_hooks=False
+        )
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    read_all(entries)
+    read_elapsed = time.perf_counter() - start
+    read_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "entries": len(entries),
+        "seconds": elapsed,
+        # ru_maxrss is KiB on Linux
+        "rss_mb": (peak_rss - base_rss) / 1024,
+        "read_seconds": read_elapsed,
+        "read_rss_mb": (read_rss - base_rss) / 1024,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Transcript parse time and peak RSS")
+    parser.add_argument("--lines", type=int, default=200_000, help="Synthetic transcript size")
+    parser.add_argument("--transcript", type=Path, help="Parse this JSONL instead")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.transcript)))
+        return 0
+
+    from lib.transcript_parser import JSON_BACKEND
+
+    with tempfile.TemporaryDirectory(prefix="aops-bench-parse-") as tmp:
+        path = args.transcript
+        if path is None:
+            path = Path(tmp) / "bench-session.jsonl"
+            write_transcript(path, args.lines)
+        size_mb = path.stat().st_size / (1024 * 1024)
+
+        results = {}
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--transcript", str(path)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            results[mode] = json.loads(out.stdout)
+
+    print(f"transcript: {size_mb:.1f} MB, {results['legacy']['entries']} entries")
+    print(f"fast JSON backend: {JSON_BACKEND}\n")
+    legacy = results["legacy"]
+    for title, seconds, rss in (
+        ("after parse", "seconds", "rss_mb"),
+        ("after reading every entry's timestamp, message and usage", "read_seconds", "read_rss_mb"),
+    ):
+        print(title)
+        print(
+            f"{'mode':<10}{'time s':>10}{'RSS MB':>10}"
+            f"{'time vs legacy':>16}{'RSS vs legacy':>15}"
+        )
+        for mode in MODES:
+            r = results[mode]
+            print(
+                f"{mode:<10}{r[seconds]:>10.2f}{r[rss]:>10.1f}"
+                f"{r[seconds] / legacy[seconds]:>15.2f}x{r[rss] / legacy[rss]:>14.2f}x"
+            )
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
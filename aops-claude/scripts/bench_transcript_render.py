@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Benchmark: transcript rendering with the tool_use_id result index.
+
+Writes a synthetic Claude Code transcript (default 50k entries: prompts,
+assistant text, tool calls with results, some errors and Agent calls),
+parses it and times:
+
+- index:    building ToolResultIndex (one pass over the entries)
+- turns:    SessionProcessor.group_entries_into_turns
+- markdown: SessionProcessor.format_session_as_markdown (full variant)
+- legacy:   the previous per-tool-call linear scan, reproduced below as
+            `legacy_result_info`, timed on a sample of tool ids and
+            extrapolated to every tool call (a full run takes minutes)
+
+The sampled legacy lookups are also checked against the index.
+
+Usage:
+    python scripts/bench_transcript_render.py [--entries N] [--sample N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from lib.transcript_parser import (
+    Entry,
+    SessionProcessor,
+    ToolResultIndex,
+    _extract_exit_code_from_content,
+)
+
+TOOLS = ["Read", "Bash", "Edit", "Grep", "Glob", "Agent"]
+
+
+def write_transcript(path: Path, n_entries: int, seed: int = 1) -> int:
+    """Write a synthetic transcript of about n_entries lines. Returns the tool call count."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    written = 0
+    tool_calls = 0
+
+    def ts() -> str:
+        return (start + timedelta(seconds=written)).isoformat().replace("+00:00", "Z")
+
+    with path.open("w") as f:
+
+        def emit(entry: dict[str, Any]) -> None:
+            nonlocal written
+            entry.setdefault("timestamp", ts())
+            f.write(json.dumps(entry) + "\n")
+            written += 1
+
+        turn = 0
+        while written < n_entries:
+            turn += 1
+            emit(
+                {
+                    "type": "user",
+                    "message": {"role": "user", "content": f"task {turn}: " + "x" * rng.randint(0, 300)},
+                }
+            )
+            for _ in range(rng.randint(1, 8)):
+                tool_calls += 1
+                tool_id = f"toolu_{tool_calls:08d}"
+                name = rng.choice(TOOLS)
+                emit(
+                    {
+                        "type": "assistant",
+                        "message": {
+                            "role": "assistant",
+                            "content": [
+                                {"type": "text", "text": "Working on it. " + "y" * rng.randint(0, 400)},
+                                {
+                                    "type": "tool_use",
+                                    "id": tool_id,
+                                    "name": name,
+                                    "input": {"command": f"step {tool_calls}", "description": "sub"},
+                                },
+                            ],
+                        },
+                    }
+                )
+                is_error = rng.random() < 0.1
+                result: dict[str, Any] = {
+                    "type": "user",
+                    "message": {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "tool_result",
+                                "tool_use_id": tool_id,
+                                "content": ("Exit code 2\n" if is_error else "") + "ok " * rng.randint(1, 80),
+                                "is_error": is_error,
+                            }
+                        ],
+                    },
+                }
+                if name == "Agent":
+                    result["toolUseResult"] = {"agentId": f"a{tool_calls:06d}"}
+                emit(result)
+    return tool_calls
+
+
+def legacy_result_info(tool_id: str, all_entries: list[Entry]) -> dict[str, Any] | None:
+    """The previous SessionProcessor._get_tool_result_info: a scan per lookup."""
+    for entry in all_entries:
+        if entry.type != "user":
+            continue
+        message = entry.message or {}
+        content = message.get("content", [])
+        if not isinstance(content, list):
+            continue
+        for block in content:
+            if isinstance(block, dict):
+                if block.get("type") == "tool_result" and block.get("tool_use_id") == tool_id:
+                    is_error = block.get("is_error", False)
+                    result_content = block.get("content", "")
+                    if isinstance(result_content, list):
+                        texts = []
+                        for item in result_content:
+                            if isinstance(item, dict) and item.get("type") == "text":
+                                texts.append(item.get("text", ""))
+                        result_content = "\n".join(texts)
+                    exit_code = _extract_exit_code_from_content(
+                        result_content if isinstance(result_content, str) else "",
+                        is_error,
+                    )
+                    return {"content": result_content, "is_error": is_error, "exit_code": exit_code}
+    return None
+
+
+def _timed(fn: Any) -> tuple[Any, float]:
+    start = time.perf_counter()
+    value = fn()
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Transcript rendering with the tool result index")
+    parser.add_argument("--entries", type=int, default=50_000, help="Synthetic transcript size")
+    parser.add_argument("--sample", type=int, default=200, help="Tool ids timed with the legacy scan")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="aops-bench-render-") as tmp:
+        path = Path(tmp) / "bench-session.jsonl"
+        tool_calls = write_transcript(path, args.entries)
+        processor = SessionProcessor()
+        (session, entries, agents), parse_ms = _timed(
+            lambda: processor.parse_session_file(path, load_agents=False, load_hooks=False)
+        )
+
+    index, index_ms = _timed(lambda: ToolResultIndex(entries))
+    _, turns_ms = _timed(lambda: processor.group_entries_into_turns(entries, agents))
+    markdown, markdown_ms = _timed(
+        lambda: processor.format_session_as_markdown(session, entries, agents)
+    )
+
+    rng = random.Random(2)
+    sample = [f"toolu_{rng.randint(1, tool_calls):08d}" for _ in range(args.sample)]
+    mismatches = 0
+    start = time.perf_counter()
+    for tool_id in sample:
+        if legacy_result_info(tool_id, entries) != index.info(tool_id):
+            mismatches += 1
+    legacy_per_call = (time.perf_counter() - start) * 1000 / max(len(sample), 1)
+
+    print(f"entries: {len(entries)}  tool calls: {tool_calls}  markdown: {len(markdown)} chars\n")
+    print(f"{'ms':<40}{'time':>12}")
+    print(f"{'parse':<40}{parse_ms:>12.1f}")
+    print(f"{'index build':<40}{index_ms:>12.1f}")
+    print(f"{'group_entries_into_turns':<40}{turns_ms:>12.1f}")
+    print(f"{'format_session_as_markdown':<40}{markdown_ms:>12.1f}")
+    print(f"{'legacy lookups (extrapolated)':<40}{legacy_per_call * tool_calls:>12.1f}")
+    print(f"\nlegacy vs index mismatches: {mismatches}/{len(sample)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Export markdown transcripts for many sessions in parallel.
+
+Renders the full and abridged transcripts of every session find_sessions()
+returns across a process pool (lib/transcript_export.py). Sessions whose
+transcripts are newer than every input file (session file, agent files,
+hook log) are skipped, so re-running only renders what changed.
+
+Usage:
+    python scripts/export_transcripts.py                   # all sessions, all cores
+    python scripts/export_transcripts.py --days 365        # backfill the last year
+    python scripts/export_transcripts.py --project aops --workers 4
+    python scripts/export_transcripts.py --force           # re-render everything
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from lib.paths import get_transcripts_dir
+from lib.session_reader import find_sessions
+from lib.transcript_export import EXPORTED, FAILED, export_sessions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk markdown transcript export")
+    parser.add_argument("--project", help="Only sessions of this project (partial match)")
+    parser.add_argument("--days", type=float, help="Only sessions modified in the last N days")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render up-to-date sessions")
+    parser.add_argument("--no-gemini", action="store_true", help="Skip Gemini sessions")
+    parser.add_argument(
+        "--no-antigravity", action="store_true", help="Skip Antigravity brain sessions"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print every exported session")
+    args = parser.parse_args()
+
+    since = datetime.now(UTC) - timedelta(days=args.days) if args.days is not None else None
+    start = time.perf_counter()
+    sessions = find_sessions(
+        project=args.project,
+        since=since,
+        include_gemini=not args.no_gemini,
+        include_antigravity=not args.no_antigravity,
+    )
+    print(f"{len(sessions)} session(s) -> {get_transcripts_dir()}")
+
+    counts: dict[str, int] = {}
+    failures = []
+    for result in export_sessions(sessions, workers=args.workers, force=args.force):
+        counts[result.status] = counts.get(result.status, 0) + 1
+        if result.status == FAILED:
+            failures.append(result)
+        elif result.status == EXPORTED and args.verbose:
+            print(f"  {result.seconds * 1000:>8.0f} ms  {result.outputs['full'].name}")
+    elapsed = time.perf_counter() - start
+
+    summary = ", ".join(f"{n} {status.replace('_', ' ')}" for status, n in sorted(counts.items()))
+    rate = counts.get(EXPORTED, 0) / elapsed if elapsed else 0.0
+    print(f"{summary or 'nothing to do'} in {elapsed:.1f} s ({rate:.1f} exported/s)")
+    for result in failures:
+        print(f"FAILED {result.session.path}: {result.error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
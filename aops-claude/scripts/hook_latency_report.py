@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Hook latency report from per-session hook logs.
+
+Aggregates the `timings` object the router writes to each *-hooks.jsonl
+entry (see lib/hook_timing.py) across sessions and prints p50/p95/p99:
+
+- per event type (total hook time, with the hook timeout from hooks.json)
+- per gate method, per event type (gate.<gate>.<method> spans)
+- the slowest other spans (state I/O, handlers, conditions, actions, templates)
+
+Times are milliseconds measured inside the router; process start-up and the
+client round trip are not included.
+
+Usage:
+    python scripts/hook_latency_report.py                  # all Claude + Gemini hook logs
+    python scripts/hook_latency_report.py --days 7         # logs modified in the last week
+    python scripts/hook_latency_report.py --event PreToolUse path/to/logs/
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from pathlib import Path
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from lib.hook_timing import percentile
+
+
+def default_log_files() -> list[Path]:
+    """Hook logs in the standard Claude and Gemini locations."""
+    home = Path.home()
+    files = list((home / ".claude" / "projects").glob("*/*-hooks.jsonl"))
+    files += list((home / ".gemini" / "tmp").glob("*/logs/*-hooks.jsonl"))
+    return files
+
+
+def expand_paths(paths: list[Path]) -> list[Path]:
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(path.rglob("*-hooks.jsonl"))
+        elif path.exists():
+            files.append(path)
+    return files
+
+
+def load_hook_timeouts() -> dict[str, float]:
+    """Hook timeout (ms) per event from hooks.json, if readable."""
+    try:
+        config = json.loads((AOPS_CORE_DIR / "hooks" / "hooks.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    timeouts: dict[str, float] = {}
+    for event, groups in config.get("hooks", {}).items():
+        for group in groups:
+            for hook in group.get("hooks", []):
+                if "timeout" in hook:
+                    timeouts[event] = max(timeouts.get(event, 0), hook["timeout"])
+    return timeouts
+
+
+def iter_timed_entries(files: list[Path]) -> Iterator[tuple[str, dict]]:
+    """Yield (hook_event, timings) for every log entry that has timings."""
+    for path in files:
+        try:
+            with path.open() as f:
+                for line in f:
+                    if '"timings"' not in line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    timings = entry.get("timings")
+                    if isinstance(timings, dict):
+                        yield entry.get("hook_event") or "unknown", timings
+        except OSError as e:
+            print(f"WARNING: cannot read {path}: {e}", file=sys.stderr)
+
+
+def summarize(values: list[float]) -> tuple[int, float, float, float, float]:
+    values = sorted(values)
+    return (
+        len(values),
+        percentile(values, 50),
+        percentile(values, 95),
+        percentile(values, 99),
+        values[-1] if values else 0.0,
+    )
+
+
+def _row(label: str, values: list[float], extra: str = "") -> str:
+    n, p50, p95, p99, worst = summarize(values)
+    return f"{label:<48}{n:>7}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}{worst:>10.1f}{extra}"
+
+
+def _header(label: str, extra: str = "") -> str:
+    return f"{label:<48}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>10}{extra}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Hook latency percentiles from hook logs")
+    parser.add_argument("paths", nargs="*", type=Path, help="Hook log files or directories")
+    parser.add_argument("--days", type=float, help="Only logs modified in the last N days")
+    parser.add_argument("--event", help="Only this hook event (e.g. PreToolUse)")
+    parser.add_argument("--top", type=int, default=15, help="Number of other spans to show")
+    args = parser.parse_args()
+
+    files = expand_paths(args.paths) if args.paths else default_log_files()
+    if args.days is not None:
+        cutoff = time.time() - args.days * 86400
+        files = [f for f in files if f.stat().st_mtime >= cutoff]
+
+    totals: dict[str, list[float]] = defaultdict(list)
+    gates: dict[tuple[str, str], list[float]] = defaultdict(list)
+    others: dict[str, list[float]] = defaultdict(list)
+
+    for event, timings in iter_timed_entries(files):
+        if args.event and event != args.event:
+            continue
+        if "total_ms" in timings:
+            totals[event].append(float(timings["total_ms"]))
+        for name, ms in (timings.get("spans") or {}).items():
+            if name.startswith("gate."):
+                gates[(event, name)].append(float(ms))
+            else:
+                others[name].append(float(ms))
+
+    if not totals:
+        print(f"No timed hook events found in {len(files)} log file(s).")
+        return 0
+
+    print(f"{sum(len(v) for v in totals.values())} timed events from {len(files)} log file(s)\n")
+
+    timeouts = load_hook_timeouts()
+    print(_header("Event (total ms)", f"{'p99/timeout':>13}"))
+    for event in sorted(totals):
+        timeout = timeouts.get(event)
+        share = (
+            f"{percentile(sorted(totals[event]), 99) / timeout:>12.1%}" if timeout else f"{'-':>12}"
+        )
+        print(_row(event, totals[event], f" {share}"))
+
+    print()
+    print(_header("Gate method by event (ms)"))
+    for event, name in sorted(gates, key=lambda k: (k[0], -percentile(sorted(gates[k]), 95))):
+        print(_row(f"{event} {name[len('gate.') :]}", gates[(event, name)]))
+
+    if others:
+        print()
+        print(_header("Other spans, slowest p95 first (ms)"))
+        ranked = sorted(others, key=lambda k: percentile(sorted(others[k]), 95), reverse=True)
+        for name in ranked[: args.top]:
+            print(_row(name, others[name]))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
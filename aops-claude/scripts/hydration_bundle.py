@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Prebuild and inspect the hydration context bundle.
+
+The bundle (lib/hydration/context_bundle.py) caches the prompt-independent
+hydration sections for one working directory. Hooks rebuild it on demand;
+this CLI builds it ahead of time (e.g. after editing .agent/rules/) and
+shows what it contains.
+
+Usage:
+    python scripts/hydration_bundle.py build             # (re)build for the current directory
+    python scripts/hydration_bundle.py show              # status and section sizes
+    python scripts/hydration_bundle.py show glossary     # print one section
+    python scripts/hydration_bundle.py sources           # files the fingerprint covers
+    python scripts/hydration_bundle.py --cwd ~/src/proj build
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from lib.hydration.context_bundle import (
+    SECTIONS,
+    build_context_bundle,
+    inspect_bundle,
+    source_paths,
+)
+
+
+def _format_time(ts: float | None) -> str:
+    if not ts:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+
+def _cmd_build() -> int:
+    start = time.perf_counter()
+    bundle = build_context_bundle()
+    elapsed = (time.perf_counter() - start) * 1000
+    info = inspect_bundle()
+    size = sum(len(s or "") for s in bundle.sections.values())
+    print(f"Built {info['path']} in {elapsed:.1f} ms ({size} chars, fingerprint {bundle.fingerprint})")
+    return 0
+
+
+def _cmd_show(section: str | None) -> int:
+    info = inspect_bundle()
+    if section:
+        if section not in SECTIONS:
+            print(f"Unknown section {section!r}; one of: {', '.join(SECTIONS)}", file=sys.stderr)
+            return 1
+        if info["status"] == "missing":
+            print("No bundle; run `build` first.", file=sys.stderr)
+            return 1
+        print(info["sections"].get(section) or "")
+        return 0
+
+    print(f"Bundle: {info['path']}")
+    print(f"cwd:    {info['cwd']}")
+    print(f"Status: {info['status']} (current fingerprint {info['fingerprint']})")
+    print(f"Built:  {_format_time(info['built_at'])}")
+    if info["sections"]:
+        print()
+        print(f"{'section':<24}{'chars':>10}")
+        for name in SECTIONS:
+            value = info["sections"].get(name)
+            print(f"{name:<24}{'-' if value is None else len(value):>10}")
+    return 0
+
+
+def _cmd_sources() -> int:
+    for path in source_paths():
+        try:
+            st = path.stat()
+        except OSError:
+            print(f"  (missing)  {path}")
+            continue
+        print(f"  {_format_time(st.st_mtime)}  {st.st_size:>8}  {path}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Hydration context bundle")
+    parser.add_argument("--cwd", type=Path, help="Project directory (default: current)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Rebuild the bundle for the project directory")
+    show_parser = sub.add_parser("show", help="Show bundle status, or print one section")
+    show_parser.add_argument("section", nargs="?", help="Section name to print")
+    sub.add_parser("sources", help="List files covered by the fingerprint")
+    args = parser.parse_args()
+
+    if args.cwd:
+        os.chdir(args.cwd.expanduser().resolve())
+
+    if args.command == "build":
+        return _cmd_build()
+    if args.command == "show":
+        return _cmd_show(args.section)
+    if args.command == "sources":
+        return _cmd_sources()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
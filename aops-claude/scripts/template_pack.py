@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Check gate templates and manage the precompiled template pack.
+
+TemplateRegistry (lib/template_registry.py) compiles each gate template once
+per process: frontmatter stripped, placeholders checked against the
+TemplateSpec. The router daemon loads every template at warm-up from a
+single precompiled pack under ~/.polecat/templates/ ($AOPS_TEMPLATE_CACHE),
+rewriting it when a template file changed. This CLI validates the templates
+and builds or inspects the pack ahead of time.
+
+Usage:
+    python scripts/template_pack.py check      # compile and validate every template
+    python scripts/template_pack.py build      # (re)write the pack
+    python scripts/template_pack.py show       # pack location and per-template status
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from lib.template_registry import TemplateRegistry
+
+
+def _cmd_check(registry: TemplateRegistry) -> int:
+    failures = 0
+    for name in registry.list_templates():
+        try:
+            compiled = registry.get_compiled(name)
+        except (FileNotFoundError, ValueError) as e:
+            failures += 1
+            print(f"  FAIL  {name}: {e}")
+            continue
+        unused = set(compiled.spec.required_vars) - compiled.placeholders
+        note = f"  (required but unused: {', '.join(sorted(unused))})" if unused else ""
+        print(f"  ok    {name}{note}")
+    print(f"\n{len(registry.list_templates()) - failures} ok, {failures} failed")
+    return 1 if failures else 0
+
+
+def _cmd_build(registry: TemplateRegistry) -> int:
+    start = time.perf_counter()
+    try:
+        path = registry.write_pack()
+    except (FileNotFoundError, ValueError, OSError) as e:
+        print(f"Pack not written: {e}", file=sys.stderr)
+        return 1
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Wrote {path} ({len(registry.list_templates())} templates, {elapsed:.1f} ms)")
+    return 0
+
+
+def _cmd_show(registry: TemplateRegistry) -> int:
+    path = registry.pack_path()
+    print(f"Pack: {path}")
+    if not path.exists():
+        print("Status: missing (run `build`, or start the router daemon)")
+        return 0
+    compiled = registry.precompile()
+    print()
+    print(f"{'template':<28}{'source':>8}  path")
+    for name, template in compiled.items():
+        print(f"{name:<28}{template.source:>8}  {template.path}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Gate template pack")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("check", help="Compile and validate every template")
+    sub.add_parser("build", help="Write the precompiled pack")
+    sub.add_parser("show", help="Show which templates the pack covers")
+    args = parser.parse_args()
+
+    registry = TemplateRegistry.instance()
+    if args.command == "check":
+        return _cmd_check(registry)
+    if args.command == "build":
+        return _cmd_build(registry)
+    if args.command == "show":
+        return _cmd_show(registry)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
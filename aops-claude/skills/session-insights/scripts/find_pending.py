@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
 """Find sessions pending insights generation.
 
-Scans transcript directory and returns sessions that don't have a corresponding insights file.
+Claims pending sessions from the insights work queue (lib/insights_queue.py)
+and prints them. Claimed sessions are leased to this worker, so concurrent
+batch runs never get the same session; merge_insights.py marks them done
+and a lease that is never completed expires back to pending.
+
+The queue is fed when transcripts are written. It is seeded from the
+transcripts directory the first time it is empty; --rescan re-lists the
+directory to pick up transcripts written by other tools.
 
 Usage:
-    find_pending.py [--limit N]
+    find_pending.py [--limit N] [--lease SECONDS] [--worker NAME] [--dry-run] [--rescan]
 
 Output:
     pipe-separated lines: TRANSCRIPT_PATH|SESSION_ID|DATE
@@ -14,6 +21,7 @@ Note:
 """
 
 import argparse
+import sqlite3
 import sys
 from pathlib import Path
 
@@ -22,73 +30,55 @@ SCRIPT_DIR = Path(__file__).parent.resolve()
 AOPS_CORE_ROOT = SCRIPT_DIR.parent.parent.parent
 sys.path.insert(0, str(AOPS_CORE_ROOT))
 
-from lib.paths import get_summaries_dir, get_transcripts_dir
+from lib.insights_queue import DEFAULT_LEASE_SECONDS, InsightsQueue, default_worker_id
+from lib.paths import get_transcripts_dir
 
 
 def main():
     parser = argparse.ArgumentParser(description="Find pending sessions")
     parser.add_argument("--limit", type=int, default=5, help="Max number of sessions to return")
+    parser.add_argument(
+        "--lease",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help="Seconds before an unfinished claim returns to the queue",
+    )
+    parser.add_argument(
+        "--worker", default=default_worker_id(), help="Worker name ($AOPS_INSIGHTS_WORKER)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="List without claiming")
+    parser.add_argument(
+        "--rescan", action="store_true", help="Enqueue transcripts from the transcripts directory"
+    )
     args = parser.parse_args()
 
     try:
         transcripts_dir = get_transcripts_dir()
-        insights_dir = get_summaries_dir()
     except RuntimeError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    if not transcripts_dir.exists():
-        print(
-            f"Warning: Transcript directory not found: {transcripts_dir}",
-            file=sys.stderr,
-        )
-        return
-
-    count = 0
-
-    # Iterate over all .md files in transcripts directory
-    # Sort by mtime descending (most recent first) to prioritize recent sessions?
-    # Or scanning all? The bash loop had a limit.
-
-    transcripts = sorted(
-        transcripts_dir.glob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True
-    )
+    try:
+        queue = InsightsQueue()
+        if args.rescan or not queue.stats():
+            if not transcripts_dir.exists():
+                print(
+                    f"Warning: Transcript directory not found: {transcripts_dir}",
+                    file=sys.stderr,
+                )
+            queue.backfill(transcripts_dir)
+
+        if args.dry_run:
+            sessions = queue.pending(args.limit)
+        else:
+            sessions = queue.claim(args.worker, limit=args.limit, lease_seconds=args.lease)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error: insights queue unavailable: {e}", file=sys.stderr)
+        sys.exit(1)
 
-    for transcript in transcripts:
-        if count >= args.limit:
-            break
-
-        # Format: YYYYMMDD-{project}-{session_id}-{suffix}.md
-        # or v3.7.0+: YYYYMMDD-HH-{project}-{session_id}-{suffix}.md
-        parts = transcript.stem.split("-")
-
-        # We need at least date and session_id
-        if len(parts) >= 3:
-            # Check date format roughly
-            if len(parts[0]) == 8 and parts[0].isdigit():
-                date_str = parts[0]
-                date_formatted = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-
-                # Check for hour component (v3.7.0+)
-                shift = 0
-                if len(parts[1]) == 2 and parts[1].isdigit():
-                    shift = 1
-
-                # Ensure we have enough parts with the shift
-                if len(parts) >= 3 + shift:
-                    # Standard format: YYYYMMDD-[HH]-project-session_id
-                    session_id = parts[2 + shift]
-
-                    # Check if insights exist (v3.4.0: YYYYMMDD format)
-                    insights_file = insights_dir / f"{date_str}-{session_id}.json"
-
-                    if not insights_file.exists():
-                        print(f"{transcript}|{session_id}|{date_formatted}")
-                        count += 1
-
-    if count == 0:
-        # No output means no pending sessions found
-        pass
+    # No output means no pending sessions found
+    for session in sessions:
+        print(f"{session.transcript}|{session.session_id}|{session.date}")
 
 
 if __name__ == "__main__":
@@ -4,14 +4,16 @@
 Reads new insights JSON from stdin and:
 1. Merges with existing file if present (appending lists, updating scalars)
 2. Writes atomically to target path
-3. Handles errors by saving debug output
+3. Marks the session done in the insights queue
+4. Handles errors by saving debug output
 
 Usage:
-    cat new_insights.json | merge_insights.py <target_path>
+    cat new_insights.json | merge_insights.py <target_path> [--session-id ID]
 """
 
 import argparse
 import json
+import sqlite3
 import sys
 from pathlib import Path
 
@@ -19,11 +21,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from lib.insights_generator import merge_insights, write_insights_file
+from lib.insights_queue import InsightsQueue
+from lib.session_paths import get_session_short_hash
 
 
 def main():
     parser = argparse.ArgumentParser(description="Merge and write session insights")
     parser.add_argument("path", help="Target insights JSON file path")
+    parser.add_argument(
+        "--session-id", help="Session to mark done in the queue (default: from the insights)"
+    )
     args = parser.parse_args()
 
     target_path = Path(args.path)
@@ -65,6 +72,15 @@ def main():
         write_insights_file(target_path, final_insights)
         print(f"✓ Insights written to {target_path}")
 
+        session_id = args.session_id
+        if not session_id and isinstance(final_insights, dict):
+            session_id = final_insights.get("session_id")
+        if session_id:
+            try:
+                InsightsQueue().complete(get_session_short_hash(str(session_id)))
+            except (sqlite3.Error, OSError) as e:
+                print(f"WARNING: Could not update insights queue: {e}", file=sys.stderr)
+
     except Exception as e:
         print(f"❌ Error merging/writing insights: {e}", file=sys.stderr)
 
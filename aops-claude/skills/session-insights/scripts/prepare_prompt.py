@@ -2,6 +2,8 @@
 """Prepare session insights prompt for Gemini.
 
 Extracts metadata from transcript filename and substitutes into shared prompt template.
+Leases the session in the insights queue first, so another worker doesn't
+analyze it at the same time.
 
 Usage:
     prepare_prompt.py <transcript_path>
@@ -13,6 +15,7 @@ Example:
 
 import argparse
 import re
+import sqlite3
 import sys
 from pathlib import Path
 
@@ -24,6 +27,7 @@ from lib.insights_generator import (
     load_prompt_template,
     substitute_prompt_variables,
 )
+from lib.insights_queue import DEFAULT_LEASE_SECONDS, InsightsQueue, default_worker_id
 
 
 def extract_metadata_from_filename(filename: str) -> dict[str, str]:
@@ -108,6 +112,15 @@ def main():
     )
     parser.add_argument("transcript", help="Path to transcript file")
     parser.add_argument("--debug", action="store_true", help="Print metadata extraction details")
+    parser.add_argument(
+        "--worker", default=default_worker_id(), help="Worker name ($AOPS_INSIGHTS_WORKER)"
+    )
+    parser.add_argument(
+        "--lease", type=float, default=DEFAULT_LEASE_SECONDS, help="Lease length in seconds"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Proceed even if another worker holds the session"
+    )
     args = parser.parse_args()
 
     transcript_path = Path(args.transcript)
@@ -131,6 +144,23 @@ def main():
         print(f"  project: {metadata['project']}", file=sys.stderr)
         print("", file=sys.stderr)
 
+    # Lease the session (or extend this worker's lease from find_pending.py)
+    try:
+        queue = InsightsQueue()
+        acquired = queue.acquire(metadata["session_id"], args.worker, args.lease)
+    except (sqlite3.Error, OSError) as e:
+        print(f"WARNING: Insights queue unavailable: {e}", file=sys.stderr)
+        acquired = True
+    if not acquired and not args.force:
+        item = queue.get(metadata["session_id"])
+        owner = item.lease_owner if item else "another worker"
+        print(
+            f"ERROR: Session {metadata['session_id']} is being processed by {owner}"
+            " (use --force to proceed anyway)",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
     # Load shared template
     try:
         template = load_prompt_template()
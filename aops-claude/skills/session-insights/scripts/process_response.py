@@ -4,7 +4,8 @@
 1. Extracts JSON from response (handling markdown fences)
 2. Validates against schema
 3. Prints valid JSON to stdout
-4. Saves raw response to debug file on failure
+4. Saves raw response to debug file on failure and records the failed
+   attempt in the insights queue (retried until max_attempts)
 
 Usage:
     cat raw_response.txt | process_response.py <date> <session_id>
@@ -12,6 +13,7 @@ Usage:
 
 import argparse
 import json
+import sqlite3
 import sys
 from pathlib import Path
 
@@ -23,6 +25,7 @@ from lib.insights_generator import (
     get_insights_file_path,
     validate_insights_schema,
 )
+from lib.insights_queue import InsightsQueue, default_worker_id
 
 
 def main():
@@ -30,6 +33,9 @@ def main():
     parser.add_argument("date", help="Session date (YYYY-MM-DD)")
     parser.add_argument("session_id", help="Session ID (8-char hash)")
     parser.add_argument("--project", default="", help="Project name for filename")
+    parser.add_argument(
+        "--worker", default=default_worker_id(), help="Worker name ($AOPS_INSIGHTS_WORKER)"
+    )
     args = parser.parse_args()
 
     # Read raw response from stdin
@@ -70,6 +76,12 @@ def main():
         except Exception as save_err:
             print(f"Failed to save debug file: {save_err}", file=sys.stderr)
 
+        try:
+            if InsightsQueue().fail(args.session_id, str(e), owner=args.worker):
+                print("Session returned to the insights queue for retry", file=sys.stderr)
+        except (sqlite3.Error, OSError) as queue_err:
+            print(f"WARNING: Insights queue unavailable: {queue_err}", file=sys.stderr)
+
         sys.exit(1)
 
 
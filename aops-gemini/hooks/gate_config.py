@@ -353,6 +353,17 @@ CUSTODIET_TOOL_CALL_THRESHOLD = int(os.environ.get("CUSTODIET_TOOL_CALL_THRESHOL
 HYDRATION_GATE_MODE = os.environ["HYDRATION_GATE_MODE"]
 COMMIT_GATE_MODE = os.environ["COMMIT_GATE_MODE"]
 
+# Variables baked into GATE_CONFIGS at import time. Long-lived processes
+# (hooks/router_server.py) reload gate config when any of these change.
+GATE_MODE_ENV_VARS = (
+    "HANDOVER_GATE_MODE",
+    "QA_GATE_MODE",
+    "CUSTODIET_GATE_MODE",
+    "CUSTODIET_TOOL_CALL_THRESHOLD",
+    "HYDRATION_GATE_MODE",
+    "COMMIT_GATE_MODE",
+)
+
 # =============================================================================
 # PKB PREFIX NORMALIZATION
 # =============================================================================
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Persistent Hook Router daemon.
+
+Every hook event used to start a fresh interpreter via `uv run`, re-import
+pydantic/psutil/lib.gates and rebuild GateRegistry and TemplateRegistry.
+This daemon keeps one HookRouter (and the registries it uses) in memory
+and serves events over a Unix domain socket.
+
+The socket and its lock live in a private per-user runtime directory
+(lib/session_paths.get_router_runtime_dir). Clients (hooks/router_client.py)
+send one JSON request per connection:
+
+    {"argv": [...], "stdin": "...", "env": {...}, "cwd": "...", "ppid": 123}
+
+and receive:
+
+    {"stdout": "...", "stderr": "...", "exit_code": 0}
+
+Each connection is handled in a child forked from the warmed-up daemon, so
+a slow event (hydration, PostToolUse) in one session never delays another
+session's PreToolUse or Stop. The child runs with the environment the
+client forwards, its working directory and parent PID so path resolution
+(AOPS_SESSION_STATE_DIR, CLAUDE_PROJECT_DIR, the PID session map) behaves
+exactly as it would in a per-event process, and whatever the event caches
+in memory dies with the child.
+
+The daemon exits after AOPS_ROUTER_IDLE_TIMEOUT seconds without traffic
+(default 1800), or after serving a request if the plugin has been rebuilt
+in place (pyproject.toml changed).
+
+Usage:
+    python hooks/router_server.py [--socket PATH] [--idle-timeout SECONDS]
+"""
+
+import fcntl
+import importlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any
+
+# --- Path Setup ---
+HOOK_DIR = Path(__file__).parent  # aops-core/hooks
+AOPS_CORE_DIR = HOOK_DIR.parent  # aops-core
+
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from lib.file_index import get_framework_keyword_matcher
+from lib.gates.registry import GateRegistry
+from lib.hook_utils import load_framework_content
+from lib.hydration.context_loaders import get_plugin_root
+from lib.session_paths import get_router_socket_path
+from lib.template_registry import TemplateRegistry
+
+from hooks import gate_config
+from hooks.router import HookRouter, get_session_data, parse_args, parse_raw_input, run_router
+
+DEFAULT_IDLE_TIMEOUT = 1800.0
+REQUEST_TIMEOUT = 10.0
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+
+def _recv_all(conn: socket.socket) -> bytes:
+    """Read until the client shuts down its write side."""
+    chunks = []
+    total = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > MAX_REQUEST_BYTES:
+            raise ValueError(f"request exceeds {MAX_REQUEST_BYTES} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class RouterServer:
+    """Serve hook events from a single long-lived HookRouter."""
+
+    def __init__(self, socket_path: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.router = HookRouter()
+        self._lock_file = None
+        self._build_stamp = self._read_build_stamp()
+        self._gate_env = self._read_gate_env()
+
+    @staticmethod
+    def _read_build_stamp() -> float | None:
+        try:
+            return (AOPS_CORE_DIR / "pyproject.toml").stat().st_mtime
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_gate_env() -> tuple[str | None, ...]:
+        return tuple(os.environ.get(var) for var in gate_config.GATE_MODE_ENV_VARS)
+
+    def _sync_gate_config(self) -> None:
+        """Rebuild gates if this client's gate-mode env differs from the loaded config.
+
+        Gate modes are read once at import (hooks/gate_config.py) and baked
+        into GATE_CONFIGS, so a client with different modes needs a reload.
+        """
+        gate_env = self._read_gate_env()
+        if gate_env == self._gate_env:
+            return
+        from lib.gates import definitions
+
+        importlib.reload(gate_config)
+        importlib.reload(definitions)
+        GateRegistry.reset()
+        GateRegistry.initialize()
+        self._gate_env = gate_env
+
+    def _acquire_lock(self) -> bool:
+        """Take the per-socket lock; False if another daemon already owns it."""
+        lock_path = self.socket_path.with_suffix(".lock")
+        fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+        self._lock_file = os.fdopen(fd, "w")
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+        return True
+
+    def _warm_up(self) -> None:
+        """Load registries up front so the first request (and every forked child) is fast."""
+        GateRegistry.initialize()
+        get_framework_keyword_matcher()
+        try:
+            registry = TemplateRegistry.instance()
+            compiled = registry.precompile()
+            # Refresh the pack when any template had to be read from disk
+            if any(t.source != "pack" for t in compiled.values()):
+                registry.write_pack()
+        except Exception as e:
+            print(f"WARNING: TemplateRegistry warm-up failed: {e}", file=sys.stderr)
+
+    def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Run one hook event with the client's environment applied."""
+        saved_env = dict(os.environ)
+        saved_cwd = os.getcwd()
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        exit_code = 0
+
+        try:
+            os.environ.clear()
+            os.environ.update(request.get("env") or {})
+            if request.get("ppid"):
+                os.environ["AOPS_HOOK_PPID"] = str(request["ppid"])
+            cwd = request.get("cwd")
+            if cwd:
+                try:
+                    os.chdir(cwd)
+                except OSError:
+                    pass
+
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    # These caches assume one process per event; never let one
+                    # client's values (cwd, file contents) leak into the next
+                    get_plugin_root.cache_clear()
+                    load_framework_content.cache_clear()
+                    self._sync_gate_config()
+                    args = parse_args(request.get("argv") or [])
+                    raw_input = parse_raw_input(request.get("stdin") or "")
+                    # The PID session map belongs to the client, re-read it per event
+                    self.router.session_data = get_session_data()
+                    print(run_router(self.router, args, raw_input))
+                except SystemExit as e:
+                    exit_code = e.code if isinstance(e.code, int) else 1
+                except Exception as e:
+                    print(f"CRITICAL: router daemon failed to handle event: {e}", file=sys.stderr)
+                    traceback.print_exc(file=sys.stderr)
+                    exit_code = 1
+        finally:
+            os.environ.clear()
+            os.environ.update(saved_env)
+            try:
+                os.chdir(saved_cwd)
+            except OSError:
+                pass
+
+        return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+    def _serve_connection(self, conn: socket.socket) -> None:
+        conn.settimeout(REQUEST_TIMEOUT)
+        try:
+            request = json.loads(_recv_all(conn).decode("utf-8"))
+            response = self.handle_request(request)
+        except Exception as e:
+            response = {
+                "stdout": "",
+                "stderr": f"router daemon: bad request: {e}\n",
+                "exit_code": 1,
+            }
+        conn.settimeout(None)
+        conn.sendall(json.dumps(response).encode("utf-8"))
+
+    def _serve_forked(self, conn: socket.socket) -> None:
+        """Handle conn in a forked child; the parent returns to accept() at once."""
+        try:
+            pid = os.fork()
+        except OSError as e:
+            print(f"WARNING: router daemon fork failed, serving inline: {e}", file=sys.stderr)
+            self._serve_connection(conn)
+            return
+        if pid:
+            return
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if self._lock_file is not None:
+                self._lock_file.close()  # The parent's descriptor keeps the lock
+            self._serve_connection(conn)
+        except BaseException as e:
+            print(f"WARNING: router daemon connection error: {e}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            # Skip the parent's cleanup (socket unlink, lock) inherited by the child
+            os._exit(exit_code)
+
+    @staticmethod
+    def _reap_children() -> None:
+        """Collect exited connection children without blocking."""
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+    def serve_forever(self) -> int:
+        if not self._acquire_lock():
+            return 0  # Another daemon owns this socket
+
+        self.socket_path.unlink(missing_ok=True)
+        self._warm_up()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)  # Socket is private to this user
+        try:
+            server.bind(str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        server.settimeout(self.idle_timeout)
+
+        try:
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except TimeoutError:
+                    break  # Idle: let the next client start a fresh daemon
+                with conn:
+                    try:
+                        self._serve_forked(conn)
+                    except OSError as e:
+                        print(f"WARNING: router daemon connection error: {e}", file=sys.stderr)
+                self._reap_children()
+                if self._read_build_stamp() != self._build_stamp:
+                    break  # Plugin rebuilt in place; stop serving stale code
+        finally:
+            server.close()
+            self.socket_path.unlink(missing_ok=True)
+        return 0
+
+
+def _exit_on_signal(signum: int, frame: Any) -> None:
+    # Raise so serve_forever's cleanup removes the socket
+    sys.exit(0)
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Persistent Hook Router daemon")
+    parser.add_argument("--socket", type=Path, help="Unix socket path (default: per plugin root)")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=float(os.environ.get("AOPS_ROUTER_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT)),
+        help="Exit after this many seconds without requests",
+    )
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    try:
+        socket_path = args.socket or get_router_socket_path()
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    return RouterServer(socket_path, idle_timeout=args.idle_timeout).serve_forever()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -55,6 +55,31 @@ class HookContext(BaseModel):
     # Cached framework content (lazy loaded)
     _framework_content_cache: tuple[str, str, str] | None = None
 
+    @cached_property
+    def tool_input_text(self) -> str:
+        """Stringified tool_input for gate regex matching (computed once per event)."""
+        return str(self.tool_input)
+
+    @cached_property
+    def tool_category(self) -> str | None:
+        """Gate tool category of tool_name (computed once per event)."""
+        if not self.tool_name:
+            return None
+        from hooks.gate_config import get_tool_category
+
+        return get_tool_category(
+            self.tool_name, self.tool_input if isinstance(self.tool_input, dict) else None
+        )
+
+    @cached_property
+    def evaluation_cache(self) -> dict[str, Any]:
+        """Per-event memo for expensive gate inputs (transcript, git state).
+
+        Shared by every gate evaluating this event, so a custom condition
+        referenced by several gates does its I/O once.
+        """
+        return {}
+
     @cached_property
     def framework_content(self) -> tuple[str, str, str]:
         """Lazy-load framework content (axioms, heuristics, skills).
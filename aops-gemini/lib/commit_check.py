@@ -17,8 +17,10 @@ from hooks.internal_models import (
     UncommittedWorkCheck,
 )
 
+from lib.git_probe import invalidate as invalidate_git_probe
+from lib.git_probe import probe
 from lib.reflection_detector import has_reflection
-from lib.transcript_parser import SessionProcessor
+from lib.transcript_parser import SessionProcessor, iter_entries_reversed
 
 logger = logging.getLogger(__name__)
 
@@ -79,39 +81,52 @@ def _extract_text_from_entry(entry: Any) -> str:
 def extract_recent_messages(
     transcript_path: Path, max_messages: int = MAX_MESSAGES_TO_CHECK
 ) -> list[str]:
-    """Extract recent assistant message texts from transcript."""
+    """Extract recent assistant message texts from transcript, newest first.
+
+    JSONL transcripts are read backwards from EOF and reading stops once
+    max_messages are found. Agent (subagent) files are only loaded when
+    the main transcript has fewer than max_messages.
+    """
     if not transcript_path.exists():
         return []
 
     try:
         processor = SessionProcessor()
-        _, entries, agent_entries = processor.parse_session_file(
-            transcript_path, load_agents=True, load_hooks=False
-        )
-
-        messages = []
-
-        for entry in reversed(entries):
-            if entry.type != "assistant":
-                continue
-            text = _extract_text_from_entry(entry)
-            if text:
-                messages.append(text)
-                if len(messages) >= max_messages:
-                    break
-
-        if len(messages) < max_messages and agent_entries:
-            for _agent_id, agent_entry_list in agent_entries.items():
-                for entry in reversed(agent_entry_list):
-                    if entry.type != "assistant":
-                        continue
-                    text = _extract_text_from_entry(entry)
-                    if text:
-                        messages.append(text)
-                        if len(messages) >= max_messages:
-                            break
-                if len(messages) >= max_messages:
-                    break
+        messages: list[str] = []
+
+        if transcript_path.suffix.lower() == ".jsonl":
+            for entry in iter_entries_reversed(transcript_path):
+                if entry.type != "assistant":
+                    continue
+                text = _extract_text_from_entry(entry)
+                if text:
+                    messages.append(text)
+                    if len(messages) >= max_messages:
+                        return messages
+            agent_entries = processor._load_agent_files(transcript_path)
+        else:
+            # Gemini JSON / Antigravity sessions are not line-oriented
+            _, entries, agent_entries = processor.parse_session_file(
+                transcript_path, load_agents=True, load_hooks=False
+            )
+            for entry in reversed(entries):
+                if entry.type != "assistant":
+                    continue
+                text = _extract_text_from_entry(entry)
+                if text:
+                    messages.append(text)
+                    if len(messages) >= max_messages:
+                        return messages
+
+        for _agent_id, agent_entry_list in agent_entries.items():
+            for entry in reversed(agent_entry_list):
+                if entry.type != "assistant":
+                    continue
+                text = _extract_text_from_entry(entry)
+                if text:
+                    messages.append(text)
+                    if len(messages) >= max_messages:
+                        return messages
 
         return messages
 
@@ -148,115 +163,47 @@ def has_qa_invocation(messages: list[str]) -> bool:
 
 def get_git_status(cwd: str | None = None) -> GitStatus:
     """Get git status information."""
-    try:
-        result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-
-        if result.returncode != 0:
-            return GitStatus()
-
-        output = result.stdout
-        if not output:
-            return GitStatus()
-
-        has_staged = any(
-            line.startswith(("A ", "M ", "D ", "R ", "C ")) for line in output.split("\n")
-        )
-        has_unstaged = any(line.startswith((" M", " D")) for line in output.split("\n"))
-        has_untracked = any(line.startswith("??") for line in output.split("\n"))
-
-        return GitStatus(
-            has_changes=bool(output.strip()),
-            staged_changes=has_staged,
-            unstaged_changes=has_unstaged,
-            untracked_files=has_untracked,
-            status_output=output,
-        )
-
-    except Exception as e:
-        logger.warning(f"Failed to get git status: {e}")
+    state = probe(cwd)
+    if not state.ok or not state.has_changes:
         return GitStatus()
 
+    lines = state.status_lines
+    has_staged = any(line.startswith(("A ", "M ", "D ", "R ", "C ")) for line in lines)
+    has_unstaged = any(line.startswith((" M", " D")) for line in lines)
+    has_untracked = any(line.startswith("??") for line in lines)
+
+    return GitStatus(
+        has_changes=True,
+        staged_changes=has_staged,
+        unstaged_changes=has_unstaged,
+        untracked_files=has_untracked,
+        status_output=state.status_output,
+    )
+
 
 def get_git_push_status(cwd: str | None = None) -> GitPushStatus:
     """Get git push status information."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-
-        if result.returncode != 0:
-            return GitPushStatus()
-
-        current_branch = result.stdout.strip()
-
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", f"{current_branch}@{{u}}"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-
-        if result.returncode != 0:
-            return GitPushStatus(current_branch=current_branch)
-
-        tracking_branch = result.stdout.strip()
-
-        result = subprocess.run(
-            ["git", "rev-list", "--count", f"{tracking_branch}..HEAD"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-
-        if result.returncode != 0:
-            return GitPushStatus(
-                current_branch=current_branch,
-                tracking_branch=tracking_branch,
-            )
-
-        commits_ahead = int(result.stdout.strip())
+    state = probe(cwd)
+    if not state.ok:
+        return GitPushStatus()
 
-        return GitPushStatus(
-            branch_ahead=commits_ahead > 0,
-            commits_ahead=commits_ahead,
-            current_branch=current_branch,
-            tracking_branch=tracking_branch,
-        )
+    # Detached HEAD reports as "HEAD", matching `git rev-parse --abbrev-ref HEAD`
+    current_branch = state.branch or "HEAD"
+    if not state.upstream:
+        return GitPushStatus(current_branch=current_branch)
 
-    except ValueError:
-        return GitPushStatus()
-    except Exception as e:
-        logger.warning(f"Failed to get git push status: {e}")
-        return GitPushStatus()
+    return GitPushStatus(
+        branch_ahead=state.ahead > 0,
+        commits_ahead=state.ahead,
+        current_branch=current_branch,
+        tracking_branch=state.upstream,
+    )
 
 
 def get_current_branch() -> str | None:
     """Get the current branch name."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            capture_output=True,
-            text=True,
-            timeout=2,
-        )
-        if result.returncode == 0:
-            branch = result.stdout.strip()
-            return None if branch == "HEAD" else branch
-        return None
-    except Exception:
-        return None
+    state = probe()
+    return state.branch if state.ok else None
 
 
 def is_protected_branch(branch: str | None) -> bool:
@@ -285,6 +232,7 @@ def attempt_auto_commit() -> bool:
             timeout=5,
         )
 
+        invalidate_git_probe()
         if result.returncode == 0:
             logger.info("Auto-commit succeeded")
             return True
@@ -299,12 +247,21 @@ def attempt_auto_commit() -> bool:
         return False
 
 
-def check_uncommitted_work(session_id: str, transcript_path: str | None) -> UncommittedWorkCheck:
+def check_uncommitted_work(
+    session_id: str,
+    transcript_path: str | None,
+    messages: list[str] | None = None,
+    git_status: GitStatus | None = None,
+    push_status: GitPushStatus | None = None,
+) -> UncommittedWorkCheck:
     """Check if session has uncommitted work or unpushed commits.
 
     Args:
         session_id: Claude Code session ID
         transcript_path: Path to session transcript
+        messages: Recent assistant messages, if already extracted
+        git_status: Working tree status, if already probed
+        push_status: Push status, if already probed
 
     Returns:
         UncommittedWorkCheck with check results
@@ -312,8 +269,8 @@ def check_uncommitted_work(session_id: str, transcript_path: str | None) -> Unco
     if not transcript_path:
         return UncommittedWorkCheck()
 
-    path = Path(transcript_path)
-    messages = extract_recent_messages(path)
+    if messages is None:
+        messages = extract_recent_messages(Path(transcript_path))
 
     if not messages:
         return UncommittedWorkCheck()
@@ -321,8 +278,10 @@ def check_uncommitted_work(session_id: str, transcript_path: str | None) -> Unco
     reflection_found = has_framework_reflection(messages)
     tests_passed = has_test_success(messages)
     qa_invoked = has_qa_invocation(messages)
-    git_status = get_git_status()
-    push_status = get_git_push_status()
+    if git_status is None:
+        git_status = get_git_status()
+    if push_status is None:
+        push_status = get_git_push_status()
 
     reminder_parts = []
 
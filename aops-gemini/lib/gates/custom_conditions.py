@@ -1,8 +1,93 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from hooks.internal_models import UncommittedWorkCheck
 from hooks.schemas import HookContext
 
 from lib.gate_types import GateState
 from lib.session_state import SessionState
 
+T = TypeVar("T")
+
+
+# --- Per-event memoization ---
+# Several gates (and several triggers/policies within a gate) can reference
+# the same expensive condition for one event. Shared inputs are computed at
+# most once per HookContext; per-gate side effects (metrics) still run for
+# every gate.
+
+
+def _memoized(ctx: HookContext, key: str, compute: Callable[[], T]) -> T:
+    """Return ctx.evaluation_cache[key], computing it on first use."""
+    cache = ctx.evaluation_cache
+    if key not in cache:
+        cache[key] = compute()
+    return cache[key]
+
+
+def _transcript_path(ctx: HookContext) -> str | None:
+    # Use transcript path from input if context is missing it
+    return ctx.transcript_path or ctx.raw_input.get("transcript_path")
+
+
+def _recent_messages(ctx: HookContext) -> list[str]:
+    """Recent assistant message texts from the transcript tail."""
+    from lib.commit_check import extract_recent_messages
+
+    def compute() -> list[str]:
+        path = _transcript_path(ctx)
+        return extract_recent_messages(Path(path)) if path else []
+
+    return _memoized(ctx, "recent_messages", compute)
+
+
+def _uncommitted_work(ctx: HookContext) -> UncommittedWorkCheck:
+    """check_uncommitted_work for this event, sharing transcript and git probes."""
+    from lib.commit_check import check_uncommitted_work
+
+    def compute() -> UncommittedWorkCheck:
+        cache = ctx.evaluation_cache
+        messages = _recent_messages(ctx)
+        result = check_uncommitted_work(
+            ctx.session_id,
+            _transcript_path(ctx),
+            messages=messages,
+            git_status=cache.get("git_status"),
+            push_status=cache.get("push_status"),
+        )
+        if messages:  # git was only probed when there were messages to check
+            cache.setdefault("git_status", result.git_status)
+            cache.setdefault("push_status", result.push_status)
+        return result
+
+    return _memoized(ctx, "uncommitted_work", compute)
+
+
+def _framework_reflection(ctx: HookContext) -> tuple[bool, dict[str, Any] | None]:
+    """(transcript readable, newest parsed Framework Reflection or None).
+
+    Framework reflections are written at the end of a session, so only the
+    recent assistant messages (the transcript tail) are searched.
+    """
+
+    def compute() -> tuple[bool, dict[str, Any] | None]:
+        transcript_path = _transcript_path(ctx)
+        if not transcript_path or not Path(transcript_path).exists():
+            return False, None
+        try:
+            from lib.transcript_parser import parse_framework_reflection
+
+            for message in _recent_messages(ctx):
+                reflection = parse_framework_reflection(message)
+                if reflection is not None:
+                    return True, reflection
+            return True, None
+        except Exception:
+            return False, None
+
+    return _memoized(ctx, "framework_reflection", compute)
+
 
 def check_custom_condition(
     name: str, ctx: HookContext, state: GateState, session_state: SessionState
@@ -12,11 +97,7 @@ def check_custom_condition(
     """
     if name == "has_uncommitted_work":
         try:
-            from lib.commit_check import check_uncommitted_work
-
-            # Use transcript path from input if context is missing it
-            path = ctx.transcript_path or ctx.raw_input.get("transcript_path")
-            result = check_uncommitted_work(ctx.session_id, path)
+            result = _uncommitted_work(ctx)
             if result.should_block:
                 state.metrics["block_reason"] = result.message
                 return True
@@ -26,10 +107,7 @@ def check_custom_condition(
 
     if name == "needs_commit_reminder":
         try:
-            from lib.commit_check import check_uncommitted_work
-
-            path = ctx.transcript_path or ctx.raw_input.get("transcript_path")
-            result = check_uncommitted_work(ctx.session_id, path)
+            result = _uncommitted_work(ctx)
             if result.reminder_needed:
                 state.metrics["warning_message"] = result.message
                 return True
@@ -60,50 +138,14 @@ def check_custom_condition(
             return False
 
     if name == "has_framework_reflection":
-        try:
-            from lib.transcript_parser import parse_framework_reflection
-
-            # Load transcript and check for reflection
-            transcript_path = ctx.transcript_path or ctx.raw_input.get("transcript_path")
-            if not transcript_path:
-                return False
-
-            # Read recent transcript content
-            from pathlib import Path
-
-            path = Path(transcript_path)
-            if not path.exists():
-                return False
-
-            # Read last portion of transcript to check for reflection
-            # Framework reflections are typically at the end
-            content = path.read_text()
-            # Parse the reflection
-            reflection = parse_framework_reflection(content)
-            return reflection is not None
-        except (ImportError, Exception):
-            return False
+        found, reflection = _framework_reflection(ctx)
+        return found and reflection is not None
 
     if name == "missing_framework_reflection":
         # Inverse check - returns True when reflection is MISSING
-        try:
-            from lib.transcript_parser import parse_framework_reflection
-
-            transcript_path = ctx.transcript_path or ctx.raw_input.get("transcript_path")
-            if not transcript_path:
-                return True  # Missing if no transcript
-
-            from pathlib import Path
-
-            path = Path(transcript_path)
-            if not path.exists():
-                return True  # Missing if file doesn't exist
-
-            content = path.read_text()
-            reflection = parse_framework_reflection(content)
-            return reflection is None  # True when reflection is missing
-        except (ImportError, Exception):
-            return True  # Assume missing on error
+        # (including when there is no transcript or it cannot be read)
+        found, reflection = _framework_reflection(ctx)
+        return not found or reflection is None
 
     if name == "is_not_safe_toolsearch":
         # Returns False ONLY if ToolSearch is loading specific tools by name (select:*)
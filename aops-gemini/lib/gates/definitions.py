@@ -20,7 +20,7 @@ from lib.gate_types import (
 # Note: SubagentStart is included in trigger patterns alongside SubagentStop so
 # gates can transition as soon as the subagent is dispatched (e.g. opening a gate
 # pre-emptively so the subagent's own tool calls aren't blocked). This is
-# intentional, not a workaround — _call_gate_method now routes SubagentStart
+# intentional, not a workaround — _dispatch_gates now routes SubagentStart
 # to gate.on_subagent_start() (fixed in aops-55bcf1a2).
 
 GATE_CONFIGS = [
@@ -1,17 +1,21 @@
 import logging
 import re
 import time
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, NamedTuple
 
 from hooks.schemas import HookContext
 
+from lib import hook_timing
 from lib.gate_model import GateResult, GateVerdict
 from lib.gate_types import (
     GateCondition,
     GateConfig,
+    GatePolicy,
     GateState,
     GateStatus,
     GateTransition,
+    GateTrigger,
 )
 from lib.session_paths import get_gate_file_path
 from lib.session_state import SessionState
@@ -19,6 +23,71 @@ from lib.template_registry import TemplateRegistry
 
 logger = logging.getLogger(__name__)
 
+# Events HookRouter dispatches to gates. Dispatch tables for these are built
+# when the gate is constructed; any other event is compiled on first sight.
+KNOWN_HOOK_EVENTS = (
+    "SessionStart",
+    "PreToolUse",
+    "PostToolUse",
+    "UserPromptSubmit",
+    "Stop",
+    "SessionEnd",
+    "AfterAgent",
+    "SubagentStart",
+    "SubagentStop",
+)
+
+# hook_event values containing any of these are treated as regexes
+_HOOK_EVENT_REGEX_CHARS = "^$|[]()"
+
+
+def _compile(pattern: str | None) -> re.Pattern[str] | None:
+    return re.compile(pattern) if pattern else None
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """A GateCondition with its regexes compiled once at gate construction."""
+
+    condition: GateCondition
+    hook_event_re: re.Pattern[str] | None
+    tool_name_re: re.Pattern[str] | None
+    tool_input_re: re.Pattern[str] | None
+    subagent_type_re: re.Pattern[str] | None
+    excluded_tool_categories: frozenset[str]
+
+    @classmethod
+    def compile(cls, condition: GateCondition) -> "CompiledCondition":
+        hook_event = condition.hook_event
+        return cls(
+            condition=condition,
+            hook_event_re=(
+                re.compile(hook_event)
+                if hook_event and any(c in hook_event for c in _HOOK_EVENT_REGEX_CHARS)
+                else None
+            ),
+            tool_name_re=_compile(condition.tool_name_pattern),
+            tool_input_re=_compile(condition.tool_input_pattern),
+            subagent_type_re=_compile(condition.subagent_type_pattern),
+            excluded_tool_categories=frozenset(condition.excluded_tool_categories or ()),
+        )
+
+    def matches_event(self, hook_event: str) -> bool:
+        """Whether this condition can ever match the given hook event."""
+        if not self.condition.hook_event:
+            return True
+        if self.hook_event_re is not None:
+            return self.hook_event_re.search(hook_event) is not None
+        # Simple equality check for backward compatibility and speed
+        return self.condition.hook_event == hook_event
+
+
+class EventTable(NamedTuple):
+    """Triggers and policies of one gate that can match one hook event (config order)."""
+
+    triggers: list[tuple[GateTrigger, CompiledCondition]]
+    policies: list[tuple[GatePolicy, CompiledCondition]]
+
 
 class GenericGate:
     """
@@ -27,6 +96,22 @@ class GenericGate:
 
     def __init__(self, config: GateConfig):
         self.config = config
+        self._triggers = [(t, CompiledCondition.compile(t.condition)) for t in config.triggers]
+        self._policies = [(p, CompiledCondition.compile(p.condition)) for p in config.policies]
+        self._tables: dict[str, EventTable] = {}
+        for event in KNOWN_HOOK_EVENTS:
+            self.event_table(event)
+
+    def event_table(self, hook_event: str) -> EventTable:
+        """Return the dispatch table for hook_event, compiling it on first use."""
+        table = self._tables.get(hook_event)
+        if table is None:
+            table = EventTable(
+                triggers=[(t, c) for t, c in self._triggers if c.matches_event(hook_event)],
+                policies=[(p, c) for p, c in self._policies if c.matches_event(hook_event)],
+            )
+            self._tables[hook_event] = table
+        return table
 
     @property
     def name(self) -> str:
@@ -40,60 +125,45 @@ class GenericGate:
 
     def _evaluate_condition(
         self,
-        condition: GateCondition,
+        compiled: CompiledCondition,
         ctx: HookContext,
         state: GateState,
         session_state: SessionState,
     ) -> bool:
+        """Evaluate a compiled condition.
+
+        The hook_event matcher is not re-checked here: callers only pass
+        conditions taken from the event's dispatch table (see event_table()).
+        """
+        condition = compiled.condition
+
         # 0. Check Current Status
         if condition.current_status:
             if state.status != condition.current_status:
                 return False
 
-        # 1. Hook Event Match
-        if condition.hook_event:
-            # Match regex if it starts with ^ or ends with $ or contains |
-            if any(c in condition.hook_event for c in "^$|[]()"):
-                if not re.search(condition.hook_event, ctx.hook_event):
-                    return False
-            else:
-                # Simple equality check for backward compatibility and speed
-                if condition.hook_event != ctx.hook_event:
-                    return False
-
         # 2. Tool Name Pattern
-        if condition.tool_name_pattern:
+        if compiled.tool_name_re is not None:
             if not ctx.tool_name:
                 return False
-            if not re.search(condition.tool_name_pattern, ctx.tool_name):
+            if not compiled.tool_name_re.search(ctx.tool_name):
                 return False
 
         # 2.5 Excluded Tool Categories
-        if condition.excluded_tool_categories:
-            from hooks.gate_config import get_tool_category
-
-            if (
-                ctx.tool_name
-                and get_tool_category(
-                    ctx.tool_name,
-                    ctx.tool_input if isinstance(ctx.tool_input, dict) else None,
-                )
-                in condition.excluded_tool_categories
-            ):
+        if compiled.excluded_tool_categories:
+            if ctx.tool_name and ctx.tool_category in compiled.excluded_tool_categories:
                 return False
 
-        # 3. Tool Input Pattern
-        if condition.tool_input_pattern:
-            # Stringify tool_input and regex search
-            input_str = str(ctx.tool_input)
-            if not re.search(condition.tool_input_pattern, input_str):
+        # 3. Tool Input Pattern (regex on stringified tool_input, built once per event)
+        if compiled.tool_input_re is not None:
+            if not compiled.tool_input_re.search(ctx.tool_input_text):
                 return False
 
         # 3.5 Subagent Type Pattern
-        if condition.subagent_type_pattern:
+        if compiled.subagent_type_re is not None:
             if not ctx.subagent_type:
                 return False
-            if not re.search(condition.subagent_type_pattern, ctx.subagent_type):
+            if not compiled.subagent_type_re.search(ctx.subagent_type):
                 return False
 
         # 4. State Metrics Checks
@@ -115,7 +185,9 @@ class GenericGate:
             # Import dynamically or use registry
             from lib.gates.custom_conditions import check_custom_condition
 
-            if not check_custom_condition(condition.custom_check, ctx, state, session_state):
+            with hook_timing.span(f"condition.{condition.custom_check}"):
+                matched = check_custom_condition(condition.custom_check, ctx, state, session_state)
+            if not matched:
                 return False
 
         return True
@@ -136,12 +208,8 @@ class GenericGate:
             **state.metrics,
         }
 
-    def _render_template(
-        self, template: str, ctx: HookContext, state: GateState, session_state: SessionState
-    ) -> str:
+    def _render_template(self, template: str, variables: dict[str, Any]) -> str:
         """Render an inline template string with context variables."""
-        variables = self._build_template_variables(ctx, state, session_state)
-
         # Fail fast on missing template variables. The old defaultdict fallback
         # silently produced "(not set)" which caused gates to pass broken
         # instructions to agents (e.g. temp_path not in metrics).
@@ -158,26 +226,26 @@ class GenericGate:
         self,
         template_key: str | None,
         inline_template: str | None,
-        ctx: HookContext,
-        state: GateState,
-        session_state: SessionState,
+        variables: dict[str, Any],
     ) -> str | None:
         """Resolve a message from a template key or inline string.
 
         Prefers template_key (via TemplateRegistry) over inline_template.
-        Returns None if neither is set.
+        Returns None if neither is set. variables comes from
+        _build_template_variables(), built once per transition or policy.
         """
         if template_key:
-            variables = self._build_template_variables(ctx, state, session_state)
             try:
-                return TemplateRegistry.instance().render(template_key, variables)
+                with hook_timing.span(f"template.{template_key}"):
+                    return TemplateRegistry.instance().render(template_key, variables)
             except (KeyError, ValueError, FileNotFoundError) as e:
                 raise RuntimeError(
                     f"Gate '{self.name}' failed to render template key '{template_key}': {e}"
                 ) from e
 
         if inline_template:
-            return self._render_template(inline_template, ctx, state, session_state)
+            with hook_timing.span("template.inline"):
+                return self._render_template(inline_template, variables)
 
         return None
 
@@ -221,26 +289,24 @@ class GenericGate:
         if transition.custom_action:
             from lib.gates.custom_actions import execute_custom_action
 
-            result = execute_custom_action(transition.custom_action, ctx, state, session_state)
+            with hook_timing.span(f"action.{transition.custom_action}"):
+                result = execute_custom_action(transition.custom_action, ctx, state, session_state)
             if result:
                 custom_sys_msg = result.system_message
                 custom_ctx_inj = result.context_injection
 
         # Render Messages (prefer template keys over inline strings)
+        variables = self._build_template_variables(ctx, state, session_state)
         sys_msg = self._resolve_message(
             transition.system_message_key,
             transition.system_message_template,
-            ctx,
-            state,
-            session_state,
+            variables,
         )
 
         ctx_inj = self._resolve_message(
             transition.context_key,
             transition.context_template,
-            ctx,
-            state,
-            session_state,
+            variables,
         )
 
         # Combine Messages (Template first, then Custom Action)
@@ -262,8 +328,8 @@ class GenericGate:
         injections = []
         transition_occurred = False
 
-        for trigger in self.config.triggers:
-            if self._evaluate_condition(trigger.condition, ctx, state, session_state):
+        for trigger, compiled in self.event_table(ctx.hook_event).triggers:
+            if self._evaluate_condition(compiled, ctx, state, session_state):
                 result = self._apply_transition(trigger.transition, ctx, state, session_state)
                 if result.system_message:
                     messages.append(result.system_message)
@@ -334,9 +400,10 @@ class GenericGate:
         message = None
         if countdown.message_key:
             try:
-                message = TemplateRegistry.instance().render(
-                    countdown.message_key, countdown_variables
-                )
+                with hook_timing.span(f"template.{countdown.message_key}"):
+                    message = TemplateRegistry.instance().render(
+                        countdown.message_key, countdown_variables
+                    )
             except (KeyError, ValueError, FileNotFoundError) as e:
                 logger.warning(f"Countdown template key error for gate '{self.name}': {e}")
         else:
@@ -356,8 +423,8 @@ class GenericGate:
         """Evaluate policies (Blocking/Warning)."""
         state = self._get_state(session_state)
 
-        for policy in self.config.policies:
-            if self._evaluate_condition(policy.condition, ctx, state, session_state):
+        for policy, compiled in self.event_table(ctx.hook_event).policies:
+            if self._evaluate_condition(compiled, ctx, state, session_state):
                 # Policy matched!
 
                 # Custom Action (Side Effects before message rendering)
@@ -366,31 +433,29 @@ class GenericGate:
                 if policy.custom_action:
                     from lib.gates.custom_actions import execute_custom_action
 
-                    action_result = execute_custom_action(
-                        policy.custom_action, ctx, state, session_state
-                    )
+                    with hook_timing.span(f"action.{policy.custom_action}"):
+                        action_result = execute_custom_action(
+                            policy.custom_action, ctx, state, session_state
+                        )
                     if action_result:
                         if action_result.system_message:
                             sys_msg_prefix = action_result.system_message + "\n"
                         if action_result.context_injection:
                             ctx_inj_prefix = action_result.context_injection + "\n\n"
 
+                variables = self._build_template_variables(ctx, state, session_state)
                 sys_msg = (
                     self._resolve_message(
                         policy.message_key,
                         policy.message_template or None,
-                        ctx,
-                        state,
-                        session_state,
+                        variables,
                     )
                     or ""
                 )
                 ctx_inj = self._resolve_message(
                     policy.context_key,
                     policy.context_template,
-                    ctx,
-                    state,
-                    session_state,
+                    variables,
                 )
                 if ctx_inj:
                     ctx_inj = "<SYSTEM HOOK INSTRUCTION>" + ctx_inj + "</SYSTEM HOOK INSTRUCTION>"
@@ -22,6 +22,12 @@ class GateRegistry:
         """Get all registered gates."""
         return list(cls._gates.values())
 
+    @classmethod
+    def reset(cls) -> None:
+        """Drop all registered gates so the next initialize() rebuilds them."""
+        cls._gates = {}
+        cls._initialized = False
+
     @classmethod
     def initialize(cls) -> None:
         """Initialize all gates (import and register them)."""
@@ -0,0 +1,308 @@
+"""Single-shot git repository probe with a fingerprint cache.
+
+One `git status --porcelain=v2 --branch` call yields everything the commit
+checks and ACA_DATA autocommit need: working tree changes, the current
+branch, its upstream and the ahead/behind counts.
+
+Results are cached per git directory in small JSON files under
+~/.polecat/git-probe/ ($AOPS_GIT_PROBE_CACHE), written atomically, so the
+cache outlives the process: every hook event runs in its own process (a
+child of the router daemon, or a one-shot fallback). A cached result is
+keyed on a cheap fingerprint: the mtimes of .git/index, .git/HEAD, the
+current branch ref, its upstream ref, packed-refs and FETCH_HEAD.
+Commits, checkouts, staging, fetches and pushes all touch one of these, so
+repeated Stop/PostToolUse checks in a quiet repo don't spawn git.
+
+Edits to tracked or untracked files do not change the fingerprint, so a
+cached result is also bounded by AOPS_GIT_PROBE_TTL seconds (default 10),
+and the router calls invalidate() after every tool that may write files.
+invalidate() with no repository writes the time to a stamp file that
+every result probed before it yields to.
+
+Usage:
+    from lib.git_probe import probe
+
+    state = probe(repo_path)
+    if state.ok and state.has_changes:
+        ...
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from lib.paths import get_git_probe_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 10.0
+PROBE_TIMEOUT = 5
+
+Fingerprint = tuple[int | None, ...]
+
+
+@dataclass(frozen=True)
+class RepoState:
+    """Working tree and branch state from one porcelain v2 status call.
+
+    Attributes:
+        ok: git status succeeded (False outside a repo or on timeout)
+        branch: Current branch, None when HEAD is detached
+        upstream: Upstream tracking branch (e.g. origin/main), if any
+        ahead: Commits on branch not on upstream
+        behind: Commits on upstream not on branch
+        status_lines: Changes in `git status --porcelain` (v1) format
+        error: stderr or exception text when ok is False
+    """
+
+    ok: bool
+    branch: str | None = None
+    upstream: str | None = None
+    ahead: int = 0
+    behind: int = 0
+    status_lines: tuple[str, ...] = ()
+    error: str = ""
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.status_lines)
+
+    @property
+    def status_output(self) -> str:
+        """Changes as `git status --porcelain` would print them."""
+        return "".join(f"{line}\n" for line in self.status_lines)
+
+
+# Touched by invalidate() for all repositories
+_STAMP_NAME = "invalidated"
+
+
+def _ttl() -> float:
+    try:
+        return float(os.environ.get("AOPS_GIT_PROBE_TTL", DEFAULT_TTL_SECONDS))
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def _find_git_dir(start: Path) -> Path | None:
+    """Locate the .git directory for start (following worktree `gitdir:` files)."""
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:") :].strip())
+                return git_dir if git_dir.is_absolute() else (directory / git_dir).resolve()
+            return None
+    return None
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _fingerprint(git_dir: Path, state: RepoState | None) -> Fingerprint:
+    paths = [git_dir / "index", git_dir / "HEAD", git_dir / "packed-refs", git_dir / "FETCH_HEAD"]
+    if state is not None and state.branch:
+        paths.append(git_dir / "refs" / "heads" / state.branch)
+    if state is not None and state.upstream:
+        paths.append(git_dir / "refs" / "remotes" / state.upstream)
+    return tuple(_mtime(p) for p in paths)
+
+
+def _cache_path(git_dir: Path) -> Path:
+    digest = hashlib.sha1(str(git_dir).encode("utf-8")).hexdigest()[:16]
+    return get_git_probe_cache_dir() / f"{digest}.json"
+
+
+def _read_cached(git_dir: Path) -> tuple[Fingerprint, int, RepoState] | None:
+    """(fingerprint, probed_at_ns, state) cached for git_dir, None if missing or invalid."""
+    try:
+        with open(_cache_path(git_dir), encoding="utf-8") as f:
+            data = json.load(f)
+        state = data["state"]
+        return (
+            tuple(data["fingerprint"]),
+            int(data["probed_at_ns"]),
+            RepoState(**{**state, "status_lines": tuple(state["status_lines"])}),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cached(
+    git_dir: Path, fingerprint: Fingerprint, probed_at_ns: int, state: RepoState
+) -> None:
+    """Atomically write the cache file. Failures only cost a git call next time."""
+    path = _cache_path(git_dir)
+    data: dict[str, Any] = {
+        "git_dir": str(git_dir),
+        "fingerprint": list(fingerprint),
+        "probed_at_ns": probed_at_ns,
+        "state": asdict(state),
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".probe-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                json.dump(data, tmp, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write git probe cache {path}: {e}")
+
+
+def _stamp_ns() -> int:
+    """Time of the last invalidate() of all repositories (0 if never)."""
+    try:
+        return int((get_git_probe_cache_dir() / _STAMP_NAME).read_text())
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError):
+        return time.time_ns()  # Being rewritten: treat every result as stale
+
+
+def _drop_cached(git_dir: Path) -> None:
+    try:
+        _cache_path(git_dir).unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug(f"Could not remove git probe cache for {git_dir}: {e}")
+
+
+def _to_porcelain_v1(line: str) -> str | None:
+    """Convert one porcelain v2 change line to its v1 `XY path` form."""
+    kind = line[:1]
+    if kind == "?":
+        return f"?? {line[2:]}"
+    if kind == "!":
+        return None  # Ignored files are not reported by plain --porcelain
+    if kind not in ("1", "2", "u"):
+        return None
+    xy = line[2:4].replace(".", " ")
+    # 1: 8 fields before path; 2: 9 (adds score); u: 10
+    fields = {"1": 8, "2": 9, "u": 10}[kind]
+    path = line.split(" ", fields)[-1]
+    if kind == "2":
+        new_path, _, orig_path = path.partition("\t")
+        return f"{xy} {orig_path} -> {new_path}"
+    return f"{xy} {path}"
+
+
+def parse_porcelain_v2(output: str) -> RepoState:
+    """Parse `git status --porcelain=v2 --branch` output."""
+    branch: str | None = None
+    upstream: str | None = None
+    ahead = behind = 0
+    lines: list[str] = []
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            head = line[len("# branch.head ") :]
+            branch = None if head == "(detached)" else head
+        elif line.startswith("# branch.upstream "):
+            upstream = line[len("# branch.upstream ") :]
+        elif line.startswith("# branch.ab "):
+            a, b = line[len("# branch.ab ") :].split()
+            ahead, behind = int(a), abs(int(b))
+        elif line and not line.startswith("#"):
+            converted = _to_porcelain_v1(line)
+            if converted:
+                lines.append(converted)
+    return RepoState(
+        ok=True,
+        branch=branch,
+        upstream=upstream,
+        ahead=ahead,
+        behind=behind,
+        status_lines=tuple(lines),
+    )
+
+
+def _run_probe(cwd: Path) -> RepoState:
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain=v2", "--branch"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=PROBE_TIMEOUT,
+            check=False,
+        )
+    except Exception as e:
+        logger.warning(f"git status probe failed in {cwd}: {e}")
+        return RepoState(ok=False, error=str(e))
+    if result.returncode != 0:
+        return RepoState(ok=False, error=result.stderr.strip())
+    try:
+        return parse_porcelain_v2(result.stdout)
+    except ValueError as e:
+        return RepoState(ok=False, error=f"unparseable git status output: {e}")
+
+
+def probe(repo_path: Path | str | None = None, use_cache: bool = True) -> RepoState:
+    """Probe the repository containing repo_path (default: the current directory).
+
+    Args:
+        repo_path: Any directory inside the repository
+        use_cache: Reuse a cached result while its fingerprint and TTL hold
+
+    Returns:
+        RepoState (ok=False if git failed; failures are never cached)
+    """
+    cwd = Path(repo_path) if repo_path is not None else Path.cwd()
+    git_dir = _find_git_dir(cwd.resolve())
+
+    if use_cache and git_dir is not None:
+        cached = _read_cached(git_dir)
+        if cached is not None:
+            fingerprint, probed_at_ns, state = cached
+            if (
+                time.time_ns() - probed_at_ns < _ttl() * 1e9
+                and probed_at_ns > _stamp_ns()
+                and _fingerprint(git_dir, state) == fingerprint
+            ):
+                return state
+
+    # Taken before git runs, so an invalidate() during the call still wins
+    probed_at_ns = time.time_ns()
+    state = _run_probe(cwd)
+    if git_dir is not None:
+        if state.ok:
+            _write_cached(git_dir, _fingerprint(git_dir, state), probed_at_ns, state)
+        else:
+            _drop_cached(git_dir)
+    return state
+
+
+def invalidate(repo_path: Path | str | None = None) -> None:
+    """Drop cached probes (all repositories when repo_path is None)."""
+    if repo_path is not None:
+        git_dir = _find_git_dir(Path(repo_path).resolve())
+        if git_dir is not None:
+            _drop_cached(git_dir)
+        return
+    stamp = get_git_probe_cache_dir() / _STAMP_NAME
+    try:
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.write_text(str(time.time_ns()))
+    except OSError as e:
+        logger.debug(f"Could not write git probe stamp {stamp}: {e}")
@@ -0,0 +1,117 @@
+"""Manifest mapping transcripts to their per-session hook logs.
+
+Hook logs (`<date>-<hash>-hooks.jsonl`) are named by session hash, not by
+transcript, so attaching hooks to a transcript used to mean JSON-decoding
+every line of every hook log in several directories until one mentioned
+the transcript_path.
+
+unified_logger appends one line to the manifest when it creates a hook
+log; SessionProcessor._find_hook_file looks the transcript up here and
+only falls back to the scan (backfilling the manifest with what it reads)
+for logs written before the manifest existed.
+
+The manifest is an append-only JSONL file under ~/.polecat
+($AOPS_HOOK_MANIFEST). Each line is a single short O_APPEND write, so
+concurrent hooks need no locking; the last entry for a transcript wins.
+
+Usage:
+    from lib.hook_log_manifest import lookup_hook_log, record_hook_log
+
+    record_hook_log(transcript_path, log_path, "2026-01-31", session_id)
+    hook_file = lookup_hook_log(transcript_path)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+
+from lib.paths import get_hook_manifest_path
+
+logger = logging.getLogger(__name__)
+
+# (manifest path, mtime_ns, size) -> transcript_path -> hook log path
+_cache_key: tuple[str, int, int] | None = None
+_cache: dict[str, str] = {}
+
+
+def record_hook_log(
+    transcript_path: str,
+    hook_log: str | Path,
+    date: str | None = None,
+    session_id: str | None = None,
+) -> None:
+    """Append a transcript -> hook log entry. Failures are logged, never raised."""
+    line = json.dumps(
+        {
+            "transcript_path": str(transcript_path),
+            "hook_log": str(hook_log),
+            "date": date,
+            "session_id": session_id,
+        },
+        separators=(",", ":"),
+    )
+    path = get_hook_manifest_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (line + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.debug(f"Could not record hook log in manifest {path}: {e}")
+
+
+def load_manifest() -> dict[str, str]:
+    """transcript_path -> hook log path, re-read only when the manifest changes."""
+    global _cache_key, _cache
+
+    path = get_hook_manifest_path()
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    if key == _cache_key:
+        return _cache
+
+    mapping: dict[str, str] = {}
+    try:
+        with path.open("rb") as f:
+            for raw in f:
+                try:
+                    data = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if not isinstance(data, dict):
+                    continue
+                transcript = data.get("transcript_path")
+                hook_log = data.get("hook_log")
+                if isinstance(transcript, str) and isinstance(hook_log, str):
+                    mapping[transcript] = hook_log
+    except OSError as e:
+        logger.debug(f"Could not read hook log manifest {path}: {e}")
+        return {}
+
+    _cache_key, _cache = key, mapping
+    return mapping
+
+
+def lookup_hook_log(transcript_path: str | Path) -> Path | None:
+    """Hook log recorded for transcript_path, if it still exists."""
+    hook_log = load_manifest().get(str(transcript_path))
+    if hook_log is None:
+        return None
+    path = Path(hook_log)
+    return path if path.is_file() else None
+
+
+def date_from_hook_log_name(hook_log: Path) -> str | None:
+    """YYYY-MM-DD from a `<YYYYMMDD>-<hash>-hooks.jsonl` name, else None."""
+    prefix = hook_log.name.split("-", 1)[0]
+    if len(prefix) == 8 and prefix.isdigit():
+        return f"{prefix[:4]}-{prefix[4:6]}-{prefix[6:]}"
+    return None
@@ -0,0 +1,80 @@
+"""Span timing for hook execution.
+
+The router starts a recording at the beginning of each hook event and the
+instrumented code wraps its work in named spans. When the event finishes,
+the collected timings are written to the per-session hooks JSONL as:
+
+    "timings": {
+        "total_ms": 41.2,
+        "spans": {"state.load": 0.6, "gate.hydration.check": 38.9, ...}
+    }
+
+Span names:
+- state.load / state.save              SessionState I/O
+- handler.<name>                       router special handlers
+- gate.<gate>.<method>                 GenericGate methods (check, on_stop, ...)
+- condition.<name> / action.<name>     custom conditions and actions
+- template.<key>                       template rendering ("inline" for inline templates)
+
+Spans nest (a gate span includes its conditions) and a span entered more
+than once per event accumulates. Outside a recording, span() is a no-op.
+
+Usage:
+    from lib import hook_timing
+
+    hook_timing.start()
+    with hook_timing.span("state.load"):
+        ...
+    timings = hook_timing.collect()
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+_started_at: float | None = None
+_spans: dict[str, float] = {}
+
+
+def start() -> None:
+    """Begin recording spans for one hook event (discarding any previous one)."""
+    global _started_at
+    _started_at = time.perf_counter()
+    _spans.clear()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block under `name` (milliseconds, accumulated)."""
+    if _started_at is None:
+        yield
+        return
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        _spans[name] = _spans.get(name, 0.0) + (time.perf_counter() - begin) * 1000
+
+
+def collect() -> dict[str, Any] | None:
+    """Stop recording and return the timings object, or None if not recording."""
+    global _started_at
+    if _started_at is None:
+        return None
+    total_ms = (time.perf_counter() - _started_at) * 1000
+    _started_at = None
+    spans = {name: round(ms, 3) for name, ms in _spans.items()}
+    _spans.clear()
+    return {"total_ms": round(total_ms, 3), "spans": spans}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
@@ -19,20 +19,12 @@ from lib.hook_utils import (
 from lib.hook_utils import (
     write_temp_file as _write_temp,
 )
+from lib.hydration.context_bundle import load_context_bundle
 from lib.hydration.context_loaders import (
     get_task_work_state,
-    load_environment_variables_context,
-    load_framework_paths,
-    load_glossary,
-    load_mcp_tools_context,
-    load_project_context_index,
-    load_project_paths_context,
-    load_project_rules,
-    load_scripts_index,
-    load_skills_index,
     load_workflows_index,
 )
-from lib.session_paths import get_gate_file_path
+from lib.session_paths import get_gate_file_path, get_transcript_cursor_path
 from lib.session_reader import extract_router_context
 from lib.session_state import SessionState
 from lib.template_loader import load_template
@@ -104,7 +96,10 @@ def build_hydration_instruction(
     session_context = ""
     if transcript_path:
         try:
-            ctx = extract_router_context(Path(transcript_path))
+            ctx = extract_router_context(
+                Path(transcript_path),
+                cursor_path=get_transcript_cursor_path(session_id, input_data),
+            )
             if ctx:
                 session_context = f"\n\n{ctx}"
         except FileNotFoundError:
@@ -116,19 +111,20 @@ def build_hydration_instruction(
                 f"Context extraction failed (degrading gracefully): {type(e).__name__}: {e}"
             )
 
-    # Load all context components
-    glossary = load_glossary()
-    framework_paths = load_framework_paths()
-    mcp_tools = load_mcp_tools_context()
-    env_vars = load_environment_variables_context()
-    project_paths = load_project_paths_context()
-    workflows_index = load_workflows_index(prompt)
-    skills_index = load_skills_index()
-    scripts_index = load_scripts_index()
-    project_rules = load_project_rules()
+    # Load all context components (prompt-independent sections from the bundle)
+    bundle = load_context_bundle().sections
+    glossary = bundle["glossary"]
+    framework_paths = bundle["framework_paths"]
+    mcp_tools = bundle["mcp_tools"]
+    env_vars = bundle["env_vars"]
+    project_paths = bundle["project_paths"]
+    workflows_index = load_workflows_index(prompt, base_workflows=bundle["base_workflows"])
+    skills_index = bundle["skills_index"]
+    scripts_index = bundle["scripts_index"]
+    project_rules = bundle["project_rules"]
     task_state = get_task_work_state()
     relevant_files = get_formatted_relevant_paths(prompt, max_files=10)
-    project_context_index = load_project_context_index()
+    project_context_index = bundle["project_context_index"]
 
     # Build full context for temp file
     context_template = load_template(CONTEXT_TEMPLATE_FILE)
@@ -0,0 +1,250 @@
+"""Precompiled hydration context bundle.
+
+Most of the hydration context does not depend on the prompt: the glossary,
+skills and scripts indexes, the base WORKFLOWS.md, project rules, the
+project map and the project context index. build_hydration_instruction used
+to re-read and re-strip all of them on every hydratable prompt.
+
+The bundle holds those rendered sections, cached in memory (router daemon)
+and on disk under get_hydration_cache_dir(), one file per working
+directory. It is keyed by a fingerprint of every contributing file (path,
+mtime, size; directories by their mtime so added or removed rules count),
+the cwd, the plugin root and the loaders' own source. Sections are rebuilt
+only when one of these changes.
+
+Prompt-dependent context (project/global workflow selection, relevant
+files, session context) is still computed per prompt.
+
+Usage:
+    from lib.hydration.context_bundle import load_context_bundle
+
+    sections = load_context_bundle().sections
+    sections["glossary"]
+
+CLI: scripts/hydration_bundle.py (prebuild, inspect).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from lib.hydration import context_loaders
+from lib.hydration.context_loaders import (
+    get_plugin_root,
+    load_base_workflows,
+    load_environment_variables_context,
+    load_framework_paths,
+    load_glossary,
+    load_mcp_tools_context,
+    load_project_context_index,
+    load_project_paths_context,
+    load_project_rules,
+    load_scripts_index,
+    load_skills_index,
+)
+from lib.paths import get_hydration_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Bump when the bundle file format or a section's rendering changes
+BUNDLE_VERSION = 1
+
+# Section name -> loader (run with the bundle's cwd as working directory)
+SECTIONS: dict[str, Callable[[], str | None]] = {
+    "glossary": load_glossary,
+    "framework_paths": load_framework_paths,
+    "mcp_tools": load_mcp_tools_context,
+    "env_vars": load_environment_variables_context,
+    "project_paths": load_project_paths_context,
+    "skills_index": load_skills_index,
+    "scripts_index": load_scripts_index,
+    "project_rules": load_project_rules,
+    "project_context_index": load_project_context_index,
+    "base_workflows": load_base_workflows,
+}
+
+# Plugin-root files read by the loaders above
+PLUGIN_SOURCES = ("GLOSSARY.md", "SKILLS.md", "SCRIPTS.md", "WORKFLOWS.md")
+
+
+@dataclass(frozen=True)
+class ContextBundle:
+    """Rendered prompt-independent hydration sections for one working directory.
+
+    Attributes:
+        cwd: Working directory the sections were rendered for
+        fingerprint: Hash of the contributing files' state
+        built_at: Unix time the sections were rendered
+        sections: Section name -> rendered text (base_workflows is None
+            when the plugin has no WORKFLOWS.md)
+        source: Where this bundle came from: "memory", "disk" or "built"
+    """
+
+    cwd: str
+    fingerprint: str
+    built_at: float
+    sections: dict[str, str | None]
+    source: str
+
+
+# cwd -> bundle (for the long-lived router daemon)
+_memo: dict[str, ContextBundle] = {}
+
+
+def source_paths(cwd: Path | None = None) -> list[Path]:
+    """Every file and directory whose state the bundle depends on."""
+    cwd = cwd or Path.cwd()
+    plugin_root = get_plugin_root()
+    rules_dir = cwd / ".agent" / "rules"
+    paths = [plugin_root / name for name in PLUGIN_SOURCES]
+    paths += [
+        Path(context_loaders.__file__),
+        cwd / "projects.json",
+        cwd / ".agent" / "context-map.json",
+        rules_dir,
+    ]
+    if rules_dir.is_dir():
+        paths += sorted(rules_dir.glob("*.md"))
+    return paths
+
+
+def _stat_key(path: Path) -> list:
+    try:
+        st = path.stat()
+    except OSError:
+        return [str(path), None, None]
+    return [str(path), st.st_mtime_ns, st.st_size]
+
+
+def compute_fingerprint(cwd: Path | None = None) -> str:
+    """Fingerprint of the bundle's inputs for cwd (a few stat calls, no reads)."""
+    cwd = cwd or Path.cwd()
+    key = {
+        "version": BUNDLE_VERSION,
+        "cwd": str(cwd),
+        "plugin_root": str(get_plugin_root()),
+        "sources": [_stat_key(p) for p in source_paths(cwd)],
+    }
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()[:16]
+
+
+def bundle_path(cwd: Path | None = None) -> Path:
+    """On-disk location of the bundle for cwd."""
+    cwd = cwd or Path.cwd()
+    cwd_hash = hashlib.sha256(str(cwd).encode()).hexdigest()[:12]
+    return get_hydration_cache_dir() / f"bundle-{cwd_hash}.json"
+
+
+def _read_bundle_file(path: Path) -> dict | None:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("sections"), dict):
+        return None
+    return data
+
+
+def _write_bundle_file(path: Path, bundle: ContextBundle) -> None:
+    """Atomically write the bundle. Failures only cost a rebuild next time."""
+    data = {
+        "version": BUNDLE_VERSION,
+        "cwd": bundle.cwd,
+        "fingerprint": bundle.fingerprint,
+        "built_at": bundle.built_at,
+        "sections": bundle.sections,
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".bundle-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            json.dump(data, tmp)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not write hydration bundle {path}: {e}")
+
+
+def build_context_bundle(fingerprint: str | None = None) -> ContextBundle:
+    """Render every section for the current directory and store the bundle.
+
+    The loaders resolve project files against the process cwd, so a bundle
+    can only be built for the current directory.
+    """
+    cwd = Path.cwd()
+    # Fingerprint before reading, so an edit made during the build is picked up next time
+    fingerprint = fingerprint or compute_fingerprint(cwd)
+    bundle = ContextBundle(
+        cwd=str(cwd),
+        fingerprint=fingerprint,
+        built_at=time.time(),
+        sections={name: loader() for name, loader in SECTIONS.items()},
+        source="built",
+    )
+    _write_bundle_file(bundle_path(cwd), bundle)
+    _memo[str(cwd)] = bundle
+    return bundle
+
+
+def load_context_bundle(use_cache: bool = True) -> ContextBundle:
+    """The bundle for the current directory, rebuilt only if a source changed."""
+    cwd = Path.cwd()
+    fingerprint = compute_fingerprint(cwd)
+
+    if use_cache:
+        cached = _memo.get(str(cwd))
+        if cached is not None and cached.fingerprint == fingerprint:
+            return replace(cached, source="memory")
+
+        data = _read_bundle_file(bundle_path(cwd))
+        if (
+            data is not None
+            and data.get("version") == BUNDLE_VERSION
+            and data.get("fingerprint") == fingerprint
+            and set(data["sections"]) == set(SECTIONS)
+        ):
+            bundle = ContextBundle(
+                cwd=str(cwd),
+                fingerprint=fingerprint,
+                built_at=data.get("built_at", 0.0),
+                sections=data["sections"],
+                source="disk",
+            )
+            _memo[str(cwd)] = bundle
+            return bundle
+
+    return build_context_bundle(fingerprint)
+
+
+def inspect_bundle(cwd: Path | None = None) -> dict:
+    """Describe the on-disk bundle for cwd without rebuilding it."""
+    cwd = cwd or Path.cwd()
+    path = bundle_path(cwd)
+    data = _read_bundle_file(path)
+    fingerprint = compute_fingerprint(cwd)
+    if data is None:
+        status = "missing"
+    elif data.get("version") == BUNDLE_VERSION and data.get("fingerprint") == fingerprint:
+        status = "fresh"
+    else:
+        status = "stale"
+    return {
+        "path": str(path),
+        "cwd": str(cwd),
+        "status": status,
+        "fingerprint": fingerprint,
+        "built_at": data.get("built_at") if data else None,
+        "sections": data["sections"] if data else {},
+    }
+
+
+def clear_memo() -> None:
+    """Forget in-memory bundles (the on-disk cache is kept)."""
+    _memo.clear()
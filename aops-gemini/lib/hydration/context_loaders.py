@@ -8,16 +8,13 @@ from pathlib import Path
 
 @lru_cache
 def get_plugin_root() -> Path:
-    """Find the root of the plugin installation (where README.md/SKILLS.md live)."""
-    # Start from this file's directory: aops-core/lib/hydration/
-    current = Path(__file__).resolve().parent
-    # Go up to aops-core/
-    while current.name != "aops-core" and current.parent != current:
-        current = current.parent
-    if current.name == "aops-core":
-        return current
-    # Fallback if structure is weird (e.g. tests)
-    return Path.cwd()
+    """Find the root of the plugin installation (where README.md/SKILLS.md live).
+
+    Resolved from this file (<root>/lib/hydration/), never from the cwd: the
+    router daemon serves hooks for every project, and the cached root must
+    not depend on whichever project's hook ran first.
+    """
+    return Path(__file__).resolve().parent.parent.parent
 
 
 def _strip_frontmatter(content: str) -> str:
@@ -245,16 +242,26 @@ def _load_global_workflow_content(prompt: str = "") -> str:
     return "".join(result)
 
 
-def load_workflows_index(prompt: str = "") -> str:
-    """Load WORKFLOWS.md for hydrator context."""
-    plugin_root = get_plugin_root()
-    workflows_path = plugin_root / "WORKFLOWS.md"
-
+def load_base_workflows() -> str | None:
+    """Load the plugin's WORKFLOWS.md (frontmatter stripped), or None if missing."""
+    workflows_path = get_plugin_root() / "WORKFLOWS.md"
     if not workflows_path.exists():
-        return "(WORKFLOWS.md not found)"
+        return None
+    return _strip_frontmatter(workflows_path.read_text())
 
-    content = workflows_path.read_text()
-    base_workflows = _strip_frontmatter(content)
+
+def load_workflows_index(prompt: str = "", base_workflows: str | None = None) -> str:
+    """Load WORKFLOWS.md for hydrator context.
+
+    Args:
+        prompt: User prompt, used to select project and global workflows
+        base_workflows: Pre-loaded WORKFLOWS.md content (e.g. from the context
+            bundle); read from the plugin root when None
+    """
+    if base_workflows is None:
+        base_workflows = load_base_workflows()
+    if base_workflows is None:
+        return "(WORKFLOWS.md not found)"
 
     project_workflows = _load_project_workflows(prompt)
     global_workflow_content = _load_global_workflow_content(prompt)
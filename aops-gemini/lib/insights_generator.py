@@ -7,15 +7,21 @@ Used by both automatic generation (Stop hook) and manual generation (skill).
 from __future__ import annotations
 
 import json
+import logging
 import os
 import re
+import sqlite3
 import tempfile
 from datetime import datetime
+from fnmatch import fnmatchcase
 from pathlib import Path
 from typing import Any
 
 from lib.paths import get_plugin_root, get_summaries_dir
 from lib.session_reader import extract_gate_context, find_sessions
+from lib.summaries_manifest import get_summaries_manifest
+
+logger = logging.getLogger(__name__)
 
 
 class InsightsValidationError(Exception):
@@ -457,27 +463,54 @@ def find_existing_insights(date: str, session_id: str, index: int | None = None)
         f"{date[:10]}-{session_id}.json",  # Old format with dashes in date
     ]
 
+    # Every pattern starts with date_compact or date[:10], so the manifest's
+    # names with those prefixes are the only candidates; no directory globs
+    try:
+        manifest = get_summaries_manifest()
+        names = manifest.names_with_prefix(summaries_dir, date_compact)
+        if not date[:10].startswith(date_compact):
+            names += manifest.names_with_prefix(summaries_dir, date[:10])
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"Summaries manifest unavailable, globbing {summaries_dir}: {e}")
+        return _glob_existing_insights(summaries_dir, patterns, index)
+
+    for pattern in patterns:
+        matches = [summaries_dir / name for name in names if fnmatchcase(name, pattern)]
+        if matches:
+            filtered = _filter_insights_index(matches, index)
+            if filtered:
+                return filtered[0]
+    return None
+
+
+def _filter_insights_index(matches: list[Path], index: int | None) -> list[Path]:
+    """Matches with the requested reflection index (see find_existing_insights)."""
+    if index is None:
+        return matches
+    filtered = []
+    for path in matches:
+        stem = path.stem
+        if index > 0:
+            # Must end with -{index}
+            if stem.endswith(f"-{index}"):
+                filtered.append(path)
+        else:
+            # Must NOT end with -{digit}
+            if not re.search(r"-\d+$", stem):
+                filtered.append(path)
+    return filtered
+
+
+def _glob_existing_insights(
+    summaries_dir: Path, patterns: list[str], index: int | None
+) -> Path | None:
+    """find_existing_insights without the manifest: one glob per pattern."""
     for pattern in patterns:
         matches = list(summaries_dir.glob(pattern))
         if matches:
-            if index is not None:
-                # Filter matches by index
-                filtered = []
-                for path in matches:
-                    stem = path.stem
-                    if index > 0:
-                        # Must end with -{index}
-                        if stem.endswith(f"-{index}"):
-                            filtered.append(path)
-                    else:
-                        # Must NOT end with -{digit}
-                        if not re.search(r"-\d+$", stem):
-                            filtered.append(path)
-
-                if filtered:
-                    return filtered[0]
-            else:
-                return matches[0]
+            filtered = _filter_insights_index(matches, index)
+            if filtered:
+                return filtered[0]
     return None
 
 
@@ -619,18 +652,18 @@ def write_insights_file(
         date_str = insights.get("date", "")
         date_compact = date_str.replace("-", "") if date_str else ""
 
-        # Try patterns (with date first since that's more specific)
-        patterns_to_try = []
-        if date_compact:
-            patterns_to_try.append(status_dir / f"{date_compact}-{session_id}.json")
-        patterns_to_try.append(status_dir / f"{session_id}.json")
-        # Fallback: search with glob for pattern matching (handles renamed files)
-        if date_compact:
-            patterns_to_try.extend(status_dir.glob(f"{date_compact}-*{session_id}*.json"))
-        patterns_to_try.extend(status_dir.glob(f"*{session_id}*.json"))
-
-        for candidate in patterns_to_try:
-            if isinstance(candidate, Path) and candidate.exists():
+        def candidates():
+            # Exact names first (with date first since that's more specific)
+            if date_compact:
+                yield status_dir / f"{date_compact}-{session_id}.json"
+            yield status_dir / f"{session_id}.json"
+            # Fallback: glob for renamed files, only if no exact name exists
+            if date_compact:
+                yield from status_dir.glob(f"{date_compact}-*{session_id}*.json")
+            yield from status_dir.glob(f"*{session_id}*.json")
+
+        for candidate in candidates():
+            if candidate.exists():
                 status_path = candidate
                 break
 
@@ -675,6 +708,12 @@ def write_insights_file(
         temp_path.unlink(missing_ok=True)
         raise
 
+    # Index the new summary so lookups don't have to rescan the directory
+    try:
+        get_summaries_manifest().record_summary(path, insights)
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"Could not record {path} in the summaries manifest: {e}")
+
 
 def generate_fallback_insights(
     metadata: dict[str, str], operational_metrics: dict[str, Any]
@@ -0,0 +1,412 @@
+"""Durable work queue for the session-insights pipeline.
+
+find_pending.py used to sort every transcript in the transcripts
+directory by mtime and probe for an insights file one at a time. Sessions
+now enter this queue when their transcript is written (bulk export,
+Stop-time render) and are drained by the skill's scripts:
+
+    find_pending.py     claims pending sessions (leased to a worker)
+    prepare_prompt.py   acquires or extends the lease before the LLM call
+    process_response.py records an invalid response as a failed attempt
+    merge_insights.py   marks the session done once insights are written
+
+Storage is a single SQLite database in WAL mode (like lib/job_spool.py),
+so the queue survives crashes and restarts, and claims are atomic across
+processes: several workers can drain it concurrently without two of them
+calling the LLM for the same session.
+
+Session lifecycle:
+    pending -> in_flight -> done
+                         -> pending (failed attempt or expired lease, retried)
+                         -> failed  (max_attempts exhausted)
+
+A lease expires after lease_seconds; the next claim returns the session
+to pending (a worker that died mid-session loses it). Workers are named
+by $AOPS_INSIGHTS_WORKER, defaulting to the host name, so scripts run by
+the same worker share its leases.
+
+Usage:
+    from lib.insights_queue import InsightsQueue
+
+    queue = InsightsQueue()
+    queue.enqueue_transcript(transcript_path)
+
+    for item in queue.claim("worker-1", limit=5):
+        ...  # generate insights for item.transcript
+        queue.complete(item.session_id)
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from lib.incremental_transcript import VARIANTS
+from lib.insights_generator import find_existing_insights
+from lib.paths import get_insights_queue_path, get_transcripts_dir
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_LEASE_SECONDS = 15 * 60.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Transcript variant queued for analysis when a session has several
+PREFERRED_VARIANT = "full"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    transcript TEXT NOT NULL,
+    date TEXT NOT NULL,
+    project TEXT NOT NULL,
+    transcript_mtime REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_by_status ON sessions (status, transcript_mtime);
+"""
+
+
+@dataclass
+class QueuedSession:
+    """A session in the insights queue."""
+
+    session_id: str
+    transcript: Path
+    date: str  # YYYY-MM-DD
+    project: str
+    status: str
+    attempts: int
+    lease_owner: str | None = None
+    lease_expires_at: float | None = None
+    last_error: str | None = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> QueuedSession:
+        return cls(
+            session_id=row["session_id"],
+            transcript=Path(row["transcript"]),
+            date=row["date"],
+            project=row["project"],
+            status=row["status"],
+            attempts=row["attempts"],
+            lease_owner=row["lease_owner"],
+            lease_expires_at=row["lease_expires_at"],
+            last_error=row["last_error"],
+        )
+
+
+def default_worker_id() -> str:
+    """This worker's name ($AOPS_INSIGHTS_WORKER or the host name)."""
+    return os.environ.get("AOPS_INSIGHTS_WORKER") or socket.gethostname()
+
+
+def parse_transcript_name(name: str) -> tuple[str, str, str, str | None] | None:
+    """(session_id, YYYY-MM-DD date, project, variant) from a transcript filename.
+
+    Handles YYYYMMDD-HH-[project-]sessionid-variant.md as written by
+    lib/incremental_transcript.py and the older YYYYMMDD-[HH-]project-
+    sessionid-suffix.md names; None if the name has no date.
+    """
+    stem = name[: -len(".md")] if name.endswith(".md") else name
+    parts = stem.split("-")
+    if len(parts) < 3 or len(parts[0]) != 8 or not parts[0].isdigit():
+        return None
+    date = f"{parts[0][:4]}-{parts[0][4:6]}-{parts[0][6:8]}"
+    # Hour component (v3.7.0+)
+    shift = 1 if len(parts[1]) == 2 and parts[1].isdigit() else 0
+
+    if parts[-1] in VARIANTS and len(parts) >= 3 + shift:
+        # Project is optional here; the session hash is always last
+        middle = parts[1 + shift : -1]
+        project = "-".join(middle[:-1]) or "unknown"
+        return middle[-1], date, project, parts[-1]
+    if len(parts) >= 3 + shift:
+        return parts[2 + shift], date, parts[1 + shift], None
+    return None
+
+
+class InsightsQueue:
+    """SQLite-backed queue of sessions awaiting insights, with leases and retries."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or get_insights_queue_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue(
+        self,
+        session_id: str,
+        transcript: Path,
+        date: str,
+        project: str,
+        transcript_mtime: float | None = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> str:
+        """Add a session or update its transcript. Returns its status.
+
+        A new session whose insights already exist is recorded as done.
+        Known sessions keep their status; only the transcript is updated.
+        """
+        now = time.time()
+        if transcript_mtime is None:
+            try:
+                transcript_mtime = transcript.stat().st_mtime
+            except OSError:
+                transcript_mtime = now
+        row = self._conn.execute(
+            "SELECT status FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute(
+                "UPDATE sessions SET transcript = ?, transcript_mtime = ?, updated_at = ?"
+                " WHERE session_id = ?",
+                (str(transcript), transcript_mtime, now, session_id),
+            )
+            return row["status"]
+
+        status = DONE if find_existing_insights(date, session_id) else PENDING
+        self._conn.execute(
+            "INSERT OR IGNORE INTO sessions (session_id, transcript, date, project,"
+            " transcript_mtime, status, max_attempts, enqueued_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                session_id,
+                str(transcript),
+                date,
+                project,
+                transcript_mtime,
+                status,
+                max_attempts,
+                now,
+                now,
+            ),
+        )
+        return status
+
+    def enqueue_transcript(self, transcript: Path) -> str | None:
+        """Enqueue the session a transcript file belongs to (see parse_transcript_name).
+
+        Returns the session id, or None if the filename isn't recognized.
+        """
+        parsed = parse_transcript_name(transcript.name)
+        if parsed is None:
+            return None
+        session_id, date, project, _ = parsed
+        self.enqueue(session_id, transcript, date, project)
+        return session_id
+
+    def backfill(self, transcripts_dir: Path | None = None) -> int:
+        """Enqueue every session in the transcripts directory. Returns sessions added.
+
+        One directory listing; the full variant is preferred when a session
+        has several transcripts. Used to seed the queue and to pick up
+        transcripts written by other tools.
+        """
+        transcripts_dir = transcripts_dir or get_transcripts_dir()
+        best: dict[str, tuple[bool, float, Path, str, str]] = {}
+        try:
+            scan = os.scandir(transcripts_dir)
+        except OSError:
+            return 0
+        with scan:
+            for item in scan:
+                if not item.name.endswith(".md"):
+                    continue
+                parsed = parse_transcript_name(item.name)
+                if parsed is None:
+                    continue
+                session_id, date, project, variant = parsed
+                try:
+                    mtime = item.stat().st_mtime
+                except OSError:
+                    continue
+                candidate = (variant == PREFERRED_VARIANT, mtime, Path(item.path), date, project)
+                if session_id not in best or candidate[:2] > best[session_id][:2]:
+                    best[session_id] = candidate
+
+        known = {row[0] for row in self._conn.execute("SELECT session_id FROM sessions")}
+        added = 0
+        for session_id, (_, mtime, path, date, project) in best.items():
+            if session_id not in known:
+                added += 1
+            self.enqueue(session_id, path, date, project, mtime)
+        return added
+
+    def _expire_leases(self, now: float) -> None:
+        # Inside a transaction: sessions whose worker vanished go back to pending
+        self._conn.execute(
+            "UPDATE sessions SET status = CASE WHEN attempts >= max_attempts"
+            f" THEN '{FAILED}' ELSE '{PENDING}' END,"
+            " last_error = 'lease expired', lease_owner = NULL, lease_expires_at = NULL,"
+            f" updated_at = ? WHERE status = '{IN_FLIGHT}' AND lease_expires_at < ?",
+            (now, now),
+        )
+
+    def claim(
+        self, owner: str, limit: int = 1, lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> list[QueuedSession]:
+        """Lease up to limit pending sessions to owner, most recent transcript first.
+
+        Sessions whose insights were written meanwhile (e.g. by a manual
+        run) are marked done instead of being returned.
+        """
+        claimed: list[QueuedSession] = []
+        while len(claimed) < limit:
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire_leases(now)
+                rows = self._conn.execute(
+                    "SELECT * FROM sessions WHERE status = ?"
+                    " ORDER BY transcript_mtime DESC LIMIT ?",
+                    (PENDING, limit - len(claimed)),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE sessions SET status = ?, attempts = attempts + 1, lease_owner = ?,"
+                    " lease_expires_at = ?, updated_at = ? WHERE session_id = ?",
+                    [
+                        (IN_FLIGHT, owner, now + lease_seconds, now, row["session_id"])
+                        for row in rows
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if not rows:
+                break
+            for row in rows:
+                item = QueuedSession.from_row(row)
+                if find_existing_insights(item.date, item.session_id):
+                    self.complete(item.session_id)
+                    continue
+                item.status = IN_FLIGHT
+                item.attempts += 1
+                item.lease_owner = owner
+                item.lease_expires_at = now + lease_seconds
+                claimed.append(item)
+        return claimed
+
+    def acquire(
+        self, session_id: str, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> bool:
+        """Lease one session to owner, or extend owner's lease.
+
+        Returns False only if another worker holds an unexpired lease.
+        Sessions that aren't queued, done or failed are left alone (True):
+        an explicit run for them doesn't compete with the queue.
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._expire_leases(now)
+            row = self._conn.execute(
+                "SELECT status, lease_owner FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is not None and row["status"] == IN_FLIGHT and row["lease_owner"] != owner:
+                self._conn.execute("COMMIT")
+                return False
+            if row is not None and row["status"] in (PENDING, IN_FLIGHT):
+                attempts = "attempts + 1" if row["status"] == PENDING else "attempts"
+                self._conn.execute(
+                    f"UPDATE sessions SET status = ?, attempts = {attempts}, lease_owner = ?,"
+                    " lease_expires_at = ?, updated_at = ? WHERE session_id = ?",
+                    (IN_FLIGHT, owner, now + lease_seconds, now, session_id),
+                )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def complete(self, session_id: str) -> bool:
+        """Mark a session done (its insights are written). Returns False if not queued."""
+        cur = self._conn.execute(
+            "UPDATE sessions SET status = ?, lease_owner = NULL, lease_expires_at = NULL,"
+            " updated_at = ?, last_error = NULL WHERE session_id = ?",
+            (DONE, time.time(), session_id),
+        )
+        return cur.rowcount > 0
+
+    def fail(self, session_id: str, error: str, owner: str | None = None) -> bool:
+        """Record a failed attempt on an in-flight session. Returns True if it will be retried.
+
+        If owner is given, only that worker's lease is failed.
+        """
+        sql = (
+            "UPDATE sessions SET status = CASE WHEN attempts >= max_attempts"
+            f" THEN '{FAILED}' ELSE '{PENDING}' END,"
+            " lease_owner = NULL, lease_expires_at = NULL, updated_at = ?, last_error = ?"
+            " WHERE session_id = ? AND status = ?"
+        )
+        params: tuple[Any, ...] = (time.time(), error, session_id, IN_FLIGHT)
+        if owner is not None:
+            sql += " AND lease_owner = ?"
+            params += (owner,)
+        self._conn.execute(sql, params)
+        row = self._conn.execute(
+            "SELECT status FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row is not None and row["status"] == PENDING
+
+    def retry_failed(self, session_id: str | None = None) -> int:
+        """Reset failed sessions (or one session) to pending with a fresh attempt budget."""
+        sql = "UPDATE sessions SET status = ?, attempts = 0, updated_at = ? WHERE status = ?"
+        params: tuple[Any, ...] = (PENDING, time.time(), FAILED)
+        if session_id is not None:
+            sql += " AND session_id = ?"
+            params += (session_id,)
+        return self._conn.execute(sql, params).rowcount
+
+    def pending(self, limit: int = 5) -> list[QueuedSession]:
+        """Pending sessions in claim order, without leasing them."""
+        rows = self._conn.execute(
+            "SELECT * FROM sessions WHERE status = ? ORDER BY transcript_mtime DESC LIMIT ?",
+            (PENDING, limit),
+        )
+        return [QueuedSession.from_row(row) for row in rows]
+
+    def get(self, session_id: str) -> QueuedSession | None:
+        row = self._conn.execute(
+            "SELECT * FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return QueuedSession.from_row(row) if row is not None else None
+
+    def stats(self) -> dict[str, int]:
+        """Session counts by status."""
+        return {
+            row["status"]: row["n"]
+            for row in self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM sessions GROUP BY status"
+            )
+        }
+
+    def failures(self, limit: int = 20) -> list[QueuedSession]:
+        """Most recently failed sessions."""
+        rows = self._conn.execute(
+            "SELECT * FROM sessions WHERE status = ? ORDER BY updated_at DESC LIMIT ?",
+            (FAILED, limit),
+        )
+        return [QueuedSession.from_row(row) for row in rows]
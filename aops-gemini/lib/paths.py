@@ -83,6 +83,94 @@ def get_local_cache_root() -> Path:
     return Path.home() / ".polecat"
 
 
+def get_job_spool_path() -> Path:
+    """Get the background side-effect job spool ($AOPS_JOB_SPOOL or ~/.polecat/spool/jobs.db)."""
+    spool = os.environ.get("AOPS_JOB_SPOOL")
+    if spool:
+        return Path(spool).resolve()
+    return get_local_cache_root() / "spool" / "jobs.db"
+
+
+def get_insights_queue_path() -> Path:
+    """Get the insights work queue ($AOPS_INSIGHTS_QUEUE or ~/.polecat/spool/insights.db)."""
+    queue = os.environ.get("AOPS_INSIGHTS_QUEUE")
+    if queue:
+        return Path(queue).resolve()
+    return get_local_cache_root() / "spool" / "insights.db"
+
+
+def get_hydration_cache_dir() -> Path:
+    """Get the hydration context bundle cache ($AOPS_HYDRATION_CACHE or ~/.polecat/hydration)."""
+    cache_dir = os.environ.get("AOPS_HYDRATION_CACHE")
+    if cache_dir:
+        return Path(cache_dir).resolve()
+    return get_local_cache_root() / "hydration"
+
+
+def get_template_cache_dir() -> Path:
+    """Get the precompiled template pack directory ($AOPS_TEMPLATE_CACHE or ~/.polecat/templates)."""
+    cache_dir = os.environ.get("AOPS_TEMPLATE_CACHE")
+    if cache_dir:
+        return Path(cache_dir).resolve()
+    return get_local_cache_root() / "templates"
+
+
+def get_hook_manifest_path() -> Path:
+    """Get the hook log manifest ($AOPS_HOOK_MANIFEST or ~/.polecat/hook-logs.jsonl)."""
+    manifest = os.environ.get("AOPS_HOOK_MANIFEST")
+    if manifest:
+        return Path(manifest).resolve()
+    return get_local_cache_root() / "hook-logs.jsonl"
+
+
+def get_agent_index_dir() -> Path:
+    """Get the subagent transcript index directory ($AOPS_AGENT_INDEX or ~/.polecat/agent-index)."""
+    index_dir = os.environ.get("AOPS_AGENT_INDEX")
+    if index_dir:
+        return Path(index_dir).resolve()
+    return get_local_cache_root() / "agent-index"
+
+
+def get_git_probe_cache_dir() -> Path:
+    """Get the git status probe cache directory ($AOPS_GIT_PROBE_CACHE or ~/.polecat/git-probe)."""
+    cache_dir = os.environ.get("AOPS_GIT_PROBE_CACHE")
+    if cache_dir:
+        return Path(cache_dir).resolve()
+    return get_local_cache_root() / "git-probe"
+
+
+def get_transcript_render_dir() -> Path:
+    """Get the incremental transcript render cursors ($AOPS_TRANSCRIPT_RENDER or ~/.polecat/transcript-render)."""
+    render_dir = os.environ.get("AOPS_TRANSCRIPT_RENDER")
+    if render_dir:
+        return Path(render_dir).resolve()
+    return get_local_cache_root() / "transcript-render"
+
+
+def get_error_analysis_cache_dir() -> Path:
+    """Get the per-session error analysis cache ($AOPS_ERROR_ANALYSIS_CACHE or ~/.polecat/error-analysis)."""
+    cache_dir = os.environ.get("AOPS_ERROR_ANALYSIS_CACHE")
+    if cache_dir:
+        return Path(cache_dir).resolve()
+    return get_local_cache_root() / "error-analysis"
+
+
+def get_session_catalog_path() -> Path:
+    """Get the session catalog database ($AOPS_SESSION_CATALOG or ~/.polecat/catalog/sessions.db)."""
+    catalog = os.environ.get("AOPS_SESSION_CATALOG")
+    if catalog:
+        return Path(catalog).resolve()
+    return get_local_cache_root() / "catalog" / "sessions.db"
+
+
+def get_summaries_manifest_path() -> Path:
+    """Get the summaries manifest ($AOPS_SUMMARIES_MANIFEST or ~/.polecat/catalog/summaries.db)."""
+    manifest = os.environ.get("AOPS_SUMMARIES_MANIFEST")
+    if manifest:
+        return Path(manifest).resolve()
+    return get_local_cache_root() / "catalog" / "summaries.db"
+
+
 def get_sessions_repo() -> Path:
     """Get sessions repository root.
 
@@ -0,0 +1,473 @@
+"""Persistent SQLite catalog of Claude Code, Gemini and Antigravity sessions.
+
+find_sessions used to walk ~/.claude/projects/*, recursively glob
+~/.gemini/tmp for chats and list every Antigravity brain directory on
+every call, and get_session_state globbed the transcripts and summaries
+directories once per session. The catalog keeps what those crawls found
+in ~/.polecat/catalog/sessions.db ($AOPS_SESSION_CATALOG):
+
+- dirs: every directory the catalog watches, with an mtime signature
+- sessions: path, source, project, session_id, size, mtime and the last
+  computed processing state
+- artifacts: transcript and summary file names, one row per
+  dash-separated name token, so a session prefix is an index lookup;
+  summaries match the prefix anywhere in the name, so a token miss falls
+  back to a substring scan of that directory's names
+
+A refresh lists a directory only when its mtime signature changed (an
+entry was added, removed or renamed). Sessions in unchanged directories
+are re-stat'ed rather than listed, so appends to a live session still
+update its size and mtime. Gemini chats are looked up in the documented
+~/.gemini/tmp/{hash}/chats/ layout.
+
+Usage:
+    from lib.session_catalog import get_session_catalog
+
+    catalog = get_session_catalog()
+    sessions = catalog.find_sessions(project="aops", since=since)
+    state = catalog.session_state(sessions[0], aca_data)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from lib.paths import get_session_catalog_path, get_summaries_dir, get_transcripts_dir
+from lib.transcript_parser import SessionInfo, SessionState
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    signature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dirs_by_root ON dirs (root);
+CREATE TABLE IF NOT EXISTS sessions (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    root TEXT NOT NULL,
+    source TEXT NOT NULL,
+    project TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    members TEXT,
+    state TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_by_dir ON sessions (dir);
+CREATE INDEX IF NOT EXISTS sessions_by_mtime ON sessions (root, mtime_ns);
+CREATE INDEX IF NOT EXISTS sessions_by_id ON sessions (session_id);
+CREATE TABLE IF NOT EXISTS artifacts (
+    dir TEXT NOT NULL,
+    token TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (dir, token, name)
+);
+"""
+
+# Upper bound for a token prefix range query
+_MAX_CHAR = "\U0010ffff"
+
+# (path, session_id, project, size, mtime_ns, members) of one session
+_Row = tuple[Path, str, str, int, int, list[str] | None]
+
+
+@dataclass(frozen=True)
+class _Source:
+    """How one session source is laid out on disk."""
+
+    name: str
+    children: Callable[[Path], list[Path]]  # directories under the root to watch
+    signature: Callable[[Path], str | None]  # None if the directory is gone
+    scan: Callable[[Path], list[_Row]]  # sessions in one watched directory
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _timestamp(mtime_ns: int) -> float:
+    """st_mtime as os.stat computes it from st_mtime_ns."""
+    seconds, nanoseconds = divmod(mtime_ns, 1_000_000_000)
+    return seconds + nanoseconds * 1e-9
+
+
+def _dir_signature(directory: Path) -> str | None:
+    mtime = _mtime_ns(directory)
+    return None if mtime is None else str(mtime)
+
+
+def _subdirs(path: Path) -> Iterator[Path]:
+    try:
+        with os.scandir(path) as scan:
+            for item in scan:
+                if item.is_dir():
+                    yield Path(item.path)
+    except OSError:
+        return
+
+
+def _file_stats(directory: Path, match: Callable[[str], bool]) -> list[tuple[Path, int, int]]:
+    """(path, size, mtime_ns) of the files in directory whose name matches."""
+    found = []
+    try:
+        with os.scandir(directory) as scan:
+            for item in scan:
+                if not match(item.name) or not item.is_file():
+                    continue
+                try:
+                    st = item.stat()
+                except OSError:
+                    continue
+                found.append((Path(item.path), st.st_size, st.st_mtime_ns))
+    except OSError:
+        pass
+    return found
+
+
+# --- Claude Code: ~/.claude/projects/{project}/{session}.jsonl ---
+
+
+def _claude_children(root: Path) -> list[Path]:
+    # Skip hook log directories (e.g., -home-nic-writing-aops-hooks)
+    return [d for d in _subdirs(root) if not d.name.endswith("-hooks")]
+
+
+def _is_claude_session_file(name: str) -> bool:
+    if not name.endswith(".jsonl") or name.startswith("agent-"):
+        return False
+    return not name.endswith("-hooks.jsonl")
+
+
+def _claude_scan(project_dir: Path) -> list[_Row]:
+    return [
+        (path, path.stem, project_dir.name, size, mtime_ns, None)
+        for path, size, mtime_ns in _file_stats(project_dir, _is_claude_session_file)
+    ]
+
+
+# --- Gemini: ~/.gemini/tmp/{hash}/chats/session-*.json ---
+
+
+def _gemini_signature(hash_dir: Path) -> str | None:
+    mtime = _mtime_ns(hash_dir)
+    if mtime is None:
+        return None
+    # New chats change chats/, a new chats/ changes the hash directory
+    return f"{mtime}/{_mtime_ns(hash_dir / 'chats') or 0}"
+
+
+def _gemini_scan(hash_dir: Path) -> list[_Row]:
+    rows: list[_Row] = []
+    chats = _file_stats(
+        hash_dir / "chats", lambda n: n.startswith("session-") and n.endswith(".json")
+    )
+    for path, size, mtime_ns in chats:
+        # session-2026-01-08T08-18-a5234d3e -> a5234d3e
+        session_id = path.stem
+        if session_id.startswith("session-") and "-" in session_id:
+            session_id = session_id.split("-")[-1]
+        rows.append((path, session_id, f"gemini-{hash_dir.name[:8]}", size, mtime_ns, None))
+    return rows
+
+
+# --- Antigravity: ~/.gemini/antigravity/brain/{uuid}/*.md ---
+
+
+def _antigravity_scan(brain_dir: Path) -> list[_Row]:
+    md_files = _file_stats(brain_dir, lambda n: n.endswith(".md"))
+    if not md_files:
+        return []
+    session_id = brain_dir.name[:8] if len(brain_dir.name) > 8 else brain_dir.name
+    return [
+        (
+            brain_dir,
+            session_id,
+            "antigravity",
+            sum(size for _, size, _ in md_files),
+            max(mtime_ns for _, _, mtime_ns in md_files),
+            sorted(path.name for path, _, _ in md_files),
+        )
+    ]
+
+
+_CLAUDE = _Source("claude", _claude_children, _dir_signature, _claude_scan)
+_GEMINI = _Source("gemini", lambda root: list(_subdirs(root)), _gemini_signature, _gemini_scan)
+_ANTIGRAVITY = _Source(
+    "antigravity", lambda root: list(_subdirs(root)), _dir_signature, _antigravity_scan
+)
+
+
+def _transcript_tokens(name: str) -> list[str]:
+    """Tokens a session prefix may start in get_session_state's *-*-{prefix}*-abridged.md."""
+    # glob's * never matches a leading dot
+    if name.startswith(".") or not name.endswith("-abridged.md"):
+        return []
+    return name[: -len("-abridged.md")].split("-")[2:]
+
+
+def _summary_tokens(name: str) -> list[str]:
+    """Dash-separated tokens of a summary name; *{prefix}*.json may match elsewhere too."""
+    if name.startswith(".") or not name.endswith(".json"):
+        return []
+    return name[: -len(".json")].split("-")
+
+
+class SessionCatalog:
+    """SQLite-backed index of session files, refreshed by directory mtime."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or get_session_catalog_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # --- Refresh ---
+
+    def _refresh(self, source: _Source, root: Path) -> None:
+        """Bring the sessions under root up to date, listing only changed directories."""
+        root_key = str(root)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            known = dict(
+                self._conn.execute("SELECT path, signature FROM dirs WHERE root = ?", (root_key,))
+            )
+            root_mtime = _mtime_ns(root)
+            if root_mtime is None:
+                children: list[str] = []
+            elif known.get(root_key) != str(root_mtime):
+                children = [str(d) for d in source.children(root)]
+                self._set_signature(root_key, root_key, str(root_mtime))
+            else:
+                children = [d for d in known if d != root_key]
+
+            for gone in set(known) - set(children) - {root_key}:
+                self._forget_dir(gone)
+            if root_mtime is None:
+                self._forget_dir(root_key)
+
+            for child in children:
+                signature = source.signature(Path(child))
+                if signature is None:
+                    self._forget_dir(child)
+                elif signature != known.get(child) or not self._restat(child):
+                    self._rescan(source, root_key, child)
+                    self._set_signature(child, root_key, signature)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _set_signature(self, path: str, root: str, signature: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, root, signature) VALUES (?, ?, ?)",
+            (path, root, signature),
+        )
+
+    def _forget_dir(self, path: str) -> None:
+        self._conn.execute("DELETE FROM dirs WHERE path = ?", (path,))
+        self._conn.execute("DELETE FROM sessions WHERE dir = ?", (path,))
+
+    def _rescan(self, source: _Source, root: str, directory: str) -> None:
+        rows = source.scan(Path(directory))
+        paths = {str(row[0]) for row in rows}
+        for (path,) in self._conn.execute(
+            "SELECT path FROM sessions WHERE dir = ?", (directory,)
+        ).fetchall():
+            if path not in paths:
+                self._conn.execute("DELETE FROM sessions WHERE path = ?", (path,))
+        for path, session_id, project, size, mtime_ns, members in rows:
+            self._conn.execute(
+                "INSERT INTO sessions (path, dir, root, source, project, session_id, size,"
+                " mtime_ns, members) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (path) DO UPDATE SET size = excluded.size,"
+                " mtime_ns = excluded.mtime_ns, members = excluded.members",
+                (
+                    str(path),
+                    directory,
+                    root,
+                    source.name,
+                    project,
+                    session_id,
+                    size,
+                    mtime_ns,
+                    json.dumps(members) if members is not None else None,
+                ),
+            )
+
+    def _restat(self, directory: str) -> bool:
+        """Update size and mtime of the known sessions in an unchanged directory.
+
+        Returns False if a session (or an Antigravity member file) is gone,
+        which needs a rescan.
+        """
+        rows = self._conn.execute(
+            "SELECT path, size, mtime_ns, members FROM sessions WHERE dir = ?", (directory,)
+        ).fetchall()
+        for path, size, mtime_ns, members in rows:
+            try:
+                if members is None:
+                    st = os.stat(path)
+                    new_size, new_mtime = st.st_size, st.st_mtime_ns
+                else:
+                    stats = [os.stat(os.path.join(path, name)) for name in json.loads(members)]
+                    new_size = sum(st.st_size for st in stats)
+                    new_mtime = max(st.st_mtime_ns for st in stats)
+            except (OSError, ValueError):
+                return False
+            if (new_size, new_mtime) != (size, mtime_ns):
+                self._conn.execute(
+                    "UPDATE sessions SET size = ?, mtime_ns = ? WHERE path = ?",
+                    (new_size, new_mtime, path),
+                )
+        return True
+
+    def _refresh_artifacts(self, directory: Path, tokens: Callable[[str], list[str]]) -> None:
+        """Re-list a transcripts or summaries directory if its mtime changed."""
+        key = str(directory)
+        mtime = _mtime_ns(directory)
+        signature = str(mtime) if mtime is not None else None
+        row = self._conn.execute("SELECT signature FROM dirs WHERE path = ?", (key,)).fetchone()
+        if (row[0] if row else None) == signature:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DELETE FROM artifacts WHERE dir = ?", (key,))
+            self._conn.execute("DELETE FROM dirs WHERE path = ?", (key,))
+            if signature is not None:
+                try:
+                    names = os.listdir(directory)
+                except OSError:
+                    names = []
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO artifacts (dir, token, name) VALUES (?, ?, ?)",
+                    [(key, token, name) for name in names for token in tokens(name)],
+                )
+                self._set_signature(key, key, signature)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    # --- Queries ---
+
+    def find_sessions(
+        self,
+        project: str | None = None,
+        since: datetime | None = None,
+        claude_projects_dir: Path | None = None,
+        include_gemini: bool = True,
+        include_antigravity: bool = True,
+    ) -> list[SessionInfo]:
+        """Sessions matching the filters, newest first (see session_reader.find_sessions)."""
+        roots = [(_CLAUDE, claude_projects_dir or Path.home() / ".claude" / "projects")]
+        if include_gemini:
+            roots.append((_GEMINI, Path.home() / ".gemini" / "tmp"))
+        if include_antigravity:
+            roots.append((_ANTIGRAVITY, Path.home() / ".gemini" / "antigravity" / "brain"))
+        for source, root in roots:
+            self._refresh(source, root)
+
+        sql = (
+            "SELECT path, project, session_id, mtime_ns, source FROM sessions"
+            f" WHERE root IN ({', '.join('?' * len(roots))})"
+        )
+        params: list[object] = [str(root) for _, root in roots]
+        if project:
+            sql += " AND instr(lower(project), ?) > 0"
+            params.append(project.lower())
+        if since is not None:
+            sql += " AND mtime_ns >= ?"
+            params.append(int(since.timestamp() * 1e9))
+        sql += " ORDER BY mtime_ns DESC"
+
+        return [
+            SessionInfo(
+                path=Path(path),
+                project=project_name,
+                session_id=session_id,
+                last_modified=datetime.fromtimestamp(_timestamp(mtime_ns), tz=UTC),
+                source=source,
+            )
+            for path, project_name, session_id, mtime_ns, source in self._conn.execute(sql, params)
+        ]
+
+    def _first_artifact(self, directory: Path, prefix: str) -> Path | None:
+        row = self._conn.execute(
+            "SELECT name FROM artifacts WHERE dir = ? AND token >= ? AND token < ?"
+            " ORDER BY name LIMIT 1",
+            (str(directory), prefix, prefix + _MAX_CHAR),
+        ).fetchone()
+        return directory / row[0] if row else None
+
+    def _has_summary(self, directory: Path, prefix: str) -> bool:
+        """Whether any *{prefix}*.json summary exists in directory.
+
+        The token index answers the usual YYYYMMDD-HH-project-{prefix}-slug
+        names; other names (prefix inside a token) need a substring scan.
+        """
+        if self._first_artifact(directory, prefix):
+            return True
+        row = self._conn.execute(
+            "SELECT 1 FROM artifacts WHERE dir = ?"
+            " AND instr(substr(name, 1, length(name) - 5), ?) > 0 LIMIT 1",
+            (str(directory), prefix),
+        ).fetchone()
+        return row is not None
+
+    def session_state(self, session: SessionInfo, aca_data: Path) -> SessionState:
+        """Processing state of a session (see session_reader.get_session_state).
+
+        The result is also stored in the session's catalog row.
+        """
+        session_id = session.session_id
+        session_prefix = session_id[:8] if len(session_id) >= 8 else session_id
+        subdir = "gemini" if session.source == "gemini" else "claude"
+        transcript_dirs = [get_transcripts_dir(), aca_data / "sessions" / subdir]
+        summary_dirs = [get_summaries_dir(), aca_data / "sessions" / "summaries"]
+        for directory in transcript_dirs:
+            self._refresh_artifacts(directory, _transcript_tokens)
+        for directory in summary_dirs:
+            self._refresh_artifacts(directory, _summary_tokens)
+
+        state = SessionState.PROCESSED
+        transcript_path = next(
+            (p for d in transcript_dirs if (p := self._first_artifact(d, session_prefix))), None
+        )
+        transcript_mtime = _mtime_ns(transcript_path) if transcript_path else None
+        # Missing transcript or session updated since last transcript
+        if transcript_mtime is None or session.path.stat().st_mtime_ns > transcript_mtime:
+            state = SessionState.PENDING_TRANSCRIPT
+        elif not any(self._has_summary(d, session_prefix) for d in summary_dirs):
+            state = SessionState.PENDING_MINING
+
+        self._conn.execute(
+            "UPDATE sessions SET state = ? WHERE path = ?", (state.name, str(session.path))
+        )
+        return state
+
+
+_catalogs: dict[Path, SessionCatalog] = {}
+
+
+def get_session_catalog() -> SessionCatalog:
+    """Process-wide catalog for the configured database path."""
+    path = get_session_catalog_path()
+    catalog = _catalogs.get(path)
+    if catalog is None:
+        catalog = _catalogs[path] = SessionCatalog(path)
+    return catalog
@@ -9,6 +9,7 @@ where HH is the 24-hour local time when the session was created.
 
 import hashlib
 import os
+import stat
 from datetime import datetime
 from pathlib import Path
 
@@ -410,11 +411,70 @@ def get_all_gate_file_paths(
     return {gate: get_gate_file_path(gate, session_id, input_data, date) for gate in GATE_NAMES}
 
 
+def get_transcript_cursor_path(session_id: str, input_data: dict | None = None) -> Path:
+    """Get path for the session's incremental transcript cursor.
+
+    Lives in a cursors/ subdirectory of the session status directory, next to
+    the SessionState file but out of reach of the *-<hash>.json state globs.
+    See lib/session_reader.py (extract_router_context).
+    """
+    cursor_dir = get_session_status_dir(session_id, input_data) / "cursors"
+    cursor_dir.mkdir(parents=True, exist_ok=True)
+    return cursor_dir / f"{get_session_short_hash(session_id)}-transcript.json"
+
+
 def get_pid_session_map_path() -> Path:
     """Get path for PID -> SessionID mapping file.
 
     Used by router to bootstrap session ID from process ID when not provided.
     Stores simple JSON: {"session_id": "..."}
     """
+    # The router daemon serves many clients, so it receives the hook
+    # client's parent PID explicitly instead of using its own.
+    ppid = os.environ.get("AOPS_HOOK_PPID") or os.getppid()
     # PID session maps are ephemeral runtime files, always use /tmp
-    return Path("/tmp") / f"session-{os.getppid()}.json"
+    return Path("/tmp") / f"session-{ppid}.json"
+
+
+def get_router_runtime_dir() -> Path:
+    """Get the private runtime directory for the router daemon's socket and lock.
+
+    $XDG_RUNTIME_DIR/aops when XDG_RUNTIME_DIR is set, otherwise
+    /tmp/aops-<uid>. The directory is created with mode 0700 and checked
+    with lstat, so another local user can neither plant a socket the hook
+    client would talk to nor squat the path.
+
+    Raises:
+        RuntimeError: If the directory is not a real directory owned by this
+            user with no group or other access (P#8: fail-fast)
+    """
+    uid = os.getuid()
+    if runtime_root := os.environ.get("XDG_RUNTIME_DIR"):
+        runtime_dir = Path(runtime_root) / "aops"
+    else:
+        runtime_dir = Path("/tmp") / f"aops-{uid}"
+    try:
+        runtime_dir.mkdir(mode=0o700, exist_ok=True)
+        st = runtime_dir.lstat()
+    except OSError as e:
+        raise RuntimeError(f"Cannot create router runtime dir {runtime_dir}: {e}") from e
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != uid or st.st_mode & 0o077:
+        raise RuntimeError(
+            f"Router runtime dir {runtime_dir} is not a private directory owned by uid {uid}"
+        )
+    return runtime_dir
+
+
+def get_router_socket_path() -> Path:
+    """Get the Unix socket path for the persistent hook router daemon.
+
+    One daemon serves every session that runs from the same plugin root, so
+    the socket is keyed on the plugin directory (an upgraded plugin gets a
+    fresh daemon). It lives in the private get_router_runtime_dir();
+    AOPS_ROUTER_SOCKET overrides the location.
+    """
+    if env_path := os.environ.get("AOPS_ROUTER_SOCKET"):
+        return Path(env_path)
+    plugin_root = Path(__file__).resolve().parent.parent
+    root_hash = hashlib.sha256(str(plugin_root).encode()).hexdigest()[:8]
+    return get_router_runtime_dir() / f"router-{root_hash}.sock"
@@ -15,25 +15,41 @@ Used by:
 from __future__ import annotations
 
 import glob
+import hashlib
+import json
+import logging
+import os
 import re
+import sqlite3
+import tempfile
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from lib.paths import get_summaries_dir, get_transcripts_dir
+from lib.session_catalog import get_session_catalog
 from lib.transcript_parser import (
+    ConversationTurn,
+    Entry,
     SessionInfo,
     SessionProcessor,
     SessionState,
     TodoWriteState,
+    _decode_jsonl_line,
     _summarize_tool_input,
 )
 
+logger = logging.getLogger(__name__)
+
 # Configuration constants for router context extraction
 _MAX_TURNS = 5
 _SKILL_LOOKBACK = 10
 _PROMPT_TRUNCATE = 400  # Increased from 100 to preserve more context (validated 2026-01-11)
 _MAX_TOOL_CALLS = 10  # Max recent tool calls to include in context
+_MAX_AGENT_RESPONSES = 3  # Recent agent responses to include in context
+_RESPONSE_TEXT_LIMIT = 2000  # Longest agent response shown (most recent, short prompt)
+_CURSOR_VERSION = 1  # Bump when the transcript cursor format changes
+_CURSOR_HEAD_BYTES = 4096  # Leading transcript bytes hashed to detect a rewritten file
 
 
 def parse_todowrite_state(entries: list[Any]) -> TodoWriteState | None:
@@ -72,25 +88,34 @@ def parse_todowrite_state(entries: list[Any]) -> TodoWriteState | None:
                     tool_input = block.get("input", {})
                     todos = tool_input.get("todos", [])
                     if todos:
-                        counts = {"pending": 0, "in_progress": 0, "completed": 0}
-                        in_progress_task = None
-                        for todo in todos:
-                            status = todo.get("status", "pending")
-                            if status in counts:
-                                counts[status] += 1
-                            if status == "in_progress" and not in_progress_task:
-                                in_progress_task = todo.get("content", "")
-
-                        return TodoWriteState(
-                            todos=todos,
-                            counts=counts,
-                            in_progress_task=in_progress_task,
-                        )
+                        return _todowrite_state(todos)
 
     return None
 
 
-def extract_router_context(transcript_path: Path, max_turns: int = _MAX_TURNS) -> str:
+def _todowrite_state(todos: list[dict[str, Any]]) -> TodoWriteState:
+    """Build TodoWriteState (counts and in_progress task) from a TodoWrite list."""
+    counts = {"pending": 0, "in_progress": 0, "completed": 0}
+    in_progress_task = None
+    for todo in todos:
+        status = todo.get("status", "pending")
+        if status in counts:
+            counts[status] += 1
+        if status == "in_progress" and not in_progress_task:
+            in_progress_task = todo.get("content", "")
+
+    return TodoWriteState(
+        todos=todos,
+        counts=counts,
+        in_progress_task=in_progress_task,
+    )
+
+
+def extract_router_context(
+    transcript_path: Path,
+    max_turns: int = _MAX_TURNS,
+    cursor_path: Path | None = None,
+) -> str:
     """Extract compact context for intent router.
 
     Parses the JSONL transcript and extracts:
@@ -98,9 +123,15 @@ def extract_router_context(transcript_path: Path, max_turns: int = _MAX_TURNS) -
     - Most recent Skill invocation
     - TodoWrite task status counts
 
+    With cursor_path (see session_paths.get_transcript_cursor_path), a Claude
+    JSONL transcript is read incrementally: only lines appended since the
+    previous call (plus the still-open last turn) are parsed, and a rolling
+    summary of earlier turns is kept in the cursor file.
+
     Args:
         transcript_path: Path to session JSONL file
         max_turns: Maximum number of recent prompts to include
+        cursor_path: Optional per-session cursor file for incremental reads
 
     Returns:
         Formatted markdown context or empty string if file doesn't exist/is empty
@@ -110,6 +141,13 @@ def extract_router_context(transcript_path: Path, max_turns: int = _MAX_TURNS) -
     """
     if not transcript_path.exists():
         return ""
+    if (
+        cursor_path is not None
+        and transcript_path.is_file()
+        and transcript_path.suffix == ".jsonl"
+        and not transcript_path.name.endswith("-hooks.jsonl")
+    ):
+        return _extract_router_context_incremental(transcript_path, max_turns, cursor_path)
     return _extract_router_context_impl(transcript_path, max_turns)
 
 
@@ -236,119 +274,119 @@ def _extract_and_expand_prompts(turns: list, max_turns: int) -> list[str]:
     return prompts[-max_turns:] if prompts else []
 
 
-def _extract_router_context_impl(transcript_path: Path, max_turns: int) -> str:
-    """Implementation of router context extraction."""
-    # Use SessionProcessor to parse and group turns (DRY compliant)
-    # Skip agents and hooks for speed - we only need main conversation
-    processor = SessionProcessor()
-    _, entries, _ = processor.parse_session_file(
-        transcript_path, load_agents=False, load_hooks=False
-    )
-
-    if not entries:
-        return ""
-
-    # Group into turns to handle command expansion properly
-    turns = processor.group_entries_into_turns(entries, full_mode=True)
-
-    # Extract user prompts, expanding commands
-    recent_prompts = _extract_and_expand_prompts(turns, max_turns)
+def _new_router_digest() -> dict[str, Any]:
+    """Empty rolling summary of conversation turns for router context."""
+    return {"prompts": [], "responses": [], "tools": [], "skill": None}
 
-    # Find most recent Skill invocation
-    recent_skill: str | None = None
 
-    # Find active task (TodoWrite)
-    todowrite_state = parse_todowrite_state(entries)
-    todo_counts = todowrite_state.counts if todowrite_state else None
-    in_progress_task = todowrite_state.in_progress_task if todowrite_state else None
+def _fold_turns_into_digest(turns: list, digest: dict[str, Any], max_prompts: int) -> None:
+    """Fold turns (chronological) into a router digest, in place.
 
-    # Extract recent tool calls
-    recent_tools: list[str] = []
-    agent_responses: list[str] = []
-    agent_questions: list[str] = []  # Track questions separately for clarity
+    The digest keeps only what _format_router_context can show: the last
+    max_prompts prompts, the last _MAX_AGENT_RESPONSES agent responses (text
+    capped, plus their questions), the last _MAX_TOOL_CALLS tool calls and the
+    most recent skill. Folding turns one batch at a time gives the same digest
+    as folding them all at once.
+    """
+    for turn in turns:
+        digest["prompts"].extend(_extract_and_expand_prompts([turn], 1))
 
-    # Iterate reversed for recent tools/skills
-    # We iterate turns reversed
-    for turn in reversed(turns):
         assistant_sequence = (
             turn.get("assistant_sequence") if isinstance(turn, dict) else turn.assistant_sequence
         )
         if not assistant_sequence:
             continue
 
-        # Collect response text for context (limit to 3 turns)
-        # IMPORTANT: We iterate reversed, so first responses found are MOST RECENT
-        if len(agent_responses) < 3:
-            # Join text parts
-            texts = [item["content"] for item in assistant_sequence if item.get("type") == "text"]
-            if texts:
-                full_text = " ".join(texts)
-                # Extract questions from this agent response (especially important for most recent)
-                # This helps hydrator understand short user responses like "yes" or "all"
-                questions = _extract_questions_from_text(full_text)
-                if questions:
-                    # For the most recent response, prioritize questions
-                    if len(agent_responses) == 0:
-                        # Most recent: add all unique questions found
-                        for q in questions:
-                            if q not in agent_questions:
-                                agent_questions.append(q)
-                    else:
-                        # Older responses: add just first question if any
-                        if questions[0] not in agent_questions:
-                            agent_questions.append(questions[0])
-
-                # Truncate - but preserve more for the most recent (first found)
-                # This ensures short user prompts like "yes" can see the question
-                #
-                # When user prompt is short (≤10 chars), it's likely a confirmation
-                # like "yes", "ok", "all", etc. Preserve much more context (2000 chars)
-                # so the hydrator can see what question the user is responding to.
-                current_prompt = recent_prompts[-1] if recent_prompts else ""
-                is_short_response = len(current_prompt.strip()) <= 10
-
-                if is_short_response and len(agent_responses) == 0:
-                    max_len = 2000  # Preserve full context for short responses
-                elif len(agent_responses) == 0:
-                    max_len = 500
-                else:
-                    max_len = 300
-                if len(full_text) > max_len:
-                    full_text = full_text[:max_len] + "..."
-                agent_responses.append(full_text)
-
-        # Scan for tools
-        for item in reversed(assistant_sequence):
-            if item.get("type") == "tool":
-                tool_call = item.get("content", "")
-
-                # Extract tool name from content "Name(args)" or similar
-                # group_entries_into_turns formats it as "Name(input)" or just "Name"
-                # But it provides 'tool_name' and 'tool_input' in the item dict too!
-                tool_name = item.get("tool_name", "")
-                tool_input = item.get("tool_input", {})
+        texts = [item["content"] for item in assistant_sequence if item.get("type") == "text"]
+        if texts:
+            full_text = " ".join(texts)
+            digest["responses"].append(
+                {
+                    # One char over the limit so truncation still adds "..."
+                    "text": full_text[: _RESPONSE_TEXT_LIMIT + 1],
+                    "questions": _extract_questions_from_text(full_text),
+                }
+            )
 
-                # If tool_name is missing from item (legacy parser might not add it?), try to parse content
-                if not tool_name and "(" in tool_call:
-                    tool_name = tool_call.split("(")[0]
+        for item in assistant_sequence:
+            if item.get("type") != "tool":
+                continue
+            tool_call = item.get("content", "")
 
-                if tool_name == "Skill":
-                    if not recent_skill:
-                        recent_skill = tool_input.get("skill")
-                    continue
+            # group_entries_into_turns provides tool_name; fall back to "Name(args)"
+            tool_name = item.get("tool_name", "")
+            tool_input = item.get("tool_input", {})
+            if not tool_name and "(" in tool_call:
+                tool_name = tool_call.split("(")[0]
 
-                if tool_name == "TodoWrite":
-                    continue
+            if tool_name == "Skill":
+                if tool_input.get("skill"):
+                    digest["skill"] = tool_input.get("skill")
+                continue
 
-                if len(recent_tools) < _MAX_TOOL_CALLS:
-                    recent_tools.append(tool_call)  # Use the pre-formatted content
+            if tool_name == "TodoWrite":
+                continue
+
+            digest["tools"].append(tool_call)
+
+    del digest["prompts"][:-max_prompts]
+    del digest["responses"][:-_MAX_AGENT_RESPONSES]
+    del digest["tools"][:-_MAX_TOOL_CALLS]
+
+
+def _format_router_context(
+    digest: dict[str, Any], todowrite_state: TodoWriteState | None, max_turns: int
+) -> str:
+    """Render router context markdown from a digest and the current TodoWrite state."""
+    recent_prompts = digest["prompts"][-max_turns:]
+    recent_skill: str | None = digest["skill"]
+    todo_counts = todowrite_state.counts if todowrite_state else None
+    in_progress_task = todowrite_state.in_progress_task if todowrite_state else None
+    recent_tools: list[str] = list(digest["tools"])
+
+    agent_responses: list[str] = []
+    agent_questions: list[str] = []  # Track questions separately for clarity
+
+    # IMPORTANT: We iterate reversed, so first responses found are MOST RECENT
+    for response in reversed(digest["responses"]):
+        # Questions help hydrator understand short user responses like "yes" or "all"
+        questions = response["questions"]
+        if questions:
+            # For the most recent response, prioritize questions
+            if len(agent_responses) == 0:
+                # Most recent: add all unique questions found
+                for q in questions:
+                    if q not in agent_questions:
+                        agent_questions.append(q)
+            else:
+                # Older responses: add just first question if any
+                if questions[0] not in agent_questions:
+                    agent_questions.append(questions[0])
+
+        # Truncate - but preserve more for the most recent (first found)
+        # This ensures short user prompts like "yes" can see the question
+        #
+        # When user prompt is short (≤10 chars), it's likely a confirmation
+        # like "yes", "ok", "all", etc. Preserve much more context (2000 chars)
+        # so the hydrator can see what question the user is responding to.
+        current_prompt = recent_prompts[-1] if recent_prompts else ""
+        is_short_response = len(current_prompt.strip()) <= 10
+
+        if is_short_response and len(agent_responses) == 0:
+            max_len = _RESPONSE_TEXT_LIMIT  # Preserve full context for short responses
+        elif len(agent_responses) == 0:
+            max_len = 500
+        else:
+            max_len = 300
+        full_text = response["text"]
+        if len(full_text) > max_len:
+            full_text = full_text[:max_len] + "..."
+        agent_responses.append(full_text)
 
     # Reverse back to chronological
     agent_responses.reverse()
     agent_questions.reverse()
-    recent_tools.reverse()
 
-    # Format output (same as before)
     if (
         not recent_prompts
         and not recent_skill
@@ -408,6 +446,169 @@ def _extract_router_context_impl(transcript_path: Path, max_turns: int) -> str:
     return "\n".join(lines)
 
 
+def _extract_router_context_impl(transcript_path: Path, max_turns: int) -> str:
+    """Implementation of router context extraction (full parse)."""
+    # Use SessionProcessor to parse and group turns (DRY compliant)
+    # Skip agents and hooks for speed - we only need main conversation
+    processor = SessionProcessor()
+    _, entries, _ = processor.parse_session_file(
+        transcript_path, load_agents=False, load_hooks=False
+    )
+
+    if not entries:
+        return ""
+
+    # Group into turns to handle command expansion properly
+    turns = processor.group_entries_into_turns(entries, full_mode=True)
+
+    digest = _new_router_digest()
+    _fold_turns_into_digest(turns, digest, max_turns)
+    return _format_router_context(digest, parse_todowrite_state(entries), max_turns)
+
+
+def _new_router_cursor(transcript_path: Path, inode: int, max_turns: int) -> dict[str, Any]:
+    return {
+        "version": _CURSOR_VERSION,
+        "transcript": str(transcript_path),
+        "inode": inode,
+        "max_prompts": max(max_turns, _MAX_TURNS),
+        "offset": 0,
+        "window_start": 0,
+        "digest": _new_router_digest(),
+        "todos": None,
+    }
+
+
+def _load_router_cursor(
+    cursor_path: Path, transcript_path: Path, f: BinaryIO, max_turns: int
+) -> dict[str, Any]:
+    """Load the cursor for transcript_path, or a fresh one if it no longer applies.
+
+    A cursor is discarded when the transcript was replaced or truncated, or
+    when the caller wants more prompts than the digest keeps.
+    """
+    stat = os.fstat(f.fileno())
+    try:
+        cursor = json.loads(cursor_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return _new_router_cursor(transcript_path, stat.st_ino, max_turns)
+
+    valid = (
+        isinstance(cursor, dict)
+        and cursor.get("version") == _CURSOR_VERSION
+        and cursor.get("transcript") == str(transcript_path)
+        and cursor.get("inode") == stat.st_ino
+        and cursor.get("max_prompts", 0) >= max_turns
+        and 0 <= cursor.get("window_start", -1) <= cursor.get("offset", -1) <= stat.st_size
+    )
+    if valid and cursor["offset"] > 0:
+        # Same leading bytes (not a rewritten file) and the byte before the
+        # offset still ends a line
+        valid = cursor.get("head") == _transcript_head(f, cursor["offset"])
+        f.seek(cursor["offset"] - 1)
+        valid = valid and f.read(1) == b"\n"
+    if not valid:
+        return _new_router_cursor(transcript_path, stat.st_ino, max_turns)
+    return cursor
+
+
+def _transcript_head(f: BinaryIO, offset: int) -> str:
+    """Hash of the transcript's first bytes (up to _CURSOR_HEAD_BYTES, within offset)."""
+    f.seek(0)
+    return hashlib.sha256(f.read(min(offset, _CURSOR_HEAD_BYTES))).hexdigest()[:16]
+
+
+def _save_router_cursor(cursor_path: Path, cursor: dict[str, Any]) -> None:
+    """Atomically write the cursor. Failures only cost a re-parse next time."""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cursor_path.parent, prefix=".cursor-", suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp:
+            json.dump(cursor, tmp, separators=(",", ":"))
+        os.replace(tmp_path, cursor_path)
+    except OSError:
+        pass
+
+
+def _user_turns(processor: SessionProcessor, entries: list[Entry]) -> list[ConversationTurn]:
+    """Conversation turns only (hook context and summary turns carry no router context)."""
+    return [
+        turn
+        for turn in processor.group_entries_into_turns(entries, full_mode=True)
+        if isinstance(turn, ConversationTurn)
+    ]
+
+
+def _extract_router_context_incremental(
+    transcript_path: Path, max_turns: int, cursor_path: Path
+) -> str:
+    """Router context from the lines appended since the last call.
+
+    The cursor records:
+    - offset: bytes of the transcript already consumed (always at a line end)
+    - window_start: where the last, still-open turn begins; it is re-read
+      each call because later lines can still add to it
+    - digest: rolling summary of every turn before window_start
+    - todos: the latest TodoWrite list seen before offset
+
+    Each call reads from window_start, folds the turns that have since been
+    closed into the digest, advances the cursor and renders the digest plus
+    the open turn. The result matches _extract_router_context_impl.
+    """
+    processor = SessionProcessor()
+    with open(transcript_path, "rb") as f:
+        cursor = _load_router_cursor(cursor_path, transcript_path, f, max_turns)
+        f.seek(cursor["window_start"])
+        data = f.read()
+        # A trailing line without a newline may still be being written: use
+        # it for this answer but leave it unconsumed.
+        complete_len = data.rfind(b"\n") + 1
+        head = _transcript_head(f, cursor["window_start"] + complete_len)
+    tail = _decode_jsonl_line(data[complete_len:])
+
+    window: list[tuple[int, Entry]] = []
+    position = cursor["window_start"]
+    for line in data[:complete_len].splitlines(keepends=True):
+        record = _decode_jsonl_line(line)
+        if record is not None:
+            window.append((position, Entry.from_dict(record)))
+        position += len(line)
+
+    new_todos = parse_todowrite_state([e for pos, e in window if pos >= cursor["offset"]])
+    if new_todos is not None:
+        cursor["todos"] = new_todos.todos
+
+    # Turn boundaries in the window (byte offsets of turn-starting lines)
+    main = [(pos, e) for pos, e in window if not e.is_sidechain]
+    main_entries = [e for _, e in main]
+    turn_starts = [
+        pos for i, (pos, _) in enumerate(main) if processor.turn_start_content(main_entries, i)
+    ]
+
+    turns = _user_turns(processor, [e for _, e in window])
+    digest = cursor["digest"]
+    if turn_starts:
+        # Every turn but the last is closed: no later line can change it
+        _fold_turns_into_digest(turns[:-1], digest, cursor["max_prompts"])
+        cursor["window_start"] = turn_starts[-1]
+        turns = turns[-1:]
+    cursor["offset"] = position
+    cursor["head"] = head
+    _save_router_cursor(cursor_path, cursor)
+
+    todos = cursor["todos"]
+    if tail is not None:
+        tail_entry = Entry.from_dict(tail)
+        open_entries = [e for pos, e in window if pos >= cursor["window_start"]]
+        turns = _user_turns(processor, [*open_entries, tail_entry])
+        tail_todos = parse_todowrite_state([tail_entry])
+        if tail_todos is not None:
+            todos = tail_todos.todos
+
+    view = {key: list(value) if isinstance(value, list) else value for key, value in digest.items()}
+    _fold_turns_into_digest(turns, view, cursor["max_prompts"])
+    return _format_router_context(view, _todowrite_state(todos) if todos else None, max_turns)
+
+
 def extract_gate_context(
     transcript_path: Path,
     include: set[str],
@@ -1194,6 +1395,10 @@ def find_sessions(
     """
     Find all Claude Code, Gemini, and optionally Antigravity sessions.
 
+    Answered from the persistent session catalog (lib/session_catalog.py),
+    which only re-lists directories whose mtime changed. Falls back to a
+    full filesystem scan if the catalog is unavailable.
+
     Args:
         project: Filter to specific project (partial match)
         since: Only sessions modified after this time
@@ -1204,6 +1409,27 @@ def find_sessions(
     Returns:
         List of SessionInfo, sorted by last_modified descending (newest first)
     """
+    try:
+        return get_session_catalog().find_sessions(
+            project=project,
+            since=since,
+            claude_projects_dir=claude_projects_dir,
+            include_gemini=include_gemini,
+            include_antigravity=include_antigravity,
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"Session catalog unavailable, scanning: {e}")
+    return _scan_sessions(project, since, claude_projects_dir, include_gemini, include_antigravity)
+
+
+def _scan_sessions(
+    project: str | None,
+    since: datetime | None,
+    claude_projects_dir: Path | None,
+    include_gemini: bool,
+    include_antigravity: bool,
+) -> list[SessionInfo]:
+    """find_sessions by walking the session directories (no catalog)."""
     sessions = []
 
     # 1. Find Claude Code sessions
@@ -1342,8 +1568,18 @@ def get_session_state(session: SessionInfo, aca_data: Path) -> SessionState:
     """Determine the current processing state of a session.
 
     Authoritative logic for idempotency and re-processing requirements.
+    Transcripts and summaries are looked up in the session catalog's index
+    of those directories; without the catalog they are globbed.
     """
+    try:
+        return get_session_catalog().session_state(session, aca_data)
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"Session catalog unavailable, globbing: {e}")
+    return _probe_session_state(session, aca_data)
+
 
+def _probe_session_state(session: SessionInfo, aca_data: Path) -> SessionState:
+    """get_session_state by globbing the transcripts and summaries directories."""
     session_id = session.session_id
     session_prefix = session_id[:8] if len(session_id) >= 8 else session_id
 
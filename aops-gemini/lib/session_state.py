@@ -25,10 +25,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
 
 from lib.gate_types import GateState, GateStatus
 from lib.session_paths import (
+    get_pid_session_map_path,
     get_session_file_path,
     get_session_short_hash,
     get_session_status_dir,
@@ -37,6 +38,9 @@ from lib.session_paths import (
 # Cache: computed once per process
 _PLUGIN_VERSION: str | None = None
 
+# Cache: session_id -> state file, so long-lived processes locate it once
+_STATE_FILE_CACHE: dict[str, Path] = {}
+
 
 def _get_plugin_version() -> str:
     """Detect the plugin version at runtime.
@@ -91,6 +95,102 @@ def _get_plugin_version() -> str:
     return _PLUGIN_VERSION
 
 
+def _read_state_pointer(session_id: str) -> Path | None:
+    """Return the state file recorded in the PID session map for this session."""
+    try:
+        data = json.loads(get_pid_session_map_path().read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    pointer = data.get("state_file") if isinstance(data, dict) else None
+    if isinstance(pointer, dict) and pointer.get("session_id") == session_id:
+        return Path(pointer["path"])
+    return None
+
+
+def _write_state_pointer(session_id: str, path: Path) -> None:
+    """Record the state file in the PID session map (best effort, atomic)."""
+    map_path = get_pid_session_map_path()
+    try:
+        data = json.loads(map_path.read_text()) if map_path.exists() else {}
+        if not isinstance(data, dict):
+            data = {}
+    except (OSError, json.JSONDecodeError):
+        data = {}
+    data["state_file"] = {"session_id": session_id, "path": str(path)}
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=str(map_path.parent), text=True)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            Path(temp_path).rename(map_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        print(f"WARNING: Failed to record session state pointer: {e}", file=sys.stderr)
+
+
+def _remember_state_file(session_id: str, path: Path) -> None:
+    """Cache the state file location in-process and in the PID session map."""
+    if _STATE_FILE_CACHE.get(session_id) == path:
+        return
+    _STATE_FILE_CACHE[session_id] = path
+    if _read_state_pointer(session_id) != path:
+        _write_state_pointer(session_id, path)
+
+
+def _glob_state_file(session_id: str) -> Path | None:
+    """Find the newest state file for session_id dated today or yesterday."""
+    now = datetime.now()
+    today = now.strftime("%Y%m%d")
+    yesterday = (now - timedelta(days=1)).strftime("%Y%m%d")
+
+    short_hash = get_session_short_hash(session_id)
+    status_dir = get_session_status_dir(session_id)
+
+    for date_compact in [today, yesterday]:
+        # New format: YYYYMMDD-HH-hash.json (try all hours)
+        new_pattern = f"{date_compact}-??-{short_hash}.json"
+        # Legacy format: YYYYMMDD-hash.json
+        legacy_pattern = f"{date_compact}-{short_hash}.json"
+
+        for pattern in [new_pattern, legacy_pattern]:
+            matches = list(status_dir.glob(pattern))
+            if matches:
+                # Use the most recent file if multiple matches
+                return max(matches, key=lambda p: p.stat().st_mtime)
+    return None
+
+
+def locate_state_file(session_id: str) -> tuple[Path | None, bool]:
+    """Find the state file for a session without scanning when possible.
+
+    Lookup order (first hit wins):
+    1. In-process cache (router daemon, repeated loads in one hook)
+    2. AOPS_SESSION_STATE_PATH, persisted by session_env_setup at SessionStart
+    3. Pointer stored in the PID session map by a previous save()
+    4. Glob of the status directory (today/yesterday, new and legacy names)
+
+    Returns:
+        (path, is_canonical): is_canonical is True when the path came from a
+        previous save (1-3) and is therefore where save() writes.
+    """
+    cached = _STATE_FILE_CACHE.get(session_id)
+    if cached is not None and cached.exists():
+        return cached, True
+
+    short_hash = get_session_short_hash(session_id)
+    env_path = os.environ.get("AOPS_SESSION_STATE_PATH")
+    if env_path and env_path.endswith(f"-{short_hash}.json") and Path(env_path).exists():
+        return Path(env_path), True
+
+    pointer = _read_state_pointer(session_id)
+    if pointer is not None and pointer.exists():
+        return pointer, True
+
+    return _glob_state_file(session_id), False
+
+
 class MainAgentState(BaseModel):
     """Main agent tracking."""
 
@@ -133,6 +233,21 @@ class SessionState(BaseModel):
     # Session insights (written at close)
     insights: dict[str, Any] | None = None
 
+    # Persistence bookkeeping (not serialized)
+    _file_path: Path | None = PrivateAttr(default=None)
+    _persisted_json: str | None = PrivateAttr(default=None)
+
+    @property
+    def file_path(self) -> Path:
+        """State file this session saves to (resolved once per instance)."""
+        if self._file_path is None:
+            self._file_path = get_session_file_path(self.session_id, self.date)
+        return self._file_path
+
+    def is_dirty(self) -> bool:
+        """Whether the state differs from what was last loaded or saved."""
+        return self.model_dump_json() != self._persisted_json
+
     @classmethod
     def create(cls, session_id: str) -> SessionState:
         """Create new session state."""
@@ -174,57 +289,60 @@ class SessionState(BaseModel):
     @classmethod
     def load(cls, session_id: str, retries: int = 3) -> SessionState:
         """Load session state from disk."""
-        now = datetime.now()
-        today = now.strftime("%Y%m%d")
-        yesterday = (now - timedelta(days=1)).strftime("%Y%m%d")
-
-        short_hash = get_session_short_hash(session_id)
-        status_dir = get_session_status_dir(session_id)
-
-        # Search for files matching this session_id on today or yesterday
-        for date_compact in [today, yesterday]:
-            # New format: YYYYMMDD-HH-hash.json (try all hours)
-            new_pattern = f"{date_compact}-??-{short_hash}.json"
-            # Legacy format: YYYYMMDD-hash.json
-            legacy_pattern = f"{date_compact}-{short_hash}.json"
-
-            for pattern in [new_pattern, legacy_pattern]:
-                matches = list(status_dir.glob(pattern))
-                if matches:
-                    # Use the most recent file if multiple matches
-                    path = max(matches, key=lambda p: p.stat().st_mtime)
-                    for attempt in range(retries):
-                        try:
-                            text = path.read_text()
-                            data = json.loads(text)
-                            # Convert dict to Pydantic
-                            return cls.model_validate(data)
-                        except json.JSONDecodeError as e:
-                            if attempt < retries - 1:
-                                time.sleep(0.01)
-                                continue
-                            print(f"WARNING: SessionState JSON decode error: {e}", file=sys.stderr)
-                            # Return new state on failure to avoid blocking
-                            return cls.create(session_id)
-                        except ValidationError as e:
-                            print(f"WARNING: SessionState validation error: {e}", file=sys.stderr)
-                            # Schema mismatch -> Create new (migration via reset)
-                            return cls.create(session_id)
-                        except Exception as e:
-                            print(f"WARNING: SessionState load error: {e}", file=sys.stderr)
-                            # Unknown error -> Create new? Or retry?
-                            if attempt < retries - 1:
-                                time.sleep(0.01)
-                                continue
-                            return cls.create(session_id)
-
-        # Not found, create new
+        path, is_canonical = locate_state_file(session_id)
+        if path is None:
+            # Not found, create new
+            return cls.create(session_id)
+
+        for attempt in range(retries):
+            try:
+                text = path.read_text()
+                data = json.loads(text)
+                # Convert dict to Pydantic
+                instance = cls.model_validate(data)
+            except json.JSONDecodeError as e:
+                if attempt < retries - 1:
+                    time.sleep(0.01)
+                    continue
+                print(f"WARNING: SessionState JSON decode error: {e}", file=sys.stderr)
+                # Return new state on failure to avoid blocking
+                return cls.create(session_id)
+            except ValidationError as e:
+                print(f"WARNING: SessionState validation error: {e}", file=sys.stderr)
+                # Schema mismatch -> Create new (migration via reset)
+                return cls.create(session_id)
+            except Exception as e:
+                print(f"WARNING: SessionState load error: {e}", file=sys.stderr)
+                # Unknown error -> Create new? Or retry?
+                if attempt < retries - 1:
+                    time.sleep(0.01)
+                    continue
+                return cls.create(session_id)
+
+            # Legacy or pretty-printed files compare unequal and get
+            # rewritten compactly on the next save.
+            instance._persisted_json = text
+            if is_canonical:
+                instance._file_path = path
+            return instance
+
         return cls.create(session_id)
 
-    def save(self) -> None:
-        """Save session state to disk."""
+    def save(self, force: bool = False) -> bool:
+        """Save session state to disk if it changed since the last load/save.
+
+        Args:
+            force: Write even if nothing changed.
+
+        Returns:
+            True if the file was written.
+        """
+        data = self.model_dump_json()
+        if not force and data == self._persisted_json:
+            return False
+
+        path = self.file_path
         # Ensure directory exists
-        path = get_session_file_path(self.session_id, self.date)
         path.parent.mkdir(parents=True, exist_ok=True)
 
         fd, temp_path_str = tempfile.mkstemp(
@@ -233,9 +351,6 @@ class SessionState(BaseModel):
         temp_path = Path(temp_path_str)
 
         try:
-            # Dump with exclude_none=False to preserve structure?
-            # Or use mode='json'
-            data = self.model_dump_json(indent=2)
             os.write(fd, data.encode())
             os.close(fd)
             temp_path.rename(path)
@@ -247,6 +362,10 @@ class SessionState(BaseModel):
             temp_path.unlink(missing_ok=True)
             raise
 
+        self._persisted_json = data
+        _remember_state_file(self.session_id, path)
+        return True
+
     # --- Helper methods for common checks ---
 
     def get_gate(self, name: str) -> GateState:
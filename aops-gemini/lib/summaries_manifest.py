@@ -0,0 +1,235 @@
+"""Manifest of session summary JSONs (insights) for indexed lookups.
+
+find_existing_insights tried up to ten glob patterns against the
+summaries directory per lookup, and path_reconstructor listed, sorted and
+opened every summary in its time window. As summaries accumulate over
+years those scans dominate. The manifest keeps one row per summary file
+in ~/.polecat/catalog/summaries.db ($AOPS_SUMMARIES_MANIFEST):
+
+- from the filename: date (YYYYMMDD), hour, index suffix and the
+  YYYYMMDDHH key path_reconstructor filters its window by
+- from the JSON: session_id, date and project
+- size and mtime, so a rewritten file is re-read
+
+write_insights_file records each summary it writes. Summaries that
+arrive another way (sync, manual edits) are picked up by refresh(),
+which re-lists a directory only when its mtime changed and only reads
+files that are new or changed.
+
+Usage:
+    from lib.summaries_manifest import get_summaries_manifest
+
+    manifest = get_summaries_manifest()
+    names = manifest.names_with_prefix(summaries_dir, "20260124")
+    for name, session_id in manifest.window(summaries_dir, "2026012400"):
+        ...
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from lib.paths import get_summaries_manifest_path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    date TEXT,
+    hour TEXT,
+    window_key TEXT,
+    idx INTEGER NOT NULL DEFAULT 0,
+    session_id TEXT,
+    summary_date TEXT,
+    project TEXT,
+    PRIMARY KEY (dir, name)
+);
+CREATE INDEX IF NOT EXISTS summaries_by_window ON summaries (dir, window_key);
+CREATE INDEX IF NOT EXISTS summaries_by_session ON summaries (session_id);
+"""
+
+# Upper bound for a name prefix range query
+_MAX_CHAR = "\U0010ffff"
+
+_INDEX_SUFFIX_RE = re.compile(r"-(\d+)$")
+
+
+def _is_summary_name(name: str) -> bool:
+    # What summaries_dir.glob("*.json") matches (pathlib includes dotfiles)
+    return name.endswith(".json")
+
+
+def _window_key(stem: str) -> str | None:
+    """YYYYMMDDHH of a YYYYMMDD-HH-... stem as path_reconstructor parses it, or None."""
+    date_part = stem[:8]
+    hour_part = stem[9:11] if len(stem) > 10 and stem[8] == "-" else "00"
+    try:
+        datetime.strptime(f"{date_part}{hour_part}", "%Y%m%d%H")
+    except ValueError:
+        return None
+    return f"{date_part}{hour_part}"
+
+
+def _summary_row(
+    path: Path, st: os.stat_result, summary: dict[str, Any] | None
+) -> tuple[Any, ...]:
+    """Manifest row for a summary file; summary is its parsed JSON if already known."""
+    if summary is None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            summary = None
+    if not isinstance(summary, dict):
+        summary = {}
+
+    stem = path.stem
+    parts = stem.split("-")
+    date = parts[0] if len(parts[0]) == 8 and parts[0].isdigit() else None
+    hour = parts[1] if len(parts) > 1 and len(parts[1]) == 2 and parts[1].isdigit() else None
+    index_match = _INDEX_SUFFIX_RE.search(stem)
+
+    def text(key: str) -> str | None:
+        value = summary.get(key)
+        return value if isinstance(value, str) else None
+
+    return (
+        str(path.parent),
+        path.name,
+        st.st_size,
+        st.st_mtime_ns,
+        date,
+        hour,
+        _window_key(stem),
+        int(index_match.group(1)) if index_match else 0,
+        text("session_id"),
+        text("date"),
+        text("project"),
+    )
+
+
+_INSERT = (
+    "INSERT OR REPLACE INTO summaries (dir, name, size, mtime_ns, date, hour, window_key,"
+    " idx, session_id, summary_date, project) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class SummariesManifest:
+    """SQLite index of summary JSONs, per directory."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or get_summaries_manifest_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def record_summary(self, path: Path, summary: dict[str, Any] | None = None) -> None:
+        """Add or update one summary file (e.g. right after writing it)."""
+        st = path.stat()
+        self._conn.execute(_INSERT, _summary_row(path, st, summary))
+
+    def refresh(self, directory: Path) -> None:
+        """Bring the rows for directory up to date if its mtime changed."""
+        key = str(directory)
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        row = self._conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (key,)).fetchone()
+        if (row[0] if row else None) == mtime_ns:
+            return
+
+        known = {
+            name: (size, mtime)
+            for name, size, mtime in self._conn.execute(
+                "SELECT name, size, mtime_ns FROM summaries WHERE dir = ?", (key,)
+            )
+        }
+        current: dict[str, os.stat_result] = {}
+        if mtime_ns is not None:
+            try:
+                with os.scandir(directory) as scan:
+                    for item in scan:
+                        if _is_summary_name(item.name):
+                            try:
+                                current[item.name] = item.stat()
+                            except OSError:
+                                continue
+            except OSError:
+                pass
+        # Only new or changed files are read
+        changed = [
+            _summary_row(directory / name, st, None)
+            for name, st in current.items()
+            if known.get(name) != (st.st_size, st.st_mtime_ns)
+        ]
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "DELETE FROM summaries WHERE dir = ? AND name = ?",
+                [(key, name) for name in known.keys() - current.keys()],
+            )
+            self._conn.executemany(_INSERT, changed)
+            if mtime_ns is None:
+                self._conn.execute("DELETE FROM dirs WHERE path = ?", (key,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)", (key, mtime_ns)
+                )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def names_with_prefix(self, directory: Path, prefix: str) -> list[str]:
+        """Summary file names in directory starting with prefix, sorted."""
+        self.refresh(directory)
+        return [
+            name
+            for (name,) in self._conn.execute(
+                "SELECT name FROM summaries WHERE dir = ? AND name >= ? AND name < ?"
+                " ORDER BY name",
+                (str(directory), prefix, prefix + _MAX_CHAR),
+            )
+        ]
+
+    def window(self, directory: Path, min_key: str) -> list[tuple[str, str | None]]:
+        """(name, session_id) of summaries with a YYYYMMDDHH key >= min_key, newest first."""
+        self.refresh(directory)
+        return list(
+            self._conn.execute(
+                "SELECT name, session_id FROM summaries WHERE dir = ? AND window_key >= ?"
+                " ORDER BY name DESC",
+                (str(directory), min_key),
+            )
+        )
+
+
+_manifests: dict[Path, SummariesManifest] = {}
+
+
+def get_summaries_manifest() -> SummariesManifest:
+    """Process-wide manifest for the configured database path."""
+    path = get_summaries_manifest_path()
+    manifest = _manifests.get(path)
+    if manifest is None:
+        manifest = _manifests[path] = SummariesManifest(path)
+    return manifest
@@ -5,6 +5,10 @@ Provides a unified system for:
 - Rendering with placeholder validation
 - Category-based filtering (user messages, context injection, subagent instructions)
 - Environment variable overrides for template paths
+- Compiled template cache: each file is read, frontmatter-stripped and checked
+  against its spec once per process (re-read only if its mtime/size change)
+- Optional precompiled pack (one JSON file under ~/.polecat/templates/) that
+  the router daemon loads at warm-up instead of reading every template file
 
 Usage:
     from lib.template_registry import TemplateRegistry
@@ -17,13 +21,28 @@ Exit behavior: Functions raise exceptions (fail-fast P#8). Callers handle gracef
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 import os
-from dataclasses import dataclass
+import re
+import string
+import tempfile
+import time
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Any, ClassVar
 
-from lib.template_loader import load_template
+from lib.paths import get_template_cache_dir
+from lib.template_loader import _strip_frontmatter
+
+logger = logging.getLogger(__name__)
+
+# Bump when the pack file format changes
+PACK_VERSION = 1
+
+_FORMATTER = string.Formatter()
 
 
 class TemplateCategory(Enum):
@@ -66,6 +85,105 @@ class RenderedTemplate:
     variables_used: dict[str, Any]
 
 
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template file loaded once and validated against its spec.
+
+    Attributes:
+        spec: Specification the template was checked against
+        path: Resolved template file
+        body: Content with frontmatter stripped, ready for str.format()
+        placeholders: Variable names the body references
+        required: spec.required_vars as a set
+        defaults: Optional variables, each defaulting to ""
+        mtime_ns: File mtime the template was compiled from
+        size: File size the template was compiled from
+        source: "file" (read from disk) or "pack" (precompiled pack)
+    """
+
+    spec: TemplateSpec
+    path: str
+    body: str
+    placeholders: frozenset[str]
+    required: frozenset[str]
+    defaults: dict[str, str] = field(hash=False)
+    mtime_ns: int
+    size: int
+    source: str = "file"
+
+    def missing(self, variables: dict[str, Any]) -> list[str]:
+        """Required variables absent from variables, in spec order."""
+        if self.required <= variables.keys():
+            return []
+        return [var for var in self.spec.required_vars if var not in variables]
+
+    def format(self, variables: dict[str, Any]) -> str:
+        """Interpolate variables, defaulting optional ones to "".
+
+        Like load_template(), the body is returned unformatted when there is
+        nothing to interpolate.
+        """
+        complete_vars = {**self.defaults, **variables}
+        if not complete_vars:
+            return self.body
+        return self.body.format(**complete_vars)
+
+
+def _placeholder_names(body: str) -> set[str]:
+    """Top-level variable names referenced by a str.format() template.
+
+    Raises:
+        ValueError: Malformed braces or positional placeholders
+    """
+    names: set[str] = set()
+    for _, field_name, format_spec, _ in _FORMATTER.parse(body):
+        if field_name is None:
+            continue
+        root = re.split(r"[.\[]", field_name, maxsplit=1)[0]
+        if not root or root.isdigit():
+            raise ValueError(f"positional placeholder {{{field_name}}} is not supported")
+        names.add(root)
+        if format_spec and "{" in format_spec:
+            names |= _placeholder_names(format_spec)
+    return names
+
+
+def _check_placeholders(spec: TemplateSpec, path: Path | str, placeholders: frozenset[str]) -> None:
+    """Fail if the template uses a variable its spec does not declare."""
+    undeclared = placeholders - set(spec.required_vars) - set(spec.optional_vars)
+    if undeclared:
+        raise ValueError(
+            f"Template '{spec.name}' ({path}) uses undeclared variables: "
+            f"{', '.join(sorted(undeclared))}"
+        )
+
+
+def compile_template(spec: TemplateSpec, path: Path) -> CompiledTemplate:
+    """Read, strip and validate a template file against its spec.
+
+    Raises:
+        FileNotFoundError: Template file not found
+        ValueError: Malformed placeholders, or placeholders not in the spec
+    """
+    st = path.stat()
+    body = _strip_frontmatter(path.read_text())
+    try:
+        placeholders = frozenset(_placeholder_names(body))
+    except ValueError as e:
+        raise ValueError(f"Template '{spec.name}' ({path}) is not a valid format string: {e}") from e
+    _check_placeholders(spec, path, placeholders)
+    return CompiledTemplate(
+        spec=spec,
+        path=str(path),
+        body=body,
+        placeholders=placeholders,
+        required=frozenset(spec.required_vars),
+        defaults=dict.fromkeys(spec.optional_vars, ""),
+        mtime_ns=st.st_mtime_ns,
+        size=st.st_size,
+    )
+
+
 # =============================================================================
 # TEMPLATE SPECIFICATIONS
 # =============================================================================
@@ -313,6 +431,10 @@ class TemplateRegistry:
 
     Singleton pattern - use instance() to get the shared instance.
     Use reset() or configure() for test isolation.
+
+    Compiled templates are cached per (name, resolved path) and reused while
+    the file's mtime and size are unchanged, so each template is read and
+    validated once per process (the router daemon keeps them across hooks).
     """
 
     _instance: ClassVar[TemplateRegistry | None] = None
@@ -321,6 +443,7 @@ class TemplateRegistry:
         """Initialize registry with default templates directory."""
         self._specs: dict[str, TemplateSpec] = TEMPLATE_SPECS.copy()
         self._templates_dir: Path = Path(__file__).parent.parent / "hooks" / "templates"
+        self._compiled: dict[tuple[str, str], CompiledTemplate] = {}
 
     @classmethod
     def instance(cls) -> TemplateRegistry:
@@ -416,30 +539,146 @@ class TemplateRegistry:
             ValueError: Required variable missing
             FileNotFoundError: Template file not found
         """
-        spec = self.get_spec(name)
+        compiled = self.get_compiled(name)
         variables = variables or {}
 
         # Validate required variables
-        missing = [var for var in spec.required_vars if var not in variables]
+        missing = compiled.missing(variables)
         if missing:
             raise ValueError(f"Template '{name}' missing required variables: {', '.join(missing)}")
 
-        # Build complete variables dict with optional defaults
-        complete_vars = dict(variables)
-        for var in spec.optional_vars:
-            if var not in complete_vars:
-                complete_vars[var] = ""
+        return RenderedTemplate(
+            content=compiled.format(variables),
+            spec=compiled.spec,
+            variables_used=variables,
+        )
 
-        # Resolve template path (with env override support)
-        template_path = self._resolve_template_path(spec)
+    def get_compiled(self, name: str) -> CompiledTemplate:
+        """Get the compiled template, reading the file only if it changed.
 
-        # Load and render
-        content = load_template(template_path, complete_vars)
+        The path is resolved on every call, so env overrides set after the
+        first render still apply.
 
-        return RenderedTemplate(
-            content=content,
+        Raises:
+            KeyError: Template not found
+            FileNotFoundError: Template file not found
+            ValueError: Template uses variables its spec does not declare
+        """
+        spec = self.get_spec(name)
+        path = self._resolve_template_path(spec)
+        key = (name, str(path))
+        cached = self._compiled.get(key)
+        if cached is not None:
+            st = path.stat()
+            if cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+                return cached
+        compiled = compile_template(spec, path)
+        self._compiled[key] = compiled
+        return compiled
+
+    def precompile(self, use_pack: bool = True) -> dict[str, CompiledTemplate]:
+        """Compile every template up front (router daemon warm-up).
+
+        Entries of the precompiled pack whose file is unchanged are used
+        without reading the template file.
+
+        Returns:
+            Template name -> compiled template
+
+        Raises:
+            FileNotFoundError: Template file not found
+            ValueError: Template uses variables its spec does not declare
+        """
+        pack = self._read_pack() if use_pack else {}
+        compiled: dict[str, CompiledTemplate] = {}
+        for name, spec in self._specs.items():
+            path = self._resolve_template_path(spec)
+            entry = pack.get(str(path))
+            template = self._from_pack_entry(spec, path, entry) if entry else None
+            if template is None:
+                template = compile_template(spec, path)
+            self._compiled[(name, str(path))] = template
+            compiled[name] = template
+        return compiled
+
+    # --- Precompiled pack ---
+
+    def pack_path(self) -> Path:
+        """On-disk location of the precompiled pack for this templates directory."""
+        dir_hash = hashlib.sha256(str(self._templates_dir.resolve()).encode()).hexdigest()[:12]
+        return get_template_cache_dir() / f"pack-{dir_hash}.json"
+
+    def write_pack(self) -> Path:
+        """Compile every template from disk and write the pack atomically.
+
+        Returns:
+            Path of the written pack
+
+        Raises:
+            FileNotFoundError: Template file not found
+            ValueError: Template uses variables its spec does not declare
+            OSError: Pack could not be written
+        """
+        compiled = self.precompile(use_pack=False)
+        data = {
+            "version": PACK_VERSION,
+            "templates_dir": str(self._templates_dir),
+            "built_at": time.time(),
+            "templates": {
+                t.path: {
+                    "name": name,
+                    "mtime_ns": t.mtime_ns,
+                    "size": t.size,
+                    "body": t.body,
+                    "placeholders": sorted(t.placeholders),
+                }
+                for name, t in compiled.items()
+            },
+        }
+        path = self.pack_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".pack-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            json.dump(data, tmp)
+        os.replace(tmp_path, path)
+        return path
+
+    def _read_pack(self) -> dict[str, dict]:
+        """Pack entries keyed by template path ({} if missing or unreadable)."""
+        try:
+            data = json.loads(self.pack_path().read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != PACK_VERSION:
+            return {}
+        templates = data.get("templates")
+        return templates if isinstance(templates, dict) else {}
+
+    def _from_pack_entry(
+        self, spec: TemplateSpec, path: Path, entry: dict
+    ) -> CompiledTemplate | None:
+        """Rebuild a compiled template from a pack entry, or None if it is stale."""
+        st = path.stat()
+        if (
+            entry.get("name") != spec.name
+            or entry.get("mtime_ns") != st.st_mtime_ns
+            or entry.get("size") != st.st_size
+            or not isinstance(entry.get("body"), str)
+        ):
+            return None
+        placeholders = frozenset(entry.get("placeholders") or ())
+        # The spec lives in code and may have changed since the pack was built
+        _check_placeholders(spec, path, placeholders)
+        return CompiledTemplate(
             spec=spec,
-            variables_used=variables,
+            path=str(path),
+            body=entry["body"],
+            placeholders=placeholders,
+            required=frozenset(spec.required_vars),
+            defaults=dict.fromkeys(spec.optional_vars, ""),
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            source="pack",
         )
 
     def _resolve_template_path(self, spec: TemplateSpec) -> Path:
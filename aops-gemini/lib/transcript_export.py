@@ -0,0 +1,261 @@
+"""Bulk markdown transcript export across a process pool.
+
+The session-insights pipeline and dashboards need full and abridged
+markdown transcripts for many sessions. export_sessions renders
+find_sessions() output in parallel, one session per task, and skips
+sessions whose transcripts are already newer than every input file:
+
+- Claude JSONL: the session file, its agent-*.jsonl files and its hook log
+- Gemini JSON: the session file
+- Antigravity: the brain directory's *.md files
+
+Existing transcripts are found with one listing of the transcripts
+directory (by session short hash), so the up-to-date check costs a few
+stat calls per session. Output names and content match what Stop writes
+(lib/incremental_transcript.py), so a session exported here and rendered
+on Stop later ends up in the same files. Every exported or up-to-date
+session is added to the session-insights queue (lib/insights_queue.py).
+
+Usage:
+    from lib.session_reader import find_sessions
+    from lib.transcript_export import export_sessions
+
+    for result in export_sessions(find_sessions(), workers=8):
+        print(result.status, result.session.session_id)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from lib.incremental_transcript import VARIANTS, transcript_output_path
+from lib.insights_queue import PREFERRED_VARIANT, InsightsQueue
+from lib.paths import get_transcripts_dir
+from lib.session_paths import get_session_short_hash
+from lib.transcript_parser import SessionInfo, SessionProcessor, _decode_jsonl_line
+
+logger = logging.getLogger(__name__)
+
+# Result statuses
+EXPORTED = "exported"
+UP_TO_DATE = "up_to_date"
+EMPTY = "empty"
+FAILED = "failed"
+
+
+@dataclass
+class ExportResult:
+    """Outcome of exporting one session."""
+
+    session: SessionInfo
+    status: str  # EXPORTED, UP_TO_DATE, EMPTY or FAILED
+    outputs: dict[str, Path] = field(default_factory=dict)
+    error: str | None = None
+    seconds: float = 0.0
+
+
+def existing_transcripts(directory: Path | None = None) -> dict[str, dict[str, Path]]:
+    """Session short hash -> variant -> newest transcript path in directory."""
+    directory = directory or get_transcripts_dir()
+    found: dict[str, dict[str, tuple[int, Path]]] = {}
+    try:
+        scan = os.scandir(directory)
+    except OSError:
+        return {}
+    with scan:
+        for item in scan:
+            if not item.name.endswith(".md"):
+                continue
+            # YYYYMMDD-HH-[project-]shorthash-variant.md
+            parts = item.name[: -len(".md")].rsplit("-", 2)
+            if len(parts) != 3 or parts[2] not in VARIANTS:
+                continue
+            try:
+                mtime_ns = item.stat().st_mtime_ns
+            except OSError:
+                continue
+            variants = found.setdefault(parts[1], {})
+            if parts[2] not in variants or mtime_ns > variants[parts[2]][0]:
+                variants[parts[2]] = (mtime_ns, Path(item.path))
+    return {
+        short_hash: {variant: path for variant, (_, path) in variants.items()}
+        for short_hash, variants in found.items()
+    }
+
+
+def session_input_files(processor: SessionProcessor, session: SessionInfo) -> list[Path]:
+    """Every file the session's transcripts are rendered from."""
+    path = session.path
+    if path.is_dir():
+        return sorted(path.glob("*.md"))
+    if path.suffix.lower() == ".json":
+        return [path]
+    inputs = [path] + [agent_file for _, agent_file in processor._find_agent_files(path)]
+    hook_file = processor._find_hook_file(path)
+    if hook_file is not None:
+        inputs.append(hook_file)
+    return inputs
+
+
+def is_up_to_date(inputs: Iterable[Path], outputs: dict[str, Path]) -> bool:
+    """Whether every variant exists and is newer than every input file."""
+    if set(outputs) != set(VARIANTS):
+        return False
+    try:
+        oldest_output = min(p.stat().st_mtime_ns for p in outputs.values())
+        newest_input = max((p.stat().st_mtime_ns for p in inputs), default=0)
+    except OSError:
+        return False
+    return oldest_output > newest_input
+
+
+def _read_cwd(path: Path) -> str | None:
+    """cwd of the first JSONL record that has one."""
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if b'"cwd"' not in line:
+                    continue
+                record = _decode_jsonl_line(line)
+                if record is not None and isinstance(record.get("cwd"), str):
+                    return record["cwd"]
+    except OSError:
+        pass
+    return None
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".transcript-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            tmp.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def export_session(
+    session: SessionInfo, existing: dict[str, Path] | None = None, force: bool = False
+) -> ExportResult:
+    """Render one session's full and abridged transcripts unless they are up to date.
+
+    Args:
+        session: Session from find_sessions()
+        existing: Its current transcripts (variant -> path), from
+            existing_transcripts(); looked up if None
+        force: Render even if the transcripts are up to date
+
+    Returns:
+        ExportResult; errors are captured, not raised
+    """
+    start = time.perf_counter()
+    processor = SessionProcessor()
+    try:
+        if existing is None:
+            existing = existing_transcripts().get(get_session_short_hash(session.session_id), {})
+        if not force and is_up_to_date(session_input_files(processor, session), existing):
+            return ExportResult(
+                session, UP_TO_DATE, dict(existing), seconds=time.perf_counter() - start
+            )
+
+        summary, entries, agent_entries = processor.parse_session_file(session.path)
+        if not entries:
+            return ExportResult(session, EMPTY, seconds=time.perf_counter() - start)
+        first_timestamp = next((e.timestamp for e in entries if e.timestamp), None)
+        if session.source == "claude":
+            cwd = _read_cwd(session.path)
+            project = Path(cwd).name if cwd else None
+        else:
+            project = session.project_display
+
+        outputs: dict[str, Path] = {}
+        for variant, include_tool_results in VARIANTS.items():
+            markdown = processor.format_session_as_markdown(
+                summary, entries, agent_entries, include_tool_results, variant
+            )
+            path = existing.get(variant) or transcript_output_path(
+                session.session_id, variant, first_timestamp, project
+            )
+            _write_atomic(path, markdown)
+            outputs[variant] = path
+    except Exception as e:
+        logger.debug(f"Transcript export failed for {session.path}: {e}")
+        return ExportResult(
+            session,
+            FAILED,
+            error=f"{type(e).__name__}: {e}",
+            seconds=time.perf_counter() - start,
+        )
+    return ExportResult(session, EXPORTED, outputs, seconds=time.perf_counter() - start)
+
+
+def _insights_feed() -> Callable[[ExportResult], None]:
+    """Callback adding exported sessions to the insights queue (no-op if unavailable)."""
+    try:
+        queue = InsightsQueue()
+    except (sqlite3.Error, OSError) as e:
+        logger.debug(f"Insights queue unavailable: {e}")
+        return lambda result: None
+
+    def feed(result: ExportResult) -> None:
+        transcript = result.outputs.get(PREFERRED_VARIANT)
+        if result.status not in (EXPORTED, UP_TO_DATE) or transcript is None:
+            return
+        try:
+            queue.enqueue_transcript(transcript)
+        except (sqlite3.Error, OSError) as e:
+            logger.debug(f"Could not enqueue {transcript} for insights: {e}")
+
+    return feed
+
+
+def export_sessions(
+    sessions: Iterable[SessionInfo], workers: int | None = None, force: bool = False
+) -> Iterator[ExportResult]:
+    """Export sessions across a process pool, yielding results as they finish.
+
+    Exported and up-to-date sessions are enqueued for insights as they
+    are yielded (from this process, so workers never contend for the queue).
+
+    Args:
+        sessions: Sessions from find_sessions()
+        workers: Pool size (default: os.cpu_count()); 1 exports in-process
+        force: Re-render sessions whose transcripts are up to date
+    """
+    feed = _insights_feed()
+    existing = existing_transcripts()
+    tasks = [
+        (session, existing.get(get_session_short_hash(session.session_id), {}))
+        for session in sessions
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        for session, outputs in tasks:
+            result = export_session(session, outputs, force)
+            feed(result)
+            yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        futures = {
+            pool.submit(export_session, session, outputs, force): session
+            for session, outputs in tasks
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. killed); export_session never raises
+                result = ExportResult(futures[future], FAILED, error=f"{type(e).__name__}: {e}")
+            feed(result)
+            yield result
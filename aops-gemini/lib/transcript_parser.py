@@ -7,14 +7,50 @@ parsing Claude Code and Gemini session files into structured objects.
 
 from __future__ import annotations
 
+import heapq
 import json
 import re
-from dataclasses import dataclass, field
+from collections.abc import Callable, Collection, Iterator, Mapping
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime, timedelta
 from enum import Enum, auto
 from pathlib import Path
 from typing import Any
 
+from lib.agent_file_index import (
+    AGENT_FILE_PREFIX,
+    AGENT_FILE_SUFFIX,
+    fold_agent_files,
+    session_agent_files,
+)
+from lib.hook_log_manifest import (
+    date_from_hook_log_name,
+    load_manifest,
+    lookup_hook_log,
+    record_hook_log,
+)
+
+try:
+    import orjson  # Optional fast JSON backend for transcript lines
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _loads(data: bytes | str) -> Any:
+    """json.loads, via orjson when installed.
+
+    orjson rejects a few inputs json accepts (NaN, integers over 64 bits),
+    so its failures are retried with json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
 
 def extract_working_dir_from_entries(entries: list[Entry]) -> str | None:
     """Extract working directory from session entries.
@@ -768,6 +804,22 @@ class UsageStats:
         self.by_agent[agent_key]["cache_create"] += entry.cache_creation_input_tokens or 0
         self.by_agent[agent_key]["cache_read"] += entry.cache_read_input_tokens or 0
 
+    def merge(self, other: UsageStats) -> None:
+        """Add other's totals and breakdowns, as if its entries had been added here."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_creation_input_tokens += other.cache_creation_input_tokens
+        self.cache_read_input_tokens += other.cache_read_input_tokens
+        for mine, theirs in (
+            (self.by_model, other.by_model),
+            (self.by_tool, other.by_tool),
+            (self.by_agent, other.by_agent),
+        ):
+            for key, counts in theirs.items():
+                target = mine.setdefault(key, dict.fromkeys(counts, 0))
+                for name, count in counts.items():
+                    target[name] = target.get(name, 0) + count
+
     def has_data(self) -> bool:
         """Check if any usage data has been recorded."""
         return (
@@ -831,119 +883,617 @@ class UsageStats:
         return metrics
 
 
+def _first_tool_name(entry: Entry) -> str | None:
+    """Name of the first tool_use block of an assistant entry (for usage by tool)."""
+    if entry.type == "assistant" and entry.message:
+        content = entry.message.get("content", [])
+        if isinstance(content, list):
+            for block in content:
+                if isinstance(block, dict) and block.get("type") == "tool_use":
+                    return block.get("name")
+    return None
+
+
 @dataclass
+class ContextSummaryStats:
+    """Running aggregates behind a transcript's Context Summary block.
+
+    Built entry by entry, so an incremental renderer can keep the totals
+    of turns it has already rendered (to_dict/from_dict) and only add new
+    entries.
+    """
+
+    skills_invoked: set[str] = field(default_factory=set)
+    files_modified: set[str] = field(default_factory=set)
+    key_tools: dict[str, int] = field(default_factory=dict)
+    usage: UsageStats = field(default_factory=UsageStats)
+
+    def add_entry(self, entry: Entry) -> None:
+        """Add a main-thread entry: tool, skill and file metadata plus token usage."""
+        if entry.type == "assistant" and entry.message:
+            content = entry.message.get("content", [])
+            if isinstance(content, list):
+                for block in content:
+                    if isinstance(block, dict) and block.get("type") == "tool_use":
+                        tool_name = block.get("name", "")
+                        tool_input = block.get("input", {})
+
+                        # Track tool usage
+                        if tool_name:
+                            self.key_tools[tool_name] = self.key_tools.get(tool_name, 0) + 1
+
+                        # Track skills invoked
+                        if tool_name == "Skill":
+                            skill = tool_input.get("skill", "")
+                            if skill:
+                                self.skills_invoked.add(skill)
+
+                        # Track file modifications
+                        if tool_name in ["Edit", "Write"]:
+                            file_path = tool_input.get("file_path", "")
+                            if file_path:
+                                # Store basename only for readability
+                                self.files_modified.add(Path(file_path).name)
+
+        self.usage.add_entry(entry, tool_name=_first_tool_name(entry), agent_id=None)
+
+    def add_agent_entry(self, entry: Entry, agent_id: str) -> None:
+        """Add a subagent entry (token usage only)."""
+        self.usage.add_entry(entry, tool_name=_first_tool_name(entry), agent_id=agent_id)
+
+    def format(self, agent_count: int = 0) -> str | None:
+        """The Context Summary markdown, or None if there is nothing to report."""
+        summary_parts = []
+
+        if self.skills_invoked:
+            skills_str = ", ".join(f"`{s}`" for s in sorted(self.skills_invoked))
+            summary_parts.append(f"**Skills/Workflows**: {skills_str}")
+
+        if self.key_tools:
+            # Show top 5 most used tools
+            top_tools = sorted(self.key_tools.items(), key=lambda x: x[1], reverse=True)[:5]
+            tools_str = ", ".join([f"{name} ({count})" for name, count in top_tools])
+            summary_parts.append(f"**Tools Used**: {tools_str}")
+
+        files_modified = self.files_modified
+        if files_modified:
+            if len(files_modified) <= 5:
+                files_str = ", ".join(f"`{f}`" for f in sorted(files_modified))
+                summary_parts.append(f"**Files Modified**: {files_str}")
+            else:
+                shown = list(sorted(files_modified))[:3]
+                files_str = ", ".join(f"`{f}`" for f in shown)
+                summary_parts.append(
+                    f"**Files Modified**: {files_str} (+{len(files_modified) - 3} more)"
+                )
+
+        if agent_count > 0:
+            summary_parts.append(f"**Subagents**: {agent_count} spawned")
+
+        # Aggregate and display usage stats
+        usage_stats = self.usage
+        if usage_stats.has_data():
+            usage_summary = usage_stats.format_summary()
+            summary_parts.append(f"**Token Usage**: {usage_summary}")
+
+            # Add model breakdown if multiple models used
+            if len(usage_stats.by_model) > 1:
+                model_parts = []
+                for model, stats in sorted(usage_stats.by_model.items()):
+                    total = stats["input"] + stats["output"]
+                    if total > 0:
+                        # Shorten model names for display
+                        short_name = model.replace("claude-", "").replace("-20251001", "")
+                        model_parts.append(f"{short_name}: {total:,}")
+                if model_parts:
+                    summary_parts.append(f"**By Model**: {', '.join(model_parts)}")
+
+            # Add agent breakdown if subagents used
+            if len(usage_stats.by_agent) > 1:
+                agent_parts = []
+                for agent_id, stats in sorted(usage_stats.by_agent.items()):
+                    total = stats["input"] + stats["output"]
+                    if total > 0:
+                        display_id = "main" if agent_id == "main" else agent_id[:7]
+                        agent_parts.append(f"{display_id}: {total:,}")
+                if agent_parts:
+                    summary_parts.append(f"**By Agent**: {', '.join(agent_parts)}")
+
+        if not summary_parts:
+            return None
+
+        return "**Context Summary**\n\n" + "\n".join(summary_parts) + "\n\n"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "skills_invoked": sorted(self.skills_invoked),
+            "files_modified": sorted(self.files_modified),
+            "key_tools": self.key_tools,
+            "usage": asdict(self.usage),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ContextSummaryStats:
+        return cls(
+            skills_invoked=set(data["skills_invoked"]),
+            files_modified=set(data["files_modified"]),
+            key_tools=dict(data["key_tools"]),
+            usage=UsageStats(**data["usage"]),
+        )
+
+
+# Raw record keys that feed Entry fields decoded on first access
+_USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+_HOOK_FIELDS = (
+    "additional_context",
+    "hook_event_name",
+    "hook_exit_code",
+    "skills_matched",
+    "files_loaded",
+    "tool_name",
+    "tool_input",
+    "agent_id",
+)
+
+# Public fields, in constructor order (repr/eq)
+_ENTRY_FIELDS = (
+    "type",
+    "uuid",
+    "parent_uuid",
+    "message",
+    "content",
+    "is_sidechain",
+    "is_meta",
+    "tool_use_result",
+    "hook_context",
+    "subagent_id",
+    "summary_text",
+    "timestamp",
+    *_HOOK_FIELDS,
+    *_USAGE_FIELDS,
+    "model",
+)
+
+
+# Marks an Entry field still encoded in its raw JSONL line
+_IN_RAW: Any = object()
+
+
+class _HookFields:
+    """Hook data of a system_reminder entry."""
+
+    __slots__ = _HOOK_FIELDS
+
+    def __init__(self) -> None:
+        for name in _HOOK_FIELDS:
+            setattr(self, name, None)
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    """ISO 8601 (with or without Z) -> local-time datetime, None if unparseable."""
+    try:
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        # Convert to local time immediately to ensure consistent display
+        return datetime.fromisoformat(value).astimezone()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
 class Entry:
-    """Represents a single JSONL entry from any source."""
-
-    type: str
-    uuid: str = ""
-    parent_uuid: str = ""
-    message: dict = field(default_factory=dict)
-    content: dict = field(default_factory=dict)
-    is_sidechain: bool = False
-    is_meta: bool = False
-    tool_use_result: dict = field(default_factory=dict)
-    hook_context: dict = field(default_factory=dict)
-    subagent_id: str | None = None
-    summary_text: str | None = None
-    timestamp: datetime | None = None
-
-    # Hook-specific fields
-    additional_context: str | None = None
-    hook_event_name: str | None = None
-    hook_exit_code: int | None = None
-    skills_matched: list[str] | None = None
-    files_loaded: list[str] | None = None
-    tool_name: str | None = None
-    tool_input: dict | None = None  # Tool parameters for PreToolUse/PostToolUse hooks
-    agent_id: str | None = None
-
-    # Token tracking fields
-    input_tokens: int | None = None
-    output_tokens: int | None = None
-    cache_creation_input_tokens: int | None = None
-    cache_read_input_tokens: int | None = None
-    model: str | None = None
+    """Represents a single JSONL entry from any source.
+
+    Slotted, and lazily decoded when built by from_dict: the timestamp
+    string and the message's token usage are turned into fields on first
+    access, and absent content/toolUseResult/hook_context dicts are only
+    created when read. Given the raw JSONL line, from_dict keeps that line
+    instead of the decoded message and toolUseResult (usually a second
+    copy of the tool output); each is decoded from it on first access, and
+    the line is dropped once nothing still needs it. The line is far
+    smaller than the decoded dicts, whichever JSON backend is used.
+
+    Hook fields (additional_context ... agent_id) are only set on
+    system_reminder entries; token fields come from message["usage"].
+    """
+
+    __slots__ = (
+        "type",
+        "uuid",
+        "parent_uuid",
+        "_message",
+        "is_sidechain",
+        "is_meta",
+        "subagent_id",
+        "summary_text",
+        "_content",
+        "_tool_use_result",
+        "_hook_context",
+        "_timestamp",
+        "_timestamp_raw",
+        "_hook",
+        "_usage",
+        "_raw",
+    )
+
+    def __init__(
+        self,
+        type: str,
+        uuid: str = "",
+        parent_uuid: str = "",
+        message: dict | None = None,
+        content: dict | None = None,
+        is_sidechain: bool = False,
+        is_meta: bool = False,
+        tool_use_result: dict | None = None,
+        hook_context: dict | None = None,
+        subagent_id: str | None = None,
+        summary_text: str | None = None,
+        timestamp: datetime | None = None,
+        **fields: Any,
+    ) -> None:
+        self.type = type
+        self.uuid = uuid
+        self.parent_uuid = parent_uuid
+        self._message = message if message is not None else {}
+        self.is_sidechain = is_sidechain
+        self.is_meta = is_meta
+        self.subagent_id = subagent_id
+        self.summary_text = summary_text
+        self._content = content
+        self._tool_use_result = tool_use_result
+        self._hook_context = hook_context
+        self._timestamp = timestamp
+        self._timestamp_raw = None
+        self._hook = None
+        self._usage = None
+        self._raw = None
+        for name, value in fields.items():
+            if name not in _HOOK_FIELDS and name not in _USAGE_FIELDS and name != "model":
+                raise TypeError(f"Entry() got an unexpected keyword argument '{name}'")
+            setattr(self, name, value)
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> Entry:
-        """Create Entry from JSONL dict."""
-        # Extract tokens from message.usage if present
-        message = data.get("message", {})
-        usage = message.get("usage", {})
-        input_tokens = usage.get("input_tokens")
-        output_tokens = usage.get("output_tokens")
-        cache_creation_input_tokens = usage.get("cache_creation_input_tokens")
-        cache_read_input_tokens = usage.get("cache_read_input_tokens")
-        model = message.get("model")
-
-        entry = cls(
-            type=data.get("type", "unknown"),
-            uuid=data.get("uuid", ""),
-            parent_uuid=data.get("parentUuid", ""),
-            message=data.get("message", {}),
-            content=data.get("content", {}),
-            is_sidechain=data.get("isSidechain", False),
-            is_meta=data.get("isMeta", False),
-            tool_use_result=data.get("toolUseResult", {}),
-            hook_context=data.get("hook_context", {}),
-            subagent_id=data.get("subagentId"),
-            summary_text=data.get("summary"),
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            cache_creation_input_tokens=cache_creation_input_tokens,
-            cache_read_input_tokens=cache_read_input_tokens,
-            model=model,
+    def from_dict(cls, data: dict[str, Any], raw: bytes | None = None) -> Entry:
+        """Create Entry from JSONL dict.
+
+        Args:
+            data: The decoded record
+            raw: The JSONL line data was decoded from. When given, message
+                and toolUseResult stay encoded in it until read.
+        """
+        entry = cls.__new__(cls)
+        entry.type = data.get("type", "unknown")
+        entry.uuid = data.get("uuid", "")
+        entry.parent_uuid = data.get("parentUuid", "")
+        message = data["message"] if "message" in data else {}
+        tool_use_result = data.get("toolUseResult")
+        lazy = raw is not None
+        # _IN_RAW: present and non-empty, decoded from entry._raw on first access
+        entry._message = _IN_RAW if lazy and message else message
+        entry.is_sidechain = data.get("isSidechain", False)
+        entry.is_meta = data.get("isMeta", False)
+        entry.subagent_id = data.get("subagentId")
+        entry.summary_text = data.get("summary")
+        # None = absent; the property substitutes a fresh {} on first access
+        entry._content = data.get("content")
+        # Usually a second copy of the tool output, and rarely read
+        entry._tool_use_result = _IN_RAW if lazy and tool_use_result else tool_use_result
+        entry._raw = (
+            raw if entry._message is _IN_RAW or entry._tool_use_result is _IN_RAW else None
         )
+        entry._hook_context = data.get("hook_context")
+        entry._timestamp = None
+        entry._timestamp_raw = data.get("timestamp")
+        entry._hook = None
+        entry._usage = None
 
         # Extract hook data from system_reminder entries
         if entry.type == "system_reminder":
+            hook = entry._hook = _HookFields()
+            content = entry.content
             hook_output = data.get("hookSpecificOutput", {})
             if isinstance(hook_output, dict) and hook_output:
-                entry.additional_context = hook_output.get("additionalContext", "")
-                entry.hook_event_name = hook_output.get("hookEventName")
-                entry.hook_exit_code = hook_output.get("exitCode")
-                entry.skills_matched = hook_output.get("skillsMatched")
-                entry.files_loaded = hook_output.get("filesLoaded")
-                entry.tool_name = hook_output.get("toolName")
-                entry.tool_input = hook_output.get("toolInput")
-                entry.agent_id = hook_output.get("agentId")
+                hook.additional_context = hook_output.get("additionalContext", "")
+                hook.hook_event_name = hook_output.get("hookEventName")
+                hook.hook_exit_code = hook_output.get("exitCode")
+                hook.skills_matched = hook_output.get("skillsMatched")
+                hook.files_loaded = hook_output.get("filesLoaded")
+                hook.tool_name = hook_output.get("toolName")
+                hook.tool_input = hook_output.get("toolInput")
+                hook.agent_id = hook_output.get("agentId")
             # Fall back to content.additionalContext
-            if not entry.additional_context and isinstance(entry.content, dict):
-                entry.additional_context = entry.content.get("additionalContext", "")
-            if not entry.hook_event_name and isinstance(entry.content, dict):
-                entry.hook_event_name = entry.content.get("hookEventName")
-            if entry.hook_exit_code is None and isinstance(entry.content, dict):
-                entry.hook_exit_code = entry.content.get("exitCode")
+            if not hook.additional_context and isinstance(content, dict):
+                hook.additional_context = content.get("additionalContext", "")
+            if not hook.hook_event_name and isinstance(content, dict):
+                hook.hook_event_name = content.get("hookEventName")
+            if hook.hook_exit_code is None and isinstance(content, dict):
+                hook.hook_exit_code = content.get("exitCode")
 
         # Extract hook data from system entries with stop_hook_summary subtype
-        if entry.type == "system" and data.get("subtype") == "stop_hook_summary":
+        elif entry.type == "system" and data.get("subtype") == "stop_hook_summary":
             # Normalize to system_reminder for downstream processing
             entry.type = "system_reminder"
-            entry.hook_event_name = "Stop"
-            entry.hook_exit_code = 0 if not data.get("hookErrors") else 1
+            hook = entry._hook = _HookFields()
+            hook.hook_event_name = "Stop"
+            hook.hook_exit_code = 0 if not data.get("hookErrors") else 1
             # Extract hook command info
             hook_infos = data.get("hookInfos", [])
             if hook_infos:
                 commands = [h.get("command", "") for h in hook_infos]
-                entry.additional_context = f"Hooks executed: {', '.join(commands)}"
+                hook.additional_context = f"Hooks executed: {', '.join(commands)}"
             if data.get("hasOutput"):
-                entry.additional_context = (entry.additional_context or "") + " (has output)"
-
-        # Parse timestamp
-        if "timestamp" in data:
-            try:
-                timestamp_str = data["timestamp"]
-                if timestamp_str.endswith("Z"):
-                    timestamp_str = timestamp_str[:-1] + "+00:00"
-                dt = datetime.fromisoformat(timestamp_str)
-                # Convert to local time immediately to ensure consistent display
-                entry.timestamp = dt.astimezone()
-            except (ValueError, TypeError):
-                pass
+                hook.additional_context = (hook.additional_context or "") + " (has output)"
 
         return entry
 
+    # --- Lazily materialized record fields ---
+
+    def _from_raw(self, key: str) -> Any:
+        """Decode key from the raw line, dropping the line once nothing else needs it."""
+        value = _loads(self._raw)[key]
+        if self._message is not _IN_RAW or self._tool_use_result is not _IN_RAW:
+            self._raw = None  # key was the last field still encoded
+        return value
+
+    @property
+    def message(self) -> dict:
+        value = self._message
+        if value is _IN_RAW:
+            value = self._message = self._from_raw("message")
+        return value
+
+    @message.setter
+    def message(self, value: dict) -> None:
+        self._message = value
+
+    @property
+    def content(self) -> dict:
+        if self._content is None:
+            self._content = {}
+        return self._content
+
+    @content.setter
+    def content(self, value: dict) -> None:
+        self._content = value
+
+    @property
+    def tool_use_result(self) -> dict:
+        value = self._tool_use_result
+        if value is None:
+            value = self._tool_use_result = {}
+        elif value is _IN_RAW:
+            value = self._tool_use_result = self._from_raw("toolUseResult")
+        return value
+
+    @tool_use_result.setter
+    def tool_use_result(self, value: dict) -> None:
+        self._tool_use_result = value
+
+    @property
+    def has_tool_use_result(self) -> bool:
+        """Whether the record carried a toolUseResult (without decoding it)."""
+        return self._tool_use_result is not None
+
+    @property
+    def hook_context(self) -> dict:
+        if self._hook_context is None:
+            self._hook_context = {}
+        return self._hook_context
+
+    @hook_context.setter
+    def hook_context(self, value: dict) -> None:
+        self._hook_context = value
+
+    @property
+    def timestamp(self) -> datetime | None:
+        if self._timestamp_raw is not None:
+            self._timestamp = _parse_timestamp(self._timestamp_raw)
+            self._timestamp_raw = None
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value: datetime | None) -> None:
+        self._timestamp = value
+        self._timestamp_raw = None
+
+    # --- Token usage (from message["usage"] unless set explicitly) ---
+
+    def _usage_fields(self) -> dict[str, Any]:
+        if self._usage is None:
+            message = self.message
+            usage = message.get("usage") if isinstance(message, dict) else None
+            if not isinstance(usage, dict):
+                usage = {}
+            self._usage = {name: usage.get(name) for name in _USAGE_FIELDS}
+            self._usage["model"] = message.get("model") if isinstance(message, dict) else None
+        return self._usage
+
+    # --- Hook fields (system_reminder entries) ---
+
+    def _hook_fields(self) -> _HookFields:
+        if self._hook is None:
+            self._hook = _HookFields()
+        return self._hook
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _ENTRY_FIELDS)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in _ENTRY_FIELDS)
+        return f"Entry({fields})"
+
+
+def _usage_property(name: str) -> property:
+    def fget(self: Entry) -> Any:
+        return self._usage_fields()[name]
+
+    def fset(self: Entry, value: Any) -> None:
+        self._usage_fields()[name] = value
+
+    return property(fget, fset)
+
+
+def _hook_property(name: str) -> property:
+    def fget(self: Entry) -> Any:
+        hook = self._hook
+        return getattr(hook, name) if hook is not None else None
+
+    def fset(self: Entry, value: Any) -> None:
+        setattr(self._hook_fields(), name, value)
+
+    return property(fget, fset)
+
+
+for _name in (*_USAGE_FIELDS, "model"):
+    setattr(Entry, _name, _usage_property(_name))
+for _name in _HOOK_FIELDS:
+    setattr(Entry, _name, _hook_property(_name))
+del _name
+
+
+# Block size for reading JSONL files backwards from EOF
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def iter_jsonl_reversed(
+    file_path: str | Path, block_size: int = TAIL_BLOCK_SIZE
+) -> Iterator[dict[str, Any]]:
+    """Yield JSONL records newest-first, reading fixed-size blocks from EOF.
+
+    Cost is proportional to how far back the caller iterates, not to the
+    file size. Blank and undecodable lines are skipped (a partially written
+    last line is simply ignored).
+
+    Args:
+        file_path: JSONL file
+        block_size: Bytes read per seek
+
+    Yields:
+        Decoded JSON objects, last line first
+    """
+    with open(file_path, "rb") as f:
+        position = f.seek(0, 2)
+        carry = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + carry
+            lines = block.split(b"\n")
+            # The first piece may be the tail of a line that starts in an earlier block
+            carry = lines.pop(0)
+            for line in reversed(lines):
+                record = _decode_jsonl_line(line)
+                if record is not None:
+                    yield record
+        record = _decode_jsonl_line(carry)
+        if record is not None:
+            yield record
+
+
+def _decode_jsonl_line(line: bytes) -> dict[str, Any] | None:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        data = _loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def iter_jsonl_records(file_path: str | Path, offset: int = 0) -> Iterator[dict[str, Any]]:
+    """Yield JSONL records in file order, one line in memory at a time.
+
+    Blank, undecodable and non-object lines are skipped.
+
+    Args:
+        file_path: JSONL file
+        offset: Byte offset to start from. An offset inside a line skips
+            to the start of the next line.
+    """
+    for record, _line in iter_jsonl_lines(file_path, offset):
+        yield record
+
+
+def iter_jsonl_lines(
+    file_path: str | Path, offset: int = 0
+) -> Iterator[tuple[dict[str, Any], bytes]]:
+    """iter_jsonl_records, also yielding each record's raw line (for Entry.from_dict)."""
+    with open(file_path, "rb") as f:
+        if offset > 0:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                f.readline()
+        for line in f:
+            record = _decode_jsonl_line(line)
+            if record is not None:
+                yield record, line
+
+
+def hook_record_to_entry(data: dict[str, Any]) -> Entry:
+    """A *-hooks.jsonl record as a system_reminder Entry."""
+    hook_output = data.get("hookSpecificOutput") or {}
+
+    if not hook_output.get("hookEventName"):
+        hook_output["hookEventName"] = data.get("hook_event", "Unknown")
+
+    if "exit_code" in data and "exitCode" not in hook_output:
+        hook_output["exitCode"] = data["exit_code"]
+
+    if "tool_name" in data:
+        hook_output["toolName"] = data["tool_name"]
+
+    if "tool_input" in data:
+        hook_output["toolInput"] = data["tool_input"]
+
+    if "agent_id" in data:
+        hook_output["agentId"] = data["agent_id"]
+
+    entry_data = {
+        "type": "system_reminder",
+        "timestamp": data.get("logged_at"),
+        "hookSpecificOutput": hook_output,
+    }
+    return Entry.from_dict(entry_data)
+
+
+def _raw_entry_type(data: dict[str, Any]) -> str:
+    """The Entry.type that Entry.from_dict(data) will produce."""
+    entry_type = data.get("type", "unknown")
+    if entry_type == "system" and data.get("subtype") == "stop_hook_summary":
+        return "system_reminder"
+    return entry_type
+
+
+_MIN_TIMESTAMP = datetime.min.replace(tzinfo=UTC)
+
+
+def _entry_sort_key(entry: Entry) -> datetime:
+    """Chronological sort key; entries without a timestamp sort first."""
+    return entry.timestamp if entry.timestamp else _MIN_TIMESTAMP
+
+
+def iter_entries_reversed(
+    file_path: str | Path, block_size: int = TAIL_BLOCK_SIZE
+) -> Iterator[Entry]:
+    """Yield Entry objects from a Claude Code JSONL transcript, newest-first.
+
+    Only the transcript itself is read (no agent or hook files).
+    """
+    for data in iter_jsonl_reversed(file_path, block_size):
+        yield Entry.from_dict(data)
+
 
 @dataclass
 class SessionSummary:
@@ -1254,6 +1804,188 @@ def _extract_exit_code_from_content(content: str, is_error: bool) -> int | None:
     return 1  # Default to 1 for errors without explicit code
 
 
+def _tool_result_text(result_content: Any) -> Any:
+    """Flatten list-of-blocks tool_result content to its joined text parts."""
+    if isinstance(result_content, list):
+        texts = []
+        for item in result_content:
+            if isinstance(item, dict) and item.get("type") == "text":
+                texts.append(item.get("text", ""))
+        return "\n".join(texts)
+    return result_content
+
+
+class ToolResultIndex:
+    """tool_use_id -> tool_result lookups, built in one pass over the entries.
+
+    Replaces a linear scan of every entry per tool call. For each id it keeps
+    the first matching tool_result block (info), the first successful and the
+    first failed result with text content, and the agentId of the first
+    result whose entry carries a toolUseResult dict.
+    """
+
+    def __init__(self, entries: list[Entry]) -> None:
+        self._info: dict[str | None, tuple[Any, Any]] = {}
+        self._results: dict[str | None, str] = {}
+        self._errors: dict[str | None, str] = {}
+        # Entries whose tool_use_result may hold the agentId, decoded on demand
+        self._agent_candidates: dict[str | None, list[Entry]] = {}
+        self._info_cache: dict[str | None, dict[str, Any]] = {}
+
+        for entry in entries:
+            if entry.type != "user":
+                continue
+
+            message = entry.message or {}
+            content = message.get("content", [])
+            if not isinstance(content, list):
+                continue
+
+            for block in content:
+                if not isinstance(block, dict) or block.get("type") != "tool_result":
+                    continue
+                tool_id = block.get("tool_use_id")
+                raw = block.get("content", "")
+                text = _tool_result_text(raw)
+
+                if tool_id not in self._info:
+                    self._info[tool_id] = (text, block.get("is_error", False))
+                if isinstance(raw, (list, str)):
+                    target = self._errors if block.get("is_error") else self._results
+                    target.setdefault(tool_id, text)
+                self._agent_candidates.setdefault(tool_id, []).append(entry)
+
+    def __len__(self) -> int:
+        return len(self._info)
+
+    def info(self, tool_id: str) -> dict[str, Any] | None:
+        """Result content, is_error and exit_code, or None if there is no result.
+
+        Returns a fresh dict per call, so callers may modify it.
+        """
+        cached = self._info_cache.get(tool_id)
+        if cached is not None:
+            return dict(cached)
+        if tool_id not in self._info:
+            return None
+        text, is_error = self._info[tool_id]
+        info = {
+            "content": text,
+            "is_error": is_error,
+            "exit_code": _extract_exit_code_from_content(
+                text if isinstance(text, str) else "", is_error
+            ),
+        }
+        self._info_cache[tool_id] = info
+        return dict(info)
+
+    def result(self, tool_id: str) -> str | None:
+        """Content of the first successful result."""
+        return self._results.get(tool_id)
+
+    def error(self, tool_id: str) -> str | None:
+        """Content of the first failed result, truncated to 500 characters."""
+        error = self._errors.get(tool_id)
+        return error[:500] if error is not None else None
+
+    def agent_id(self, tool_id: str) -> str | None:
+        """agentId reported by an Agent/Task tool result."""
+        for entry in self._agent_candidates.get(tool_id, ()):
+            if not entry.has_tool_use_result:
+                return None
+            tool_use_result = entry.tool_use_result
+            if isinstance(tool_use_result, dict):
+                return tool_use_result.get("agentId")
+        return None
+
+
+class AgentEntries(Mapping[str, list[Entry]]):
+    """agent_id -> entries of a session's agent files, each file read on first access.
+
+    Rendering turns only looks up the agents that a Task/Agent tool result
+    references. The Context Summary's token totals come from usage(),
+    which is cached per agent file in the agent file index, so a render
+    only reads the agent files its turns reference (and the lines appended
+    to the others since the last render). Iterating items()/values()
+    still reads every file. Unlike the eager dict this replaces, an agent
+    file with no decodable lines maps to an empty list.
+    """
+
+    def __init__(
+        self,
+        agent_files: list[tuple[str, Path]],
+        load: Callable[[Path], list[Entry]],
+        index_dir: Path | None = None,
+    ) -> None:
+        self._files = dict(agent_files)
+        self._load = load
+        self._loaded: dict[str, list[Entry]] = {}
+        self._index_dir = index_dir
+
+    def __getitem__(self, agent_id: str) -> list[Entry]:
+        entries = self._loaded.get(agent_id)
+        if entries is None:
+            entries = self._loaded[agent_id] = self._load(self._files[agent_id])
+        return entries
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._files
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __repr__(self) -> str:
+        return f"AgentEntries({list(self._files)!r}, loaded={list(self._loaded)!r})"
+
+    def usage(self) -> UsageStats:
+        """Token usage of all agent files, as add_entry() over every entry would give.
+
+        Folded per file into the index of index_dir (see
+        lib.agent_file_index.fold_agent_files) without loading entries.
+        """
+        usage = UsageStats()
+        if self._index_dir is None:
+            for agent_id, agent_entry_list in self.items():
+                for entry in agent_entry_list:
+                    usage.add_entry(entry, tool_name=_first_tool_name(entry), agent_id=agent_id)
+            return usage
+        values = fold_agent_files(
+            self._index_dir, _AGENT_USAGE_FOLD, list(self._files.values()), _fold_agent_file_usage
+        )
+        for value in values:
+            usage.merge(UsageStats(**value))
+        return usage
+
+
+# Names fold_agent_files values of _fold_agent_file_usage; bump when UsageStats changes
+_AGENT_USAGE_FOLD = "usage-v1"
+
+
+def _fold_agent_file_usage(
+    path: Path, offset: int, value: dict[str, Any] | None
+) -> tuple[int, dict[str, Any]]:
+    """An agent file's UsageStats (as a dict) continued with its complete lines from offset."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        data = b""
+    # A trailing line without a newline may still be being written
+    complete_len = data.rfind(b"\n") + 1
+    agent_id = path.name[len(AGENT_FILE_PREFIX) : -len(AGENT_FILE_SUFFIX)]
+    usage = UsageStats(**value) if value else UsageStats()
+    for line in data[:complete_len].splitlines():
+        record = _decode_jsonl_line(line)
+        if record is not None:
+            entry = Entry.from_dict(record)
+            usage.add_entry(entry, tool_name=_first_tool_name(entry), agent_id=agent_id)
+    return offset + complete_len, asdict(usage)
+
+
 def _summarize_tool_input(tool_name: str, tool_input: dict) -> str:
     """Create a brief summary of tool input for error context."""
     if tool_name in ("Read", "Write", "Edit"):
@@ -1281,6 +2013,28 @@ def _summarize_tool_input(tool_name: str, tool_input: dict) -> str:
 class SessionProcessor:
     """Processes JSONL sessions into structured data."""
 
+    def __init__(self) -> None:
+        # Index for the most recently used entries list (see tool_results)
+        self._tool_index_entries: list[Entry] | None = None
+        self._tool_index_len = 0
+        self._tool_index: ToolResultIndex | None = None
+
+    def tool_results(self, entries: list[Entry]) -> ToolResultIndex:
+        """The tool_use_id -> result index for entries, built once per list.
+
+        Reused while the same list object is passed and has not grown, so
+        every tool call in a render shares one pass over the entries.
+        """
+        if (
+            self._tool_index is None
+            or self._tool_index_entries is not entries
+            or self._tool_index_len != len(entries)
+        ):
+            self._tool_index = ToolResultIndex(entries)
+            self._tool_index_entries = entries
+            self._tool_index_len = len(entries)
+        return self._tool_index
+
     def parse_session_file(
         self,
         file_path: str | Path,
@@ -1421,13 +2175,14 @@ class SessionProcessor:
                         }
                     )
 
-            # Create main entry
+            # Create main entry (content is the same dict as message, as a fallback)
+            body = {"content": content_blocks if content_blocks else content_text}
             entry = Entry(
                 type=entry_type,
                 uuid=msg.get("id", ""),
                 timestamp=timestamp,
-                message={"content": content_blocks if content_blocks else content_text},
-                content={"content": content_blocks if content_blocks else content_text},  # Fallback
+                message=body,
+                content=body,
             )
             entries.append(entry)
 
@@ -1435,12 +2190,13 @@ class SessionProcessor:
             if tool_results_to_add:
                 # Use slightly later timestamp to maintain order if needed,
                 # but usually same timestamp is fine as list order is preserved.
+                result_body = {"content": tool_results_to_add}
                 result_entry = Entry(
                     type="user",
                     uuid=f"result-{msg.get('id', '')}",
                     timestamp=timestamp,
-                    message={"content": tool_results_to_add},
-                    content={"content": tool_results_to_add},
+                    message=result_body,
+                    content=result_body,
                 )
                 entries.append(result_entry)
 
@@ -1457,45 +2213,20 @@ class SessionProcessor:
         session_summary = None
         session_uuid = file_path.stem
 
-        with open(file_path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-
-                    # Handle hook logs passed as main file
-                    if file_path.name.endswith("-hooks.jsonl"):
-                        # Map hook log format to Entry format
-                        hook_output = data.get("hookSpecificOutput") or {}
-                        if not hook_output.get("hookEventName"):
-                            hook_output["hookEventName"] = data.get("hook_event", "Unknown")
-                        if "exit_code" in data and "exitCode" not in hook_output:
-                            hook_output["exitCode"] = data["exit_code"]
-
-                        data = {
-                            "type": "system_reminder",
-                            "timestamp": data.get("logged_at"),
-                            "hookSpecificOutput": hook_output,
-                        }
-
-                    entry = Entry.from_dict(data)
-                    entries.append(entry)
+        for entry in self._iter_main_entries(file_path):
+            entries.append(entry)
 
-                    # Extract summary if available
-                    if entry.type == "summary":
-                        summary_text = entry.content.get("summary", "Claude Code Session")
-                        session_summary = SessionSummary(uuid=session_uuid, summary=summary_text)
-                except json.JSONDecodeError:
-                    continue
+            # Extract summary if available
+            if entry.type == "summary":
+                summary_text = entry.content.get("summary", "Claude Code Session")
+                session_summary = SessionSummary(uuid=session_uuid, summary=summary_text)
 
         # Create default summary if none found
         if not session_summary:
             session_summary = SessionSummary(uuid=session_uuid)
 
         # Load agent entries from agent-*.jsonl files
-        agent_entries = {}
+        agent_entries: Mapping[str, list[Entry]] = {}
         if load_agents:
             agent_entries = self._load_agent_files(file_path)
 
@@ -1512,6 +2243,143 @@ class SessionProcessor:
 
         return session_summary, entries, agent_entries
 
+    def iter_entries(
+        self,
+        file_path: str | Path,
+        *,
+        types: Collection[str] | None = None,
+        sidechain: bool | None = None,
+        since_offset: int = 0,
+        since: datetime | None = None,
+        include_hooks: bool = False,
+        include_agents: bool = False,
+    ) -> Iterator[Entry]:
+        """Stream a session's entries without holding the whole session in memory.
+
+        Filters are applied per line, before entries from different files
+        are merged. Hook and agent entries are merged into the transcript
+        with a k-way heap merge on timestamp (each file is already in
+        chronological order), so only one pending entry per file is held.
+        Unlike parse_session_file, which sorts the merged list, an entry
+        without a timestamp keeps its place in its own file.
+
+        Gemini JSON and Antigravity sessions are single documents: they are
+        parsed whole and then filtered (since_offset does not apply).
+
+        Args:
+            file_path: Session transcript
+            types: Only yield entries of these types (e.g. {"user", "assistant"})
+            sidechain: True for sidechain entries only, False for main-thread only
+            since_offset: Byte offset into the transcript to start from
+                (hook and agent files are filtered by since only)
+            since: Skip entries timestamped before this (entries without a
+                timestamp are kept)
+            include_hooks: Merge in the session's hook log (system_reminder)
+            include_agents: Merge in the session's agent-*.jsonl files; their
+                entries get subagent_id set to the agent id
+
+        Yields:
+            Entry objects in chronological order
+        """
+        file_path = Path(file_path)
+        wanted = frozenset(types) if types is not None else None
+
+        def keep(entry: Entry) -> bool:
+            if wanted is not None and entry.type not in wanted:
+                return False
+            if sidechain is not None and bool(entry.is_sidechain) != sidechain:
+                return False
+            if since is not None and entry.timestamp is not None and entry.timestamp < since:
+                return False
+            return True
+
+        if file_path.is_dir() or file_path.suffix.lower() == ".json":
+            _, entries, agent_entries = self.parse_session_file(
+                file_path, load_agents=include_agents, load_hooks=False
+            )
+            parsed = [iter(entries)] + [
+                self._tag_agent_entries(agent_id, iter(agent_list))
+                for agent_id, agent_list in agent_entries.items()
+            ]
+            yield from filter(keep, heapq.merge(*parsed, key=_entry_sort_key))
+            return
+
+        streams: list[Iterator[Entry]] = [
+            filter(keep, self._iter_main_entries(file_path, since_offset, wanted, sidechain))
+        ]
+        if include_hooks and (wanted is None or "system_reminder" in wanted) and not sidechain:
+            hook_file = self._find_hook_file(file_path)
+            if hook_file:
+                streams.append(filter(keep, self._iter_hook_entries(hook_file)))
+        if include_agents:
+            for agent_id, agent_file in self._find_agent_files(file_path):
+                agent_stream = self._iter_main_entries(agent_file, 0, wanted, sidechain)
+                streams.append(filter(keep, self._tag_agent_entries(agent_id, agent_stream)))
+
+        if len(streams) == 1:
+            yield from streams[0]
+        else:
+            yield from heapq.merge(*streams, key=_entry_sort_key)
+
+    def iter_agent_streams(self, file_path: str | Path) -> Iterator[tuple[str, Iterator[Entry]]]:
+        """Yield (agent_id, lazy entry iterator) for each agent file of a JSONL session.
+
+        Files are opened only when their iterator is consumed. Gemini JSON and
+        Antigravity sessions have no agent files.
+        """
+        file_path = Path(file_path)
+        if file_path.is_dir() or file_path.suffix.lower() == ".json":
+            return
+        for agent_id, agent_file in self._find_agent_files(file_path):
+            yield agent_id, self._iter_main_entries(agent_file)
+
+    @staticmethod
+    def _tag_agent_entries(agent_id: str, entries: Iterator[Entry]) -> Iterator[Entry]:
+        for entry in entries:
+            if entry.subagent_id is None:
+                entry.subagent_id = agent_id
+            yield entry
+
+    def _iter_main_entries(
+        self,
+        file_path: Path,
+        since_offset: int = 0,
+        types: frozenset[str] | None = None,
+        sidechain: bool | None = None,
+    ) -> Iterator[Entry]:
+        """Entries of a Claude Code JSONL file (or a hook log passed as the main file).
+
+        types and sidechain are checked on the raw record so filtered-out
+        lines are never turned into Entry objects.
+        """
+        is_hook_log = file_path.name.endswith("-hooks.jsonl")
+        if is_hook_log and ((types is not None and "system_reminder" not in types) or sidechain):
+            return
+
+        for data, line in iter_jsonl_lines(file_path, since_offset):
+            raw: bytes | None = line
+            if is_hook_log:
+                raw = None  # The Entry is built from a rewritten record
+                # Map hook log format to Entry format
+                hook_output = data.get("hookSpecificOutput") or {}
+                if not hook_output.get("hookEventName"):
+                    hook_output["hookEventName"] = data.get("hook_event", "Unknown")
+                if "exit_code" in data and "exitCode" not in hook_output:
+                    hook_output["exitCode"] = data["exit_code"]
+
+                data = {
+                    "type": "system_reminder",
+                    "timestamp": data.get("logged_at"),
+                    "hookSpecificOutput": hook_output,
+                }
+            else:
+                if types is not None and _raw_entry_type(data) not in types:
+                    continue
+                if sidechain is not None and bool(data.get("isSidechain", False)) != sidechain:
+                    continue
+
+            yield Entry.from_dict(data, raw)
+
     def _parse_antigravity_brain(
         self, brain_dir: Path
     ) -> tuple[SessionSummary, list[Entry], dict[str, list[Entry]]]:
@@ -1625,66 +2493,44 @@ class SessionProcessor:
 
         return session_summary, entries, {}
 
-    def _load_agent_files(self, main_file_path: Path) -> dict[str, list[Entry]]:
-        """Load agent-*.jsonl files that belong to this session."""
-        agent_entries: dict[str, list[Entry]] = {}
+    def _load_agent_files(self, main_file_path: Path) -> AgentEntries:
+        """The agent-*.jsonl files that belong to this session, loaded on first access."""
+        return AgentEntries(
+            self._find_agent_files(main_file_path),
+            lambda agent_file: list(self._iter_main_entries(agent_file)),
+            index_dir=main_file_path.parent,
+        )
+
+    def _find_agent_files(self, main_file_path: Path) -> list[tuple[str, Path]]:
+        """(agent_id, path) of the agent-*.jsonl files that belong to this session.
 
+        Looked up in the persistent agent file index (lib/agent_file_index),
+        which reads the first line of an agent file only once.
+        """
         session_dir = main_file_path.parent
         main_session_uuid = main_file_path.stem
 
         # Search locations for agent files:
         # 1. Same directory as session (legacy)
-        # 2. {session_dir}/{session_uuid}/subagents/ (new Claude Code structure)
-        agent_search_patterns = [
-            session_dir.glob("agent-*.jsonl"),
-            (session_dir / main_session_uuid / "subagents").glob("agent-*.jsonl"),
-        ]
-
-        for pattern in agent_search_patterns:
-            if not isinstance(pattern, type(session_dir.glob("*"))):
-                # Handle cases where folder might not exist
-                continue
-
-            for agent_file in pattern:
-                agent_id = agent_file.stem.replace("agent-", "")
-
-                # Check if this agent file belongs to the current session
-                belongs_to_session = False
-                try:
-                    with open(agent_file, encoding="utf-8") as f:
-                        first_line = f.readline().strip()
-                        if first_line:
-                            first_entry_data = json.loads(first_line)
-                            if first_entry_data.get("sessionId") == main_session_uuid:
-                                belongs_to_session = True
-                except (OSError, json.JSONDecodeError):
-                    continue
-
-                if not belongs_to_session:
-                    continue
-
-                # Load all entries from this agent file
-                entries = []
-                try:
-                    with open(agent_file, encoding="utf-8") as f:
-                        for line in f:
-                            line = line.strip()
-                            if not line:
-                                continue
-                            data = json.loads(line)
-                            entry = Entry.from_dict(data)
-                            entries.append(entry)
-                except (OSError, json.JSONDecodeError):
-                    continue
+        # 2. {session_dir}/{session_uuid}/subagents/ (new Claude Code structure),
+        #    indexed in memory only so sessions don't each leave an index file
+        return session_agent_files(session_dir, main_session_uuid) + session_agent_files(
+            session_dir / main_session_uuid / "subagents", main_session_uuid, persist=False
+        )
 
-                if entries:
-                    agent_entries[agent_id] = entries
+    def _find_hook_file(self, session_file_path: Path) -> Path | None:
+        """Find hook file via the hook log manifest, scanning as a fallback.
 
-        return agent_entries
+        The scan (for logs written before the manifest existed) reads hook
+        logs until one mentions the transcript, and backfills the manifest
+        with every transcript it sees so later lookups skip the scan.
+        """
+        hook_file = lookup_hook_log(session_file_path)
+        if hook_file is not None:
+            return hook_file
 
-    def _find_hook_file(self, session_file_path: Path) -> Path | None:
-        """Find hook file by searching for transcript_path match."""
         session_path = Path(session_file_path)
+        known = set(load_manifest())
 
         # Search locations for hook files
         # Hooks are stored in {project_dir}-hooks/ (sibling directory with -hooks suffix)
@@ -1703,6 +2549,7 @@ class SessionProcessor:
                 continue
 
             for hook_file in hook_dir.glob("*-hooks.jsonl"):
+                seen: set[str] = set()
                 try:
                     with open(hook_file, encoding="utf-8") as f:
                         for line in f:
@@ -1710,11 +2557,22 @@ class SessionProcessor:
                             if not line:
                                 continue
                             try:
-                                data = json.loads(line)
-                                if data.get("transcript_path") == str(session_file_path):
-                                    return hook_file
+                                data = _loads(line)
                             except json.JSONDecodeError:
                                 continue
+                            transcript = data.get("transcript_path")
+                            if transcript == str(session_file_path):
+                                record_hook_log(
+                                    transcript, hook_file, date_from_hook_log_name(hook_file)
+                                )
+                                return hook_file
+                            if isinstance(transcript, str) and transcript not in seen:
+                                seen.add(transcript)
+                                if transcript not in known:
+                                    record_hook_log(
+                                        transcript, hook_file, date_from_hook_log_name(hook_file)
+                                    )
+                                    known.add(transcript)
                 except OSError:
                     continue
 
@@ -1722,53 +2580,27 @@ class SessionProcessor:
 
     def _load_hook_entries(self, hook_file_path: Path) -> list[Entry]:
         """Load ALL hook entries from JSONL file."""
-        entries = []
+        return list(self._iter_hook_entries(hook_file_path))
 
-        with open(hook_file_path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                hook_output = data.get("hookSpecificOutput") or {}
-
-                if not hook_output.get("hookEventName"):
-                    hook_output["hookEventName"] = data.get("hook_event", "Unknown")
-
-                if "exit_code" in data and "exitCode" not in hook_output:
-                    hook_output["exitCode"] = data["exit_code"]
-
-                if "tool_name" in data:
-                    hook_output["toolName"] = data["tool_name"]
-
-                if "tool_input" in data:
-                    hook_output["toolInput"] = data["tool_input"]
-
-                if "agent_id" in data:
-                    hook_output["agentId"] = data["agent_id"]
-
-                entry_data = {
-                    "type": "system_reminder",
-                    "timestamp": data.get("logged_at"),
-                    "hookSpecificOutput": hook_output,
-                }
-
-                entries.append(Entry.from_dict(entry_data))
-
-        return entries
+    def _iter_hook_entries(self, hook_file_path: Path) -> Iterator[Entry]:
+        """Hook log lines as system_reminder entries, in file order."""
+        for data in iter_jsonl_records(hook_file_path):
+            yield hook_record_to_entry(data)
 
     def group_entries_into_turns(
         self,
         entries: list[Entry],
-        agent_entries: dict[str, list[Entry]] | None = None,
+        agent_entries: Mapping[str, list[Entry]] | None = None,
         full_mode: bool = False,
+        session_start: datetime | None = None,
     ) -> list[ConversationTurn | dict]:
-        """Group JSONL entries into conversational turns."""
+        """Group JSONL entries into conversational turns.
+
+        session_start is for entries that continue a session whose earlier
+        turns were grouped separately (incremental rendering): the start of
+        the session's first turn. Timing offsets are measured from it and no
+        turn in entries is marked as the first.
+        """
         main_entries = [e for e in entries if not e.is_sidechain]
         sidechain_entries = [e for e in entries if e.is_sidechain]
 
@@ -1776,29 +2608,12 @@ class SessionProcessor:
 
         turns: list[dict] = []
         current_turn: dict = {}
-        conversation_start_time = None
+        conversation_start_time = session_start
 
         for i, entry in enumerate(main_entries):
             if entry.type == "user":
-                # Check if this is a command invocation that might need next entry for args
-                message = entry.message or {}
-                content_raw = message.get("content", "")
-                if isinstance(content_raw, list):
-                    content_raw = "\n".join(
-                        item.get("text", "") if isinstance(item, dict) else str(item)
-                        for item in content_raw
-                    )
-
-                # For command invocations, check next entry for ARGUMENTS
-                next_meta_content = ""
-                if self._is_command_invocation(content_raw) and i + 1 < len(main_entries):
-                    next_entry = main_entries[i + 1]
-                    if next_entry.type == "user" and next_entry.is_meta:
-                        next_meta_content = self._extract_user_content(next_entry)
-
-                # Now extract user content with access to next meta content
-                user_content = self._extract_user_content(entry, next_meta_content)
-                if not user_content.strip() or "tool_use_id" in str(entry.message):
+                user_content = self.turn_start_content(main_entries, i)
+                if not user_content:
                     continue
 
                 if current_turn:
@@ -1941,7 +2756,7 @@ class SessionProcessor:
             turns.append(current_turn)
 
         # Add timing information
-        first_user_turn_found = False
+        first_user_turn_found = session_start is not None
         for turn in turns:
             if conversation_start_time and turn.get("start_time"):
                 is_user_turn = turn.get("type") not in ("hook_context", "summary")
@@ -2006,6 +2821,39 @@ class SessionProcessor:
 
         return conversation_turns
 
+    def turn_start_content(self, main_entries: list[Entry], index: int) -> str:
+        """User content if main_entries[index] starts a conversation turn, else "".
+
+        A turn starts at a user entry with non-empty content that is not a
+        tool result. Command invocations take their ARGUMENTS from the next
+        entry when it is a meta user entry.
+        """
+        entry = main_entries[index]
+        if entry.type != "user":
+            return ""
+
+        # Check if this is a command invocation that might need next entry for args
+        message = entry.message or {}
+        content_raw = message.get("content", "")
+        if isinstance(content_raw, list):
+            content_raw = "\n".join(
+                item.get("text", "") if isinstance(item, dict) else str(item)
+                for item in content_raw
+            )
+
+        # For command invocations, check next entry for ARGUMENTS
+        next_meta_content = ""
+        if self._is_command_invocation(content_raw) and index + 1 < len(main_entries):
+            next_entry = main_entries[index + 1]
+            if next_entry.type == "user" and next_entry.is_meta:
+                next_meta_content = self._extract_user_content(next_entry)
+
+        # Now extract user content with access to next meta content
+        user_content = self._extract_user_content(entry, next_meta_content)
+        if not user_content.strip() or "tool_use_id" in str(entry.message):
+            return ""
+        return user_content
+
     def _extract_first_user_request(
         self, entries: list[Entry], max_length: int = 500
     ) -> str | None:
@@ -2051,144 +2899,82 @@ class SessionProcessor:
         return None
 
     def _generate_context_summary(
-        self, entries: list[Entry], agent_entries: dict[str, list[Entry]] | None = None
+        self, entries: list[Entry], agent_entries: Mapping[str, list[Entry]] | None = None
     ) -> str | None:
         """Generate enhanced Context Summary with aggregated session metadata.
 
         Analyzes session entries to extract and summarize:
         - Skills/workflows invoked
-        - Tasks claimed/completed
         - Files modified
         - Key tools used
         - Subagents spawned
+        - Token usage (by model and by agent)
 
         Returns formatted markdown string or None if no useful metadata found.
         """
-        # Aggregate metadata
-        skills_invoked = set()
-        files_modified = set()
-        key_tools: dict[str, int] = {}
-        task_operations = []
-
-        # Scan entries for metadata
+        stats = ContextSummaryStats()
         for entry in entries:
-            # Extract skills/workflows from tool use
-            if entry.type == "assistant" and entry.message:
-                content = entry.message.get("content", [])
-                if isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "tool_use":
-                            tool_name = block.get("name", "")
-                            tool_input = block.get("input", {})
-
-                            # Track tool usage
-                            if tool_name:
-                                key_tools[tool_name] = key_tools.get(tool_name, 0) + 1
-
-                            # Track skills invoked
-                            if tool_name == "Skill":
-                                skill = tool_input.get("skill", "")
-                                if skill:
-                                    skills_invoked.add(skill)
-
-                            # Track file modifications
-                            if tool_name in ["Edit", "Write"]:
-                                file_path = tool_input.get("file_path", "")
-                                if file_path:
-                                    # Store basename only for readability
-                                    files_modified.add(Path(file_path).name)
-
-                            # Track task operations (simplified - just check for task-related tools)
-                            if "task" in tool_name.lower():
-                                task_operations.append(tool_name)
-
-        # Build summary sections
-        summary_parts = []
-
-        if skills_invoked:
-            skills_str = ", ".join(f"`{s}`" for s in sorted(skills_invoked))
-            summary_parts.append(f"**Skills/Workflows**: {skills_str}")
-
-        if key_tools:
-            # Show top 5 most used tools
-            top_tools = sorted(key_tools.items(), key=lambda x: x[1], reverse=True)[:5]
-            tools_str = ", ".join([f"{name} ({count})" for name, count in top_tools])
-            summary_parts.append(f"**Tools Used**: {tools_str}")
-
-        if files_modified:
-            if len(files_modified) <= 5:
-                files_str = ", ".join(f"`{f}`" for f in sorted(files_modified))
-                summary_parts.append(f"**Files Modified**: {files_str}")
-            else:
-                shown = list(sorted(files_modified))[:3]
-                files_str = ", ".join(f"`{f}`" for f in shown)
-                summary_parts.append(
-                    f"**Files Modified**: {files_str} (+{len(files_modified) - 3} more)"
-                )
-
-        if agent_entries and len(agent_entries) > 0:
-            summary_parts.append(f"**Subagents**: {len(agent_entries)} spawned")
-
-        # Aggregate and display usage stats
-        usage_stats = self._aggregate_session_usage(entries, agent_entries)
-        if usage_stats.has_data():
-            usage_summary = usage_stats.format_summary()
-            summary_parts.append(f"**Token Usage**: {usage_summary}")
-
-            # Add model breakdown if multiple models used
-            if len(usage_stats.by_model) > 1:
-                model_parts = []
-                for model, stats in sorted(usage_stats.by_model.items()):
-                    total = stats["input"] + stats["output"]
-                    if total > 0:
-                        # Shorten model names for display
-                        short_name = model.replace("claude-", "").replace("-20251001", "")
-                        model_parts.append(f"{short_name}: {total:,}")
-                if model_parts:
-                    summary_parts.append(f"**By Model**: {', '.join(model_parts)}")
-
-            # Add agent breakdown if subagents used
-            if len(usage_stats.by_agent) > 1:
-                agent_parts = []
-                for agent_id, stats in sorted(usage_stats.by_agent.items()):
-                    total = stats["input"] + stats["output"]
-                    if total > 0:
-                        display_id = "main" if agent_id == "main" else agent_id[:7]
-                        agent_parts.append(f"{display_id}: {total:,}")
-                if agent_parts:
-                    summary_parts.append(f"**By Agent**: {', '.join(agent_parts)}")
-
-        if not summary_parts:
-            return None
-
-        return "**Context Summary**\n\n" + "\n".join(summary_parts) + "\n\n"
+            stats.add_entry(entry)
+        if isinstance(agent_entries, AgentEntries):
+            # Subagent entries only add token usage, which is cached per agent file
+            stats.usage.merge(agent_entries.usage())
+        elif agent_entries:
+            for agent_id, agent_entry_list in agent_entries.items():
+                for entry in agent_entry_list:
+                    stats.add_agent_entry(entry, agent_id)
+        return stats.format(len(agent_entries) if agent_entries else 0)
 
     def format_session_as_markdown(
         self,
         session: SessionSummary,
         entries: list[Entry],
-        agent_entries: dict[str, list[Entry]] | None = None,
+        agent_entries: Mapping[str, list[Entry]] | None = None,
         include_tool_results: bool = True,
         variant: str = "full",
         source_file: str | Path | None = None,
         reflection_header: str | None = None,
     ) -> str:
         """Format session entries as readable markdown."""
-        session_uuid = session.uuid
-        details = session.details or {}
-
         first_timestamp = None
         for entry in entries:
             if entry.timestamp:
                 first_timestamp = entry.timestamp
                 break
-        date_str = first_timestamp.isoformat() if first_timestamp else "unknown"
 
         full_mode = variant == "full"
         turns = self.group_entries_into_turns(entries, agent_entries, full_mode=full_mode)
+        markdown, _ = self.format_turns_as_markdown(turns, full_mode, include_tool_results)
+
+        header = self.format_markdown_header(
+            session,
+            variant,
+            first_timestamp,
+            self._extract_first_user_request(entries),
+            self._generate_context_summary(entries, agent_entries),
+            source_file=source_file,
+            reflection_header=reflection_header,
+        )
+        return header + markdown
 
+    def format_turns_as_markdown(
+        self,
+        turns: list[ConversationTurn | dict],
+        full_mode: bool,
+        include_tool_results: bool = True,
+        turn_number: int = 0,
+    ) -> tuple[str, int]:
+        """Markdown body for turns from group_entries_into_turns.
+
+        Args:
+            turns: Turns to render
+            full_mode: Full variant (hook details, untruncated messages)
+            include_tool_results: Render tool results under tool calls
+            turn_number: Conversation turns already rendered before these
+
+        Returns:
+            (markdown, turn number of the last conversation turn rendered)
+        """
         markdown = ""
-        turn_number = 0
         rendered_agent_ids: set[str] = set()
 
         for turn in turns:
@@ -2503,6 +3289,23 @@ class SessionProcessor:
                             # Quote the subagent summary/content
                             markdown += _quote_block(condensed) + "\n\n"
 
+        return markdown, turn_number
+
+    def format_markdown_header(
+        self,
+        session: SessionSummary,
+        variant: str,
+        first_timestamp: datetime | None,
+        first_request: str | None,
+        context_summary: str | None,
+        source_file: str | Path | None = None,
+        reflection_header: str | None = None,
+    ) -> str:
+        """Frontmatter, title and Session Context block of a markdown transcript."""
+        session_uuid = session.uuid
+        details = session.details or {}
+        date_str = first_timestamp.isoformat() if first_timestamp else "unknown"
+
         edited_files = details.get("edited_files", session.edited_files)
         files_list = edited_files if edited_files and isinstance(edited_files, list) else []
 
@@ -2533,7 +3336,6 @@ session_id: {session_uuid}
 
         header = f"# {title}\n\n"
 
-        first_request = self._extract_first_user_request(entries)
         session_context = "## Session Context\n\n"
         session_context += "**Declared Workflow**: None\n"
         session_context += "**Approach**: direct\n\n"
@@ -2543,12 +3345,11 @@ session_id: {session_uuid}
             session_context += "**Original User Request** (first prompt): (not found)\n\n"
 
         # Add enhanced context summary
-        context_summary = self._generate_context_summary(entries, agent_entries)
         if context_summary:
             session_context += context_summary
 
         reflection_section = reflection_header if reflection_header else ""
-        return frontmatter + header + session_context + reflection_section + markdown
+        return frontmatter + header + session_context + reflection_section
 
     def _group_sidechain_entries(
         self, sidechain_entries: list[Entry]
@@ -2675,80 +3476,15 @@ session_id: {session_uuid}
 
     def _extract_agent_id_from_result(self, tool_id: str, all_entries: list[Entry]) -> str | None:
         """Find the agentId from the tool result."""
-        for entry in all_entries:
-            if entry.type != "user":
-                continue
-
-            message = entry.message or {}
-            content = message.get("content", [])
-            if not isinstance(content, list):
-                continue
-
-            for block in content:
-                if isinstance(block, dict):
-                    if block.get("type") == "tool_result" and block.get("tool_use_id") == tool_id:
-                        if isinstance(entry.tool_use_result, dict):
-                            return entry.tool_use_result.get("agentId")
-
-        return None
+        return self.tool_results(all_entries).agent_id(tool_id)
 
     def _get_tool_result(self, tool_id: str, all_entries: list[Entry]) -> str | None:
         """Get successful tool result content."""
-        for entry in all_entries:
-            if entry.type != "user":
-                continue
-
-            message = entry.message or {}
-            content = message.get("content", [])
-            if not isinstance(content, list):
-                continue
-
-            for block in content:
-                if isinstance(block, dict):
-                    if (
-                        block.get("type") == "tool_result"
-                        and block.get("tool_use_id") == tool_id
-                        and not block.get("is_error")
-                    ):
-                        result_content = block.get("content", "")
-                        if isinstance(result_content, list):
-                            texts = []
-                            for item in result_content:
-                                if isinstance(item, dict) and item.get("type") == "text":
-                                    texts.append(item.get("text", ""))
-                            return "\n".join(texts)
-                        if isinstance(result_content, str):
-                            return result_content
-        return None
+        return self.tool_results(all_entries).result(tool_id)
 
     def _get_tool_error(self, tool_id: str, all_entries: list[Entry]) -> str | None:
         """Get error message if tool failed."""
-        for entry in all_entries:
-            if entry.type != "user":
-                continue
-
-            message = entry.message or {}
-            content = message.get("content", [])
-            if not isinstance(content, list):
-                continue
-
-            for block in content:
-                if isinstance(block, dict):
-                    if (
-                        block.get("type") == "tool_result"
-                        and block.get("tool_use_id") == tool_id
-                        and block.get("is_error")
-                    ):
-                        result_content = block.get("content", "")
-                        if isinstance(result_content, list):
-                            texts = []
-                            for item in result_content:
-                                if isinstance(item, dict) and item.get("type") == "text":
-                                    texts.append(item.get("text", ""))
-                            return "\n".join(texts)[:500]
-                        if isinstance(result_content, str):
-                            return result_content[:500]
-        return None
+        return self.tool_results(all_entries).error(tool_id)
 
     def _get_tool_result_info(
         self, tool_id: str, all_entries: list[Entry]
@@ -2760,41 +3496,7 @@ session_id: {session_uuid}
             - is_error: Whether it was an error
             - exit_code: Extracted exit code (int or None)
         """
-        for entry in all_entries:
-            if entry.type != "user":
-                continue
-
-            message = entry.message or {}
-            content = message.get("content", [])
-            if not isinstance(content, list):
-                continue
-
-            for block in content:
-                if isinstance(block, dict):
-                    if block.get("type") == "tool_result" and block.get("tool_use_id") == tool_id:
-                        is_error = block.get("is_error", False)
-                        result_content = block.get("content", "")
-
-                        # Handle list content
-                        if isinstance(result_content, list):
-                            texts = []
-                            for item in result_content:
-                                if isinstance(item, dict) and item.get("type") == "text":
-                                    texts.append(item.get("text", ""))
-                            result_content = "\n".join(texts)
-
-                        # Extract exit code
-                        exit_code = _extract_exit_code_from_content(
-                            result_content if isinstance(result_content, str) else "",
-                            is_error,
-                        )
-
-                        return {
-                            "content": result_content,
-                            "is_error": is_error,
-                            "exit_code": exit_code,
-                        }
-        return None
+        return self.tool_results(all_entries).info(tool_id)
 
     def _extract_user_content(self, entry: Entry, next_meta_content: str = "") -> str:
         """Extract clean user content from entry.
@@ -3020,32 +3722,15 @@ session_id: {session_uuid}
 
         # Process main entries
         for entry in entries:
-            tool_name = None
-            # Extract tool name from assistant tool_use blocks
-            if entry.type == "assistant" and entry.message:
-                content = entry.message.get("content", [])
-                if isinstance(content, list):
-                    for block in content:
-                        if isinstance(block, dict) and block.get("type") == "tool_use":
-                            tool_name = block.get("name")
-                            break
-
-            stats.add_entry(entry, tool_name=tool_name, agent_id=None)
+            stats.add_entry(entry, tool_name=_first_tool_name(entry), agent_id=None)
 
         # Process subagent entries
-        if agent_entries:
+        if isinstance(agent_entries, AgentEntries):
+            stats.merge(agent_entries.usage())
+        elif agent_entries:
             for agent_id, agent_entry_list in agent_entries.items():
                 for entry in agent_entry_list:
-                    tool_name = None
-                    if entry.type == "assistant" and entry.message:
-                        content = entry.message.get("content", [])
-                        if isinstance(content, list):
-                            for block in content:
-                                if isinstance(block, dict) and block.get("type") == "tool_use":
-                                    tool_name = block.get("name")
-                                    break
-
-                    stats.add_entry(entry, tool_name=tool_name, agent_id=agent_id)
+                    stats.add_entry(entry, tool_name=_first_tool_name(entry), agent_id=agent_id)
 
         return stats
 
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark: Stop-time transcript generation, incremental vs full re-render.
+
+Writes the synthetic transcript of bench_transcript_render.py (default 20k
+entries) without its last turn, renders it once with
+lib.incremental_transcript.render_transcript (cold), appends the last turn
+and times:
+
+- full:        parse_session_file + format_session_as_markdown for the full
+               and abridged variants (what every Stop used to cost)
+- incremental: render_transcript after the append (the new turn only)
+
+Both outputs are compared byte for byte.
+
+Usage:
+    python scripts/bench_transcript_stop.py [--entries N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+from bench_transcript_render import write_transcript
+
+from lib.incremental_transcript import VARIANTS, render_transcript
+from lib.transcript_parser import SessionProcessor
+
+
+def _last_turn_start(lines: list[bytes]) -> int:
+    """Index of the last line that starts a turn (a user prompt with string content)."""
+    for i in range(len(lines) - 1, -1, -1):
+        if b'"type": "user", "message": {"role": "user", "content": "' in lines[i]:
+            return i
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stop-time transcript generation")
+    parser.add_argument("--entries", type=int, default=20_000, help="Synthetic transcript size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="aops-bench-stop-") as tmp:
+        os.environ["AOPS_SESSIONS"] = str(Path(tmp) / "sessions")
+        os.environ["AOPS_TRANSCRIPT_RENDER"] = str(Path(tmp) / "render")
+        os.environ["AOPS_HOOK_MANIFEST"] = str(Path(tmp) / "hook-logs.jsonl")
+        os.environ["AOPS_AGENT_INDEX"] = str(Path(tmp) / "agent-index")
+
+        source = Path(tmp) / "source.jsonl"
+        write_transcript(source, args.entries)
+        lines = source.read_bytes().splitlines(keepends=True)
+        split = _last_turn_start(lines)
+
+        path = Path(tmp) / "bench-session.jsonl"
+        path.write_bytes(b"".join(lines[:split]))
+        start = time.perf_counter()
+        render_transcript(path)
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        with path.open("ab") as f:
+            f.write(b"".join(lines[split:]))
+        start = time.perf_counter()
+        outputs = render_transcript(path)
+        incremental_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        processor = SessionProcessor()
+        session, entries, agents = processor.parse_session_file(path)
+        expected = {
+            variant: processor.format_session_as_markdown(
+                session, entries, agents, include_tool_results=include, variant=variant
+            )
+            for variant, include in VARIANTS.items()
+        }
+        full_ms = (time.perf_counter() - start) * 1000
+
+        mismatches = [v for v in VARIANTS if outputs[v].read_text(encoding="utf-8") != expected[v]]
+        size = path.stat().st_size / (1024 * 1024)
+
+    print(f"transcript: {size:.1f} MB, {len(lines)} lines, last turn {len(lines) - split} lines\n")
+    print(f"{'name':<40}{'ms':>12}")
+    print(f"{'full re-render (both variants)':<40}{full_ms:>12.1f}")
+    print(f"{'incremental, first render (cold)':<40}{cold_ms:>12.1f}")
+    print(f"{'incremental, new turn':<40}{incremental_ms:>12.1f}")
+    print(f"\noutput differs from full render: {', '.join(mismatches) or 'no'}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
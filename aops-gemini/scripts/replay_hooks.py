@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Replay recorded hook logs through the router, offline.
+
+Feeds the events of one or more per-session *-hooks.jsonl logs through
+HookRouter.normalize_input / execute_hooks in this process, the way the
+router daemon (hooks/router_server.py) would, and reports:
+
+- throughput (events/second) and per-event latency (p50/p95/p99/max) by event type
+- RSS growth over the run
+- verdict parity: replayed verdicts vs the verdicts recorded in the log
+
+The replay is isolated from live sessions: session state, the hook log and
+the PID session map go to a temporary directory, and side effects (ntfy,
+$ACA_DATA commit/push, transcript generation) are counted instead of
+submitted. Custom gate conditions still run for real (e.g. read-only git
+status checks), since they are part of hook latency.
+
+Verdicts depend on the gate modes (*_GATE_MODE). Run with the same modes
+as the recorded sessions; unset modes default to "warn".
+
+Usage:
+    python scripts/replay_hooks.py ~/.claude/projects/<project>/<date>-<hash>-hooks.jsonl
+    python scripts/replay_hooks.py --repeat 20 --show-mismatches 10 logs/
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import redirect_stderr
+from pathlib import Path
+from typing import Any
+
+AOPS_CORE_DIR = Path(__file__).parent.parent
+if str(AOPS_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(AOPS_CORE_DIR))
+
+# Gate modes are mandatory at import time (hooks/gate_config.py).
+for _var in (
+    "HANDOVER_GATE_MODE",
+    "QA_GATE_MODE",
+    "CUSTODIET_GATE_MODE",
+    "HYDRATION_GATE_MODE",
+    "COMMIT_GATE_MODE",
+):
+    os.environ.setdefault(_var, "warn")
+
+import psutil
+
+from hooks import side_effects
+from hooks.router import HookRouter
+from lib.hook_timing import percentile
+from lib.session_paths import get_pid_session_map_path
+
+# HookContext fields that normalize_input pops from raw_input, mapped back
+# to the raw payload keys they were read from.
+CONTEXT_FIELDS = {
+    "session_id": "session_id",
+    "trace_id": "trace_id",
+    "tool_name": "tool_name",
+    "tool_input": "tool_input",
+    "tool_output": "tool_result",
+    "agent_id": "agent_id",
+    "subagent_type": "subagent_type",
+    "slug": "slug",
+    "cwd": "cwd",
+    "transcript_path": "transcript_path",
+}
+
+
+def load_events(paths: list[Path]) -> list[dict[str, Any]]:
+    """Read hook log entries from files or directories, in file order."""
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.rglob("*-hooks.jsonl")))
+        else:
+            files.append(path)
+
+    events = []
+    for path in files:
+        with path.open() as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict) and entry.get("hook_event"):
+                    events.append(entry)
+    return events
+
+
+def to_raw_input(entry: dict[str, Any], session_suffix: str) -> dict[str, Any]:
+    """Rebuild the hook's stdin payload from a logged HookContext."""
+    raw = dict(entry.get("raw_input") or {})
+    raw["hook_event_name"] = entry["hook_event"]
+    for field, key in CONTEXT_FIELDS.items():
+        value = entry.get(field)
+        if value not in (None, {}, []):
+            raw[key] = value
+    raw["session_id"] = f"{entry['session_id']}{session_suffix}"
+    if entry.get("is_subagent") and not raw.get("agent_id"):
+        raw["is_sidechain"] = True
+    return raw
+
+
+def recorded_verdict(entry: dict[str, Any]) -> str | None:
+    output = entry.get("output")
+    return output.get("verdict") if isinstance(output, dict) else None
+
+
+def isolate_environment(work_dir: Path) -> None:
+    """Point every per-session path at work_dir so live sessions are untouched."""
+    os.environ["AOPS_SESSION_STATE_DIR"] = str(work_dir / "state")
+    os.environ["AOPS_HOOK_LOG_PATH"] = str(work_dir / "replay-hooks.jsonl")
+    os.environ["AOPS_HOOK_MANIFEST"] = str(work_dir / "hook-logs.jsonl")
+    os.environ["AOPS_HOOK_PPID"] = f"replay-{os.getpid()}"
+    for var in ("AOPS_SESSION_STATE_PATH", "CLAUDE_ENV_FILE"):
+        os.environ.pop(var, None)
+    (work_dir / "state").mkdir(parents=True, exist_ok=True)
+
+
+def _rss_mb(process: psutil.Process) -> float:
+    return process.memory_info().rss / (1024 * 1024)
+
+
+def replay(
+    events: list[dict[str, Any]], repeat: int, verbose: bool
+) -> tuple[dict[str, list[float]], list[tuple[int, dict[str, Any], str | None]], Counter, dict]:
+    """Run the event stream `repeat` times. Returns latencies, mismatches, side effects, memory."""
+    submitted: Counter = Counter()
+
+    def record_submit(kind: str, payload: dict[str, Any]) -> None:
+        submitted[kind] += 1
+
+    side_effects.submit = record_submit
+
+    router = HookRouter()
+    process = psutil.Process()
+    latencies: dict[str, list[float]] = defaultdict(list)
+    mismatches: list[tuple[int, dict[str, Any], str | None]] = []
+    memory = {"start": _rss_mb(process)}
+
+    stderr = sys.stderr if verbose else open(os.devnull, "w")
+    with redirect_stderr(stderr):
+        for run in range(repeat):
+            # Each repetition is a fresh set of sessions
+            suffix = f"-replay{run}"
+            for index, entry in enumerate(events):
+                raw = to_raw_input(entry, suffix)
+                start = time.perf_counter()
+                ctx = router.normalize_input(raw)
+                output = router.execute_hooks(ctx)
+                latencies[ctx.hook_event].append((time.perf_counter() - start) * 1000)
+
+                if run == 0 and output.verdict != recorded_verdict(entry):
+                    mismatches.append((index, entry, output.verdict))
+            if run == 0:
+                memory["after_first_run"] = _rss_mb(process)
+    memory["end"] = _rss_mb(process)
+    return latencies, mismatches, submitted, memory
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded hook logs through the router")
+    parser.add_argument("paths", nargs="+", type=Path, help="*-hooks.jsonl files or directories")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the stream N times")
+    parser.add_argument("--show-mismatches", type=int, default=5, metavar="N")
+    parser.add_argument("--verbose", action="store_true", help="Show router stderr")
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the replay state directory and print its path"
+    )
+    args = parser.parse_args()
+
+    events = load_events(args.paths)
+    if not events:
+        print("No hook events found.")
+        return 1
+
+    work_dir = Path(tempfile.mkdtemp(prefix="aops-replay-"))
+    isolate_environment(work_dir)
+
+    started = time.perf_counter()
+    latencies, mismatches, submitted, memory = replay(events, args.repeat, args.verbose)
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"Replayed {len(events)} events x {args.repeat} = {total} in {elapsed:.2f}s")
+    print(f"Throughput: {total / elapsed:.0f} events/s\n")
+
+    print(f"{'event':<20}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for event in sorted(latencies):
+        values = sorted(latencies[event])
+        print(
+            f"{event:<20}{len(values):>8}{percentile(values, 50):>10.2f}"
+            f"{percentile(values, 95):>10.2f}{percentile(values, 99):>10.2f}{values[-1]:>10.2f}"
+        )
+
+    print(
+        f"\nRSS: {memory['start']:.1f} MB at start, {memory['after_first_run']:.1f} MB after"
+        f" first pass, {memory['end']:.1f} MB at end"
+        f" ({memory['end'] - memory['after_first_run']:+.1f} MB over remaining passes)"
+    )
+    if submitted:
+        print("Side effects suppressed: " + ", ".join(f"{k}={v}" for k, v in sorted(submitted.items())))
+
+    checked = sum(1 for e in events if "output" in e)
+    print(f"\nVerdict parity: {checked - len(mismatches)}/{checked} match the recording")
+    for index, entry, replayed in mismatches[: args.show_mismatches]:
+        tool = f" {entry['tool_name']}" if entry.get("tool_name") else ""
+        print(
+            f"  #{index} {entry['hook_event']}{tool}: recorded={recorded_verdict(entry)}"
+            f" replayed={replayed}"
+        )
+
+    if args.keep:
+        print(f"\nReplay state kept in {work_dir}")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        get_pid_session_map_path().unlink(missing_ok=True)
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())